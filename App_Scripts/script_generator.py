@@ -19,8 +19,9 @@ from typing import Dict, List, Optional
 
 # Add Shared_Resources to path for workflow utilities
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Shared_Resources'))
-from workflow_utils import VideoExtractor, ContentScraper, SceneOptimizer, WorkflowFolders, WorkflowLogger, URLValidator
-from url_correction import URLCorrectionSystem
+from workflow_utils import VideoExtractor, ContentScraper, SceneOptimizer, WorkflowFolders, WorkflowLogger, URLValidator, story_artifact_scope
+from url_correction import URLCorrectionSystem, SearchQueryPlanner, QUERY_STATS_FILENAME
+from correction_cache import CorrectionNegativeCache, CACHE_FILENAME
 
 class VideoScriptGenerator:
     """
@@ -71,6 +72,15 @@ class VideoScriptGenerator:
         # Ensure video/ and post/ folders exist
         self.video_path, self.post_path = WorkflowFolders.ensure_folders(self.base_path)
         
+        # Persisted record of failed URL corrections (skips known-bad stories)
+        self.correction_cache = CorrectionNegativeCache(os.path.join(self.base_path, CACHE_FILENAME))
+        
+        # Ranks URL correction search variants by observed hit rate across runs
+        self.query_planner = SearchQueryPlanner(stats_path=os.path.join(self.base_path, QUERY_STATS_FILENAME))
+        
+        # Post artifacts shared across one story run (set by @story_artifact_scope)
+        self.artifact_cache = None
+        
         # Novo brand messaging elements
         self.novo_messages = [
             "This is why Novo rewards safe drivers",
@@ -121,7 +131,7 @@ class VideoScriptGenerator:
             return {'success': False, 'error': f'Story {story_id} not found'}
         if 'url' not in story or not story['url']:
             return {'success': False, 'error': 'No URL available for story'}
-        result = self.video_extractor.extract_from_reddit_url(story['url'])
+        result = self.video_extractor.extract_from_reddit_url(story.get('corrected_url') or story['url'])
         if result['success']:
             video_file = os.path.join(self.video_path, f"story_{story_id:03d}_videos.json")
             with open(video_file, 'w') as f:
@@ -136,7 +146,7 @@ class VideoScriptGenerator:
             return {'success': False, 'error': f'Story {story_id} not found'}
         if 'url' not in story or not story['url']:
             return {'success': False, 'error': 'No URL available for story'}
-        result = self.content_scraper.scrape_reddit_post(story['url'])
+        result = self.content_scraper.scrape_reddit_post(story.get('corrected_url') or story['url'])
         if result['success']:
             content_file = os.path.join(self.post_path, f"story_{story_id:03d}_original.md")
             self._save_scraped_content_as_markdown(result['content'], content_file)
@@ -192,11 +202,26 @@ class VideoScriptGenerator:
         # Step 2: URL is invalid - attempt correction using fallback system
         print(f"🔧 URL invalid for story {story_id}, attempting automatic correction...")
         
-        url_corrector = URLCorrectionSystem("App_Scripts")
+        url_corrector = URLCorrectionSystem("App_Scripts", negative_cache=self.correction_cache,
+                                             query_planner=self.query_planner,
+                                             artifact_cache=self.artifact_cache)
         correction_result = url_corrector.attempt_url_correction(story)
         
         # Step 3: Handle correction results
-        if correction_result['success']:
+        if correction_result.get('skipped'):
+            # Known failure still inside its retry window - story is already marked
+            print(f"⏭️ Skipping correction for story {story_id}: {correction_result['failure_category']} "
+                  f"(retry after {correction_result['retry_after']})")
+            
+            return {
+                'valid': False,
+                'error': f"URL invalid and correction failed: {correction_result['failure_category']}",
+                'url': url,
+                'correction_attempted': True,
+                'correction_failed': True,
+                'retry_after': correction_result['retry_after']
+            }
+        elif correction_result['success']:
             # Correction succeeded - update database
             print(f"✅ URL corrected using {correction_result['method_used']}")
             self.update_story_with_correction(story_id, correction_result)
@@ -324,6 +349,7 @@ class VideoScriptGenerator:
         with open(self.db_path, 'w') as f:
             json.dump(self.data, f, indent=2)
     
+    @story_artifact_scope
     def prepare_story_for_production(self, story_id: int) -> Dict:
         """Complete workflow preparation: extract videos + scrape content."""
         results = {
@@ -780,6 +806,7 @@ Story Source: {story['source']} ({story['upvotes']:,} upvotes)
             print(f"Error updating tracking: {e}")
             return False
     
+    @story_artifact_scope
     def generate_enhanced_script(self, story_id: int, format_override: Optional[str] = None, use_scraped_content: bool = True) -> str:
         """Generate script with URL validation - STOPS if URL invalid."""
         # CRITICAL: Validate URL first
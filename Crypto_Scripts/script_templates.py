@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+SPT Script Format Templates
+===========================
+
+The six SPT video formats as compiled templates (see
+Shared_Resources/template_engine.py). Lookup tables are module-level and
+each helper is a slot function evaluated once per rendered script.
+
+Usage:
+    from script_templates import compile_format_templates, build_script_context
+
+    templates = compile_format_templates(scene_optimizer)
+    context = build_script_context(story, scraped_content, FORMAT_EXCERPTS['comedy'], ...)
+    script = templates['comedy'].render(context)
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional, Any
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Shared_Resources'))
+from template_engine import ScriptTemplate
+
+# =============================================================================
+# LOOKUP TABLES
+# =============================================================================
+
+COMEDY_ESCALATIONS = {
+    'shock': "I mean, the confidence! The audacity! The complete lack of brain cells!",
+    'anger': "And everyone's just supposed to be okay with this? EVERYONE?",
+    'frustration': "This is why we can't have nice things. THIS RIGHT HERE.",
+    'humor': "I can't even be mad, I'm actually impressed by the stupidity.",
+    'disbelief': "Physics said no, common sense said no, but they said YOLO!"
+}
+
+ACTIONABLE_TIPS = {
+    'safety_features': "Always wear your seatbelt, always",
+    'road_rage': "Take a breath, it's not worth it",
+    'distracted_driving': "Put the phone away, period",
+    'weather_driving': "Slow down when conditions change",
+    'dashcam_saves': "Get a dashcam yesterday"
+}
+
+POV_HOOKS = {
+    'road_rage': "You're the driver who just got brake checked",
+    'near_miss': "You just avoided a massive accident",
+    'hero_moment': "You see someone in danger",
+    'realization': "You realize you've been driving wrong"
+}
+
+INTERNAL_MONOLOGUES = {
+    'fear': "What do I do? WHAT DO I DO?",
+    'anger': "Are you KIDDING me right now?",
+    'shock': "This can't be happening...",
+    'relief': "Thank god I was paying attention"
+}
+
+CHALLENGE_ACTIONS = {
+    'safety_features': "Check your seatbelt before starting the car, every time",
+    'distracted_driving': "Put your phone in the glove box before driving",
+    'defensive_driving': "Leave 3 seconds of space between you and the next car",
+    'road_rage': "Wave and smile at aggressive drivers instead of reacting"
+}
+
+# Post excerpt length per format, and whether the narrative fallback is cut too
+FORMAT_EXCERPTS = {
+    'comedy': (200, False),
+    'educational_hook': (100, True),
+    'transformation': (150, False),
+    'storytelling': (120, False),
+    'pov_story': (150, False),
+    'challenge': (None, False)
+}
+
+# create_hook styles: each plain-hook format's own style, and all styles (A/B variants)
+FORMAT_HOOK_STYLES = {
+    'comedy': 'comedy',
+    'educational_hook': 'educational',
+    'transformation': 'transformation',
+    'storytelling': 'storytelling'
+}
+HOOK_STYLES = ('comedy', 'educational', 'transformation', 'storytelling', 'default')
+
+# SceneOptimizer structure used by each format
+FORMAT_SCENES = {
+    'comedy': 'comedy',
+    'educational_hook': 'educational',
+    'transformation': 'transformation',
+    'storytelling': 'storytelling',
+    'pov_story': 'pov',
+    'challenge': 'challenge'
+}
+
+# =============================================================================
+# SLOT FUNCTIONS
+# =============================================================================
+
+def create_hook(story: Dict, style: str) -> str:
+    """Create an attention-grabbing hook based on style"""
+    if style == 'comedy':
+        return f"When {story['theme'].replace('_', ' ')} goes hilariously wrong 😅"
+    elif style == 'educational':
+        return f"This {story['theme'].replace('_', ' ')} trick could save your life"
+    elif style == 'transformation':
+        return f"How {story['upvotes']:,} people learned from this {story['emotion']} moment"
+    elif style == 'storytelling':
+        return f"The {story['source']} story that changed how I drive forever"
+    else:
+        return f"You won't believe what happened here"
+
+def get_before_state(story: Dict) -> str:
+    """Extract the 'before' state for transformation stories"""
+    narrative = story['narrative'].lower()
+    if 'crash' in narrative:
+        return "Everything seemed normal, just another day on the road"
+    elif 'saved' in narrative:
+        return "They thought they didn't need it"
+    else:
+        return "Before they learned this lesson the hard way"
+
+def create_story_twist(story: Dict) -> str:
+    """Create the twist moment in storytelling"""
+    if story['theme'] == 'hero_drivers':
+        return "someone decided to be a hero"
+    elif story['theme'] == 'instant_karma':
+        return "karma had other plans"
+    else:
+        return "everything changed in an instant"
+
+def simplify_lesson(lesson: str) -> str:
+    """Simplify lesson to memorable phrase"""
+    if len(lesson) > 50:
+        return lesson.split('-')[0].strip()
+    return lesson
+
+def create_challenge_hook(story: Dict) -> str:
+    """Create the 7-day challenge hook"""
+    return f"I dare you to {story['theme'].replace('_', ' ')} better for 7 days"
+
+def hook_options(story: Dict, format_type: str) -> List[str]:
+    """
+    Candidate hooks for A/B variants of a format (the format's own hook first).
+
+    Formats with a plain hook can use every create_hook style; POV and
+    challenge hooks are tied to their format's structure.
+    """
+    if format_type == 'pov_story':
+        return [create_pov_hook(story)]
+    if format_type == 'challenge':
+        return [create_challenge_hook(story)]
+    own_style = FORMAT_HOOK_STYLES[format_type]
+    return [create_hook(story, style) for style in (own_style,) + tuple(s for s in HOOK_STYLES if s != own_style)]
+
+def create_pov_hook(story: Dict) -> str:
+    """Create POV-specific hook"""
+    if 'rage' in story['theme']:
+        return POV_HOOKS['road_rage']
+    elif 'hero' in story['theme']:
+        return POV_HOOKS['hero_moment']
+    else:
+        return "You're about to learn something important"
+
+def build_script_context(story: Dict, scraped_content: Optional[Dict], excerpt: tuple,
+                         format_type: str, variant: int, rng, messages: list, ctas: list) -> Dict[str, Any]:
+    """
+    Values shared by every slot of one rendered script.
+
+    Args:
+        story (Dict): Story database entry
+        scraped_content (Optional[Dict]): Scraped Reddit post, if available
+        excerpt (tuple): (post excerpt length, cut narrative fallback) from FORMAT_EXCERPTS
+        format_type (str): Script format (printed in the footer render key)
+        variant (int): Variant index (printed in the footer render key)
+        rng: random.Random for brand message and CTA picks (see template_engine.render_rng)
+            (A/B variants pass one-item message/CTA lists and a 'hook_override')
+        messages (list): Brand messages
+        ctas (list): Call-to-action options
+
+    Returns:
+        Dict: Render context
+    """
+    excerpt_chars, cut_fallback = excerpt
+    narrative_fallback = story['narrative'][:100] + "..." if cut_fallback else story['narrative']
+
+    if scraped_content:
+        score = scraped_content.get('score', story['upvotes'])
+        context = {
+            'title': scraped_content.get('title', story['title']),
+            'score': score,
+            'comments': scraped_content.get('num_comments', story['comments']),
+            'content_source': f"Based on actual Reddit post with {score:,} upvotes",
+            'community_reaction': ""
+        }
+        selftext = scraped_content.get('selftext')
+        if excerpt_chars and selftext:
+            context['authentic_context'] = selftext[:excerpt_chars] + "..." if len(selftext) > excerpt_chars else selftext
+        else:
+            context['authentic_context'] = narrative_fallback
+        if scraped_content.get('top_comments'):
+            top_comment = scraped_content['top_comments'][0]
+            context['community_reaction'] = f"Top comment: \"{top_comment['body'][:100]}...\""
+    else:
+        context = {
+            'title': story['title'],
+            'score': story['upvotes'],
+            'comments': story['comments'],
+            'content_source': f"Story database entry ({story['upvotes']:,} upvotes)",
+            'authentic_context': narrative_fallback,
+            'community_reaction': ""
+        }
+
+    context.update({'story': story, 'format_type': format_type, 'variant': variant,
+                    'rng': rng, 'messages': messages, 'ctas': ctas})
+    return context
+
+# Slots shared by all formats
+COMMON_SLOTS = {
+    'title': lambda ctx: ctx['title'],
+    'score': lambda ctx: f"{ctx['score']:,}",
+    'comments': lambda ctx: f"{ctx['comments']:,}",
+    'content_source': lambda ctx: ctx['content_source'],
+    'community_reaction': lambda ctx: ctx['community_reaction'],
+    'render_key': lambda ctx: f"story {ctx['story']['id']} / {ctx['format_type']} / variant {ctx['variant']}",
+    'spt_message': lambda ctx: ctx['rng'].choice(ctx['messages']),
+    'cta': lambda ctx: ctx['rng'].choice(ctx['ctas']),
+    'narrative': lambda ctx: ctx['story']['narrative'],
+    'key_lesson': lambda ctx: ctx['story']['key_lesson'],
+    'context_or_narrative': lambda ctx: ctx['authentic_context'] if ctx['authentic_context'] else ctx['story']['narrative']
+}
+
+FOOTER = """
+---
+Render: {render_key}
+Content Source: {content_source}
+{community_reaction}
+"""
+
+# =============================================================================
+# FORMAT TEMPLATES
+# =============================================================================
+
+FORMAT_TEMPLATES = {
+    'comedy': ("""## **Script: {title}**
+
+**Format**: Comedy/Relatable
+**Duration**: 30 seconds
+**Hook**: "{hook}"
+**Structure**: Hook → Setup → Context → Punchline (2 parts) → CTA
+
+### Full Script:
+
+**{scene_0}:**
+[Text Overlay: "{hook}"]
+[Visual: Person looking at camera with exaggerated expression]
+
+**{scene_1}:**
+"So apparently {context_lower}..."
+[Shows relevant footage or reenactment]
+
+**{scene_2}:**
+"And I'm just thinking..."
+[Visual: Person's contemplative expression]
+
+**{scene_3}:**
+"{escalation}"
+[Visual reactions, comedic gestures]
+
+**{scene_4}:**
+"{punchline}"
+[Deadpan delivery]
+
+**{scene_5}:**
+"{spt_message}"
+"{cta}"
+""", {
+        'hook': lambda ctx: ctx.get('hook_override') or create_hook(ctx['story'], 'comedy'),
+        'context_lower': lambda ctx: ctx['authentic_context'].lower() if ctx['authentic_context'] else ctx['story']['narrative'].lower(),
+        'escalation': lambda ctx: COMEDY_ESCALATIONS.get(ctx['story']['emotion'], "The sheer chaos of it all!"),
+        'punchline': lambda ctx: f"And that, friends, is why {ctx['story']['key_lesson'].lower()}"
+    }),
+
+    'educational_hook': ("""## **Script: {title}**
+
+**Format**: Educational Hook
+**Duration**: 30 seconds
+**Hook**: "{hook}"
+**Structure**: Hook → Exclusivity → Benefit → Reveal → Proof → CTA
+
+### Full Script:
+
+**{scene_0}:**
+[Text Overlay: "{hook}"]
+[Visual: Person looking around conspiratorially]
+
+**{scene_1}:**
+"This got {score} upvotes because it's THAT important."
+[Visual: Highlight engagement numbers]
+
+**{scene_2}:**
+"Here's what happened: {authentic_context}"
+[Visual: Set scene with context]
+
+**{scene_3}:**
+"The lesson? {lesson_start}..."
+[Visual: Key learning moment]
+
+**{scene_4}:**
+"{lesson_rest}"
+[Show relevant visuals or graphics]
+
+**{scene_5}:**
+"Over {comments} people confirmed this works."
+[Visual: Community validation]
+
+**{scene_6}:**
+"{spt_message}"
+[Visual: Token reward concept]
+
+**{scene_7}:**
+"{cta}"
+[Visual: App/community call-to-action]
+""", {
+        'hook': lambda ctx: ctx.get('hook_override') or create_hook(ctx['story'], 'educational'),
+        'authentic_context': lambda ctx: ctx['authentic_context'],
+        'lesson_start': lambda ctx: ctx['story']['key_lesson'][:40],
+        'lesson_rest': lambda ctx: ctx['story']['key_lesson'][40:] if len(ctx['story']['key_lesson']) > 40 else 'This changes everything.'
+    }),
+
+    'transformation': ("""## **Script: {title}**
+
+**Format**: Transformation/Before & After
+**Duration**: 30 seconds
+**Hook**: "{hook}"
+**Structure**: Hook → Problem → Process → Reveal → Tips → CTA
+
+### Full Script:
+
+**{scene_0}:**
+[Text Overlay: "{hook}"]
+[Visual: Dramatic before footage]
+
+**{scene_1}:**
+"This is what happened: {before_state}"
+[Show the incident or problem]
+
+**{scene_2}:**
+"{context_or_narrative}"
+[Show the incident unfolding]
+
+**{scene_3}:**
+"The transformation: {key_lesson}"
+[Show the positive outcome]
+
+**{scene_4}:**
+"Remember: {actionable_tip}"
+[Visual: Key takeaway]
+
+**{scene_5}:**
+"{spt_message}"
+"{cta}"
+[Visual: SPT integration and call-to-action]
+""", {
+        'hook': lambda ctx: ctx.get('hook_override') or create_hook(ctx['story'], 'transformation'),
+        'before_state': lambda ctx: get_before_state(ctx['story']),
+        'actionable_tip': lambda ctx: ACTIONABLE_TIPS.get(ctx['story']['theme'], ctx['story']['key_lesson'])
+    }),
+
+    'storytelling': ("""## **Script: {title}**
+
+**Format**: Storytelling/Emotional
+**Duration**: 30 seconds
+**Hook**: "{hook}"
+**Structure**: Hook → Setup → Struggle → Twist → Victory → Lesson → CTA
+
+### Full Script:
+
+**{scene_0}:**
+[Text Overlay: "{hook}"]
+[Visual: Person looking directly at camera, serious expression]
+
+**{scene_1}:**
+"This got {score} people talking..."
+"{story_setup}"
+[Visual: Establish the scene]
+
+**{scene_2}:**
+"{context_or_narrative}"
+[Visual: Show the story unfolding]
+
+**{scene_3}:**
+"Then... {story_twist}"
+[Visual: The turning point]
+
+**{scene_4}:**
+"The takeaway? {simple_lesson}"
+[Visual: Key lesson moment]
+
+**{scene_5}:**
+"{spt_message}"
+"{cta}"
+[Visual: SPT integration and call-to-action]
+""", {
+        'hook': lambda ctx: ctx.get('hook_override') or create_hook(ctx['story'], 'storytelling'),
+        'story_setup': lambda ctx: f"Picture this: {ctx['story']['narrative'].split('.')[0]}...",
+        'story_twist': lambda ctx: create_story_twist(ctx['story']),
+        'simple_lesson': lambda ctx: simplify_lesson(ctx['story']['key_lesson'])
+    }),
+
+    'pov_story': ("""## **Script: {title}**
+
+**Format**: POV
+**Duration**: 30 seconds
+**Hook**: "POV: {pov_hook}"
+
+### Full Script:
+
+**{scene_0}:**
+[Text Overlay: "POV: {pov_hook}"]
+[Visual: First-person perspective]
+
+**{scene_1}:**
+"You're driving along when suddenly..."
+[Shows situation from driver's perspective]
+
+**{scene_2}:**
+"Internal thought: \"{internal_monologue}\""
+[Visual: Inner dialogue representation]
+
+**{scene_3}:**
+"{context_or_narrative}"
+[POV footage or reenactment]
+
+**{scene_4}:**
+"My heart is racing... {key_lesson}"
+[Visual: Emotional reaction and lesson]
+
+**{scene_5}:**
+"{spt_message}"
+"{cta}"
+[Visual: SPT integration and call-to-action]
+""", {
+        'pov_hook': lambda ctx: ctx.get('hook_override') or create_pov_hook(ctx['story']),
+        'internal_monologue': lambda ctx: INTERNAL_MONOLOGUES.get(ctx['story']['emotion'], "This is really happening...")
+    }),
+
+    'challenge': ("""## **Script: {title}**
+
+**Format**: Challenge/Interactive
+**Duration**: 30 seconds
+**Hook**: "{challenge_hook}"
+**Structure**: Hook → Challenge Setup → Instructions → Benefits → Call to Action
+
+### Full Script:
+
+**{scene_0}:**
+[Text Overlay: "{challenge_hook}"]
+[Visual: Person pointing at camera confidently]
+
+**{scene_1}:**
+"After seeing {title_lower}, {score} people agreed..."
+[Visual: Engagement stats display]
+
+**{scene_2}:**
+"Here's the challenge: {challenge_action}"
+[Visual: Challenge explanation]
+
+**{scene_3}:**
+"{key_lesson}"
+[Visual: Benefits demonstration]
+
+**{scene_4}:**
+"Just try it for one week."
+[Visual: Demonstrate the action]
+
+**{scene_5}:**
+"{comments} people said this works."
+"{spt_message}"
+"Comment 'DAY 1' if you're starting!"
+[Visual: Community engagement and SPT integration]
+""", {
+        'challenge_hook': lambda ctx: ctx.get('hook_override') or create_challenge_hook(ctx['story']),
+        'title_lower': lambda ctx: ctx['title'].lower(),
+        'challenge_action': lambda ctx: CHALLENGE_ACTIONS.get(ctx['story']['theme'], "Apply this lesson every time you drive")
+    })
+}
+
+# Bump when slot functions or lookup tables change; template text changes are
+# picked up automatically by ScriptTemplate.version
+TEMPLATES_REVISION = 1
+
+def compile_format_templates(scene_optimizer) -> Dict[str, ScriptTemplate]:
+    """
+    Compile the six formats, inlining each format's scene timing displays.
+
+    Args:
+        scene_optimizer (SceneOptimizer): Source of the scene structures
+
+    Returns:
+        Dict[str, ScriptTemplate]: Format name -> compiled template
+    """
+    templates = {}
+    for format_type, (text, slots) in FORMAT_TEMPLATES.items():
+        scenes = scene_optimizer.generate_scene_structure(FORMAT_SCENES[format_type])
+        constants = {f"scene_{index}": scene['timing_display'] for index, scene in enumerate(scenes)}
+        templates[format_type] = ScriptTemplate(format_type, text + FOOTER, dict(COMMON_SLOTS, **slots), constants)
+    return templates
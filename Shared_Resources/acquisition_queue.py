@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Background Video Acquisition Queue
+==================================
+
+Persistent queue that decouples video downloads from script generation.
+generate_script enqueues the story's source video and moves on; a separate
+worker drains the queue through the parallel download pool.
+
+Each transition is mirrored into the story's metadata.json as
+video_info.status:
+- queued       job recorded, waiting for a worker (retries wait until not_before)
+- downloading  claimed by a worker
+- done         video linked into the story folder (header probe recorded as video_info.probe)
+- failed       gave up after MAX_ATTEMPTS tries
+
+A failed attempt is re-queued with a not_before time that doubles per
+attempt (RETRY_BACKOFF_SECONDS, 2x, 4x, ...), so a flaky host is not retried
+immediately. metadata.json updates are read-modify-write cycles under the
+file's lock, since the producer and several workers touch the same story.
+
+Usage:
+    from acquisition_queue import VideoAcquisitionQueue
+
+    queue = VideoAcquisitionQueue('Crypto_Scripts/video/acquisition_queue.json')
+    queue.enqueue(story_id, video_url, story_paths['video'], story_paths['metadata'], clip_range)
+
+Worker:
+    python Shared_Resources/acquisition_queue.py Crypto_Scripts/video/acquisition_queue.json --workers 4
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import sys
+import time
+import logging
+from contextlib import contextmanager
+from concurrent.futures import wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Any
+
+from workflow_utils import VideoExtractor, VideoInfoCache, INFO_CACHE_DIRNAME, DOWNLOAD_WORKERS
+from video_probe import VideoProbe
+from file_lock import file_lock, read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+QUEUE_FILENAME = 'acquisition_queue.json'
+
+STATUS_QUEUED = 'queued'
+STATUS_DOWNLOADING = 'downloading'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# Failed downloads are re-queued until this many attempts
+MAX_ATTEMPTS = 3
+# Delay before the first retry; doubled for every further attempt
+RETRY_BACKOFF_SECONDS = 60
+# Jobs left 'downloading' this long belong to a crashed worker and are re-queued
+STALE_DOWNLOAD_SECONDS = 60 * 60
+
+def update_video_status(metadata_path: str, video_info: Dict[str, Any]):
+    """
+    Merge video_info fields into a story's metadata.json (locked, written atomically).
+
+    Args:
+        metadata_path (str): Story metadata.json path
+        video_info (Dict): Fields to set under workflow_execution.video_info
+    """
+    try:
+        with file_lock(metadata_path):
+            metadata = read_json(metadata_path, default={}) or {}
+
+            execution = metadata.setdefault('workflow_execution', {})
+            merged = dict(execution.get('video_info') or {})
+            merged.update(video_info)
+            execution['video_info'] = merged
+            execution['video_downloaded'] = merged.get('status') == STATUS_DONE
+
+            write_json_atomic(metadata_path, metadata)
+    except (OSError, ValueError) as e:
+        # ValueError: corrupt metadata.json, left as is rather than replaced
+        logger.error(f"Failed to update video status in {metadata_path}: {str(e)}")
+
+class VideoAcquisitionQueue:
+    """
+    JSON-persisted queue of story video downloads shared between the script
+    generator (producer) and worker processes (consumers).
+    """
+
+    def __init__(self, queue_path: str):
+        """
+        Initialize acquisition queue.
+
+        Args:
+            queue_path (str): Path to the JSON queue file (created on first enqueue)
+        """
+        self.queue_path = queue_path
+
+    def enqueue(self, story_id: Any, video_url: str, output_path: str, metadata_path: str,
+                clip_range: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """
+        Queue a story video and mark it queued in metadata.json.
+
+        Re-enqueueing a story replaces its previous job unless that job is
+        already downloading the same video.
+
+        Args:
+            story_id: Story ID
+            video_url (str): Source video URL
+            output_path (str): Story folder video path
+            metadata_path (str): Story metadata.json path
+            clip_range (Optional[Tuple[float, float]]): (start, end) seconds; full video when None
+
+        Returns:
+            Dict: The queued job
+        """
+        now = datetime.now().isoformat()
+        job = {
+            'job_id': str(story_id),
+            'story_id': story_id,
+            'video_url': video_url,
+            'output_path': output_path,
+            'metadata_path': metadata_path,
+            'clip_range': list(clip_range) if clip_range else None,
+            'status': STATUS_QUEUED,
+            'attempts': 0,
+            'enqueued_at': now,
+            'updated_at': now,
+            'errors': []
+        }
+
+        with self._locked() as jobs:
+            existing = jobs.get(job['job_id'])
+            if existing and existing['status'] == STATUS_DOWNLOADING and existing['video_url'] == video_url:
+                return existing
+            jobs[job['job_id']] = job
+
+        update_video_status(metadata_path, self._status_fields(job))
+        return job
+
+    def claim(self, limit: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Claim up to limit queued jobs for this worker (stale downloads included).
+
+        Queued retries are skipped until their not_before time.
+
+        Args:
+            limit (int): Maximum jobs to claim
+            now (Optional[float]): Current time as a timestamp (time.time() when None)
+
+        Returns:
+            List[Dict]: Jobs now marked downloading
+        """
+        now = now or time.time()
+        claimed = []
+
+        with self._locked() as jobs:
+            for job in sorted(jobs.values(), key=lambda j: j['enqueued_at']):
+                if len(claimed) >= limit:
+                    break
+                stale = (job['status'] == STATUS_DOWNLOADING and
+                         now - datetime.fromisoformat(job['updated_at']).timestamp() > STALE_DOWNLOAD_SECONDS)
+                if job['status'] == STATUS_QUEUED and self._retry_wait(job, now) > 0:
+                    continue
+                if job['status'] == STATUS_QUEUED or stale:
+                    job['status'] = STATUS_DOWNLOADING
+                    job.pop('not_before', None)
+                    job['attempts'] += 1
+                    job['worker_pid'] = os.getpid()
+                    job['updated_at'] = datetime.now().isoformat()
+                    claimed.append(dict(job))
+
+        for job in claimed:
+            update_video_status(job['metadata_path'], self._status_fields(job))
+        return claimed
+
+    def complete(self, job: Dict[str, Any], download_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record a finished download: done, re-queued for retry, or failed.
+
+        Args:
+            job (Dict): Claimed job
+            download_result (Dict): VideoExtractor.download_video result
+
+        Returns:
+            Dict: Updated job
+        """
+        with self._locked() as jobs:
+            current = jobs.get(job['job_id'])
+            if current is None or current['video_url'] != job['video_url']:
+                # Story was re-enqueued with another video meanwhile; keep the newer job
+                return job
+
+            current['updated_at'] = datetime.now().isoformat()
+            current.pop('worker_pid', None)
+            if download_result.get('success'):
+                current['status'] = STATUS_DONE
+                current['errors'] = []
+            else:
+                current['errors'] = (current['errors'] + download_result.get('errors', []))[-5:]
+                if current['attempts'] >= MAX_ATTEMPTS:
+                    current['status'] = STATUS_FAILED
+                else:
+                    current['status'] = STATUS_QUEUED
+                    backoff = RETRY_BACKOFF_SECONDS * 2 ** (current['attempts'] - 1)
+                    current['not_before'] = datetime.fromtimestamp(time.time() + backoff).isoformat()
+            job = dict(current)
+
+        fields = self._status_fields(job)
+        if job['status'] == STATUS_DONE:
+            fields.update({
+                'downloaded': True,
+                'file_path': download_result.get('output_file'),
+                'metadata': download_result.get('metadata', {}),
+                'clip_range': download_result.get('metadata', {}).get('clip_range', fields['clip_range']),
+                # Recorded at top level for video_integrity.py verify
+                'sha256': download_result.get('metadata', {}).get('sha256'),
+                'file_size': download_result.get('metadata', {}).get('file_size')
+            })
+            if download_result.get('output_file'):
+                # Container facts from the local file header (yt-dlp only reports remote metadata)
+                fields['probe'] = VideoProbe().probe_file(download_result['output_file'])
+        update_video_status(job['metadata_path'], fields)
+        return job
+
+    def drain(self, extractor: VideoExtractor, max_workers: int = DOWNLOAD_WORKERS,
+              max_jobs: Optional[int] = None) -> Dict[str, int]:
+        """
+        Download queued videos until the queue is empty.
+
+        Args:
+            extractor (VideoExtractor): Extractor whose download pool runs the jobs
+            max_workers (int): Jobs in flight at once
+            max_jobs (Optional[int]): Stop after this many jobs (all when None)
+
+        Returns:
+            Dict[str, int]: Counts of done, requeued and failed jobs
+        """
+        stats = {'done': 0, 'requeued': 0, 'failed': 0}
+        in_flight = {}
+        processed = 0
+
+        while True:
+            capacity = max_workers - len(in_flight)
+            if max_jobs is not None:
+                capacity = min(capacity, max_jobs - processed - len(in_flight))
+
+            for job in self.claim(capacity) if capacity > 0 else []:
+                clip_range = tuple(job['clip_range']) if job['clip_range'] else None
+                future = extractor.submit_download(job['video_url'], job['output_path'], clip_range)
+                in_flight[future] = job
+
+            if not in_flight:
+                # Nothing claimable: wait for the next retry to come due, or stop
+                delay = self.next_retry_delay() if capacity > 0 else None
+                if delay is None:
+                    break
+                time.sleep(delay)
+                continue
+
+            finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = self.complete(in_flight.pop(future), future.result())
+                processed += 1
+                if job['status'] == STATUS_DONE:
+                    stats['done'] += 1
+                elif job['status'] == STATUS_FAILED:
+                    stats['failed'] += 1
+                else:
+                    stats['requeued'] += 1
+                logger.info(f"Video for story {job['story_id']}: {job['status']}")
+
+        return stats
+
+    def next_retry_delay(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until the earliest queued job may be claimed.
+
+        Returns:
+            Optional[float]: 0 if a job is claimable now, None if nothing is queued
+        """
+        now = now or time.time()
+        with self._locked() as jobs:
+            waits = [self._retry_wait(job, now) for job in jobs.values() if job['status'] == STATUS_QUEUED]
+        return min(waits) if waits else None
+
+    @staticmethod
+    def _retry_wait(job: Dict[str, Any], now: float) -> float:
+        """Seconds until a queued job's backoff expires (0 when it is due)."""
+        if not job.get('not_before'):
+            return 0.0
+        return max(0.0, datetime.fromisoformat(job['not_before']).timestamp() - now)
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Jobs still queued or downloading."""
+        with self._locked() as jobs:
+            return [dict(job) for job in jobs.values() if job['status'] in (STATUS_QUEUED, STATUS_DOWNLOADING)]
+
+    @staticmethod
+    def _status_fields(job: Dict[str, Any]) -> Dict[str, Any]:
+        """video_info fields mirrored into metadata.json."""
+        clip_range = job.get('clip_range')
+        return {
+            'status': job['status'],
+            'url': job['video_url'],
+            'downloaded': job['status'] == STATUS_DONE,
+            'attempts': job['attempts'],
+            'updated_at': job['updated_at'],
+            'errors': job['errors'],
+            'not_before': job.get('not_before'),
+            'clip_range': {'mode': 'segment', 'start': clip_range[0], 'end': clip_range[1]} if clip_range else {'mode': 'full'}
+        }
+
+    @contextmanager
+    def _locked(self):
+        """
+        Load jobs under the queue lock and save them on exit.
+
+        Raises:
+            ValueError: If the queue file is corrupt (it is not replaced)
+        """
+        with file_lock(self.queue_path):
+            jobs = (read_json(self.queue_path, default={}) or {}).get('jobs', {})
+            yield jobs
+            write_json_atomic(self.queue_path, {'updated': datetime.now().isoformat(), 'jobs': jobs})
+
+def drain_queue(queue_path: str, max_workers: int = DOWNLOAD_WORKERS, use_store: bool = True) -> Dict[str, int]:
+    """
+    Worker entry point: drain a product's acquisition queue.
+
+    Uses the info cache next to the queue file and, by default, the shared
+    content-addressed video store.
+
+    Args:
+        queue_path (str): Path to the product's acquisition_queue.json
+        max_workers (int): Parallel downloads
+        use_store (bool): Download through the shared video store
+
+    Returns:
+        Dict[str, int]: Counts of done, requeued and failed jobs
+    """
+    video_store = None
+    if use_store:
+        from video_store import VideoStore
+        video_store = VideoStore()
+
+    info_cache = VideoInfoCache(os.path.join(os.path.dirname(os.path.abspath(queue_path)), INFO_CACHE_DIRNAME))
+    extractor = VideoExtractor(info_cache=info_cache, video_store=video_store)
+    try:
+        return VideoAcquisitionQueue(queue_path).drain(extractor, max_workers=max_workers)
+    finally:
+        if extractor.download_manager is not None:
+            extractor.download_manager.shutdown()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Drain a background video acquisition queue")
+    parser.add_argument('queue_path', help="Path to acquisition_queue.json (e.g. Crypto_Scripts/video/acquisition_queue.json)")
+    parser.add_argument('--workers', type=int, default=DOWNLOAD_WORKERS, help="Parallel downloads")
+    parser.add_argument('--no-store', action='store_true', help="Download directly instead of through the shared video store")
+    args = parser.parse_args()
+
+    stats = drain_queue(args.queue_path, max_workers=args.workers, use_store=not args.no_store)
+    print(f"✅ Done: {stats['done']} | 🔁 Requeued: {stats['requeued']} | ❌ Failed: {stats['failed']}")
+    sys.exit(1 if stats['failed'] else 0)
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Batch URL Correction Planner
+============================
+
+Subreddit-grouped URL correction for many broken stories at once. Instead of
+two search.json queries per story (Method #1 + Method #2), stories are grouped
+by subreddit, one shared candidate pool is fetched per subreddit, and every
+story in the group is matched locally against that pool.
+
+Per subreddit the pool is built from:
+- Top listings over the configured time windows (100 posts per request)
+- A small number of merged searches OR-ing key terms from the group's stories
+
+Matching uses BatchTitleMatcher with the strict (Method #1) thresholds first
+and the lenient (Method #2) thresholds for stories left unmatched.
+
+Small groups are not worth a pool: when the listings and merged searches
+would cost at least as many requests as correcting each story on its own,
+the group goes through URLCorrectionSystem.attempt_url_correction instead.
+
+Usage:
+    from batch_correction import BatchCorrectionPlanner
+    
+    planner = BatchCorrectionPlanner("Crypto_Scripts", negative_cache=cache)
+    plan = planner.plan(stories)            # {subreddit: [stories]}
+    stats = planner.correct(stories)        # batch_correct_urls-style statistics
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+from url_correction import URLCorrectionSystem
+from correction_cache import CorrectionNegativeCache
+from batch_matcher import BatchTitleMatcher
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+# Top-listing time windows fetched per subreddit (one request each)
+LISTING_TIME_WINDOWS = ('all', 'year')
+LISTING_LIMIT = 100
+
+# Merged searches per subreddit and stories folded into each one
+MAX_MERGED_SEARCHES_PER_SUBREDDIT = 2
+STORIES_PER_MERGED_SEARCH = 8
+TERMS_PER_STORY_IN_MERGED_SEARCH = 2
+MERGED_SEARCH_LIMIT = 100
+
+# Searches attempt_url_correction issues per story (Method #1 + Method #2)
+PER_STORY_SEARCH_REQUESTS = 2
+
+class BatchCorrectionPlanner:
+    """
+    Plans and executes subreddit-grouped URL correction.
+    
+    Reuses URLCorrectionSystem for subreddit/term extraction, failure
+    categorization and the negative cache, so results have the same shape
+    as attempt_url_correction and feed the same database update paths.
+    """
+    
+    def __init__(self, project_name: str = "BatchCorrection",
+                 negative_cache: Optional[CorrectionNegativeCache] = None,
+                 time_windows=LISTING_TIME_WINDOWS, extract_videos: bool = True):
+        """
+        Initialize batch correction planner.
+        
+        Args:
+            project_name (str): Project name for logging
+            negative_cache (Optional[CorrectionNegativeCache]): Known-failure cache
+            time_windows: Top-listing time windows fetched per subreddit
+            extract_videos (bool): Extract video URLs for matched posts
+        """
+        self.project_name = project_name
+        self.corrector = URLCorrectionSystem(project_name, negative_cache=negative_cache)
+        self.negative_cache = negative_cache
+        self.matcher = BatchTitleMatcher()
+        self.time_windows = tuple(time_windows)
+        self.extract_videos = extract_videos
+    
+    def plan(self, stories: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Group stories by subreddit.
+        
+        Args:
+            stories (List[Dict]): Story database entries with invalid URLs
+        
+        Returns:
+            Dict[str, List[Dict]]: Stories per subreddit; stories without a
+            usable subreddit are grouped under the empty string
+        """
+        groups: Dict[str, List[Dict]] = {}
+        display_names: Dict[str, str] = {}
+        
+        for story in stories:
+            subreddit = self.corrector.extract_subreddit(story.get('source', '')) or ''
+            key = subreddit.lower()
+            display_names.setdefault(key, subreddit)
+            groups.setdefault(display_names[key], []).append(story)
+        
+        return groups
+    
+    def correct(self, stories: List[Dict]) -> Dict[str, Any]:
+        """
+        Correct many stories with one shared candidate pool per subreddit.
+        
+        Args:
+            stories (List[Dict]): Story database entries with invalid URLs
+        
+        Returns:
+            Dict: Batch statistics in the batch_correct_urls format plus
+            request counts per subreddit
+        """
+        stats = {
+            'total_attempted': len(stories),
+            'successful_corrections': 0,
+            'method_1_success': 0,
+            'method_2_success': 0,
+            'failures': 0,
+            'skipped_known_failures': 0,
+            'failure_categories': {},
+            'search_requests': 0,
+            'subreddits': {},
+            'results': []
+        }
+        
+        # Known-bad stories never reach the network
+        pending = []
+        for story in stories:
+            skipped = self._check_negative_cache(story)
+            if skipped:
+                stats['skipped_known_failures'] += 1
+                stats['results'].append(skipped)
+            else:
+                pending.append(story)
+        
+        for subreddit, group in self.plan(pending).items():
+            if subreddit and not self.should_prefetch(group):
+                self._correct_individually(subreddit, group, stats)
+                continue
+            
+            pool_result = self.fetch_candidate_pool(subreddit, group) if subreddit else {
+                'posts': [], 'requests': 0, 'errors': ['Cannot extract subreddit from source field']
+            }
+            stats['search_requests'] += pool_result['requests']
+            stats['subreddits'][subreddit] = {
+                'stories': len(group),
+                'requests': pool_result['requests'],
+                'candidates': len(pool_result['posts'])
+            }
+            
+            matches = self.matcher.match_with_fallback(group, pool_result['posts'])
+            for story, match in zip(group, matches):
+                self._record_result(stats, self._build_result(story, match, pool_result))
+        
+        logger.info(f"[{self.project_name}] Batch correction: {stats['successful_corrections']}/{len(stories)} corrected "
+                    f"with {stats['search_requests']} requests across {len(stats['subreddits'])} subreddits")
+        return stats
+    
+    def should_prefetch(self, stories: List[Dict]) -> bool:
+        """
+        Whether a shared pool costs fewer requests than per-story correction.
+        
+        Args:
+            stories (List[Dict]): Stories in one subreddit group
+        
+        Returns:
+            bool: True if the group should be matched against a candidate pool
+        """
+        pool_requests = len(self.time_windows) + len(self.build_merged_queries(stories))
+        return pool_requests < len(stories) * PER_STORY_SEARCH_REQUESTS
+    
+    def _correct_individually(self, subreddit: str, stories: List[Dict], stats: Dict[str, Any]):
+        """Correct a small group story by story with the regular Method #1 → Method #2 path."""
+        requests_made = 0
+        for story in stories:
+            result = self.corrector.attempt_url_correction(story)
+            requests_made += self._search_requests(result)
+            self._record_result(stats, result)
+        
+        stats['search_requests'] += requests_made
+        stats['subreddits'][subreddit] = {
+            'stories': len(stories),
+            'requests': requests_made,
+            'candidates': 0,
+            'per_story': True
+        }
+    
+    @staticmethod
+    def _search_requests(result: Dict) -> int:
+        """Searches one correction issued: the planner's issued variants, else one per method tried."""
+        methods_attempted = result.get('methods_attempted', [])
+        if 'planned_search' in methods_attempted:
+            return len(result.get('metadata', {}).get('variants_issued', []))
+        return len(methods_attempted)
+    
+    @staticmethod
+    def _record_result(stats: Dict[str, Any], result: Dict):
+        """Add one correction result to the batch statistics."""
+        stats['results'].append(result)
+        if result['success']:
+            stats['successful_corrections'] += 1
+            if result['method_used'] == 'reddit_api_search':
+                stats['method_1_success'] += 1
+            else:
+                stats['method_2_success'] += 1
+        else:
+            stats['failures'] += 1
+            category = result.get('failure_category', 'unknown_error')
+            stats['failure_categories'][category] = stats['failure_categories'].get(category, 0) + 1
+    
+    def fetch_candidate_pool(self, subreddit: str, stories: List[Dict]) -> Dict[str, Any]:
+        """
+        Fetch the shared candidate pool for one subreddit.
+        
+        Args:
+            subreddit (str): Subreddit name (without r/)
+            stories (List[Dict]): Stories that will be matched against the pool
+        
+        Returns:
+            Dict: {'posts': deduplicated candidates, 'requests': int, 'errors': List[str]}
+        """
+        scraper = self.corrector.content_scraper
+        posts_by_url: Dict[str, Dict] = {}
+        errors: List[str] = []
+        requests_made = 0
+        
+        for window in self.time_windows:
+            listing = scraper.fetch_subreddit_listing(subreddit, sort='top', time_filter=window, limit=LISTING_LIMIT)
+            requests_made += 1
+            errors.extend(listing.get('errors', []))
+            for post in listing.get('posts', []):
+                posts_by_url.setdefault(post['url'], post)
+        
+        for query_terms in self.build_merged_queries(stories):
+            search = scraper.search_reddit_topic(subreddit, query_terms, limit=MERGED_SEARCH_LIMIT, time_filter='all')
+            requests_made += 1
+            errors.extend(search.get('errors', []))
+            for post in search.get('posts', []):
+                posts_by_url.setdefault(post['url'], post)
+        
+        return {'posts': list(posts_by_url.values()), 'requests': requests_made, 'errors': errors}
+    
+    def build_merged_queries(self, stories: List[Dict]) -> List[List[str]]:
+        """
+        Fold the strongest terms of several stories into OR-joined search queries.
+        
+        Args:
+            stories (List[Dict]): Stories in one subreddit group
+        
+        Returns:
+            List[List[str]]: Search term lists for ContentScraper.search_reddit_topic
+        """
+        queries = []
+        for start in range(0, len(stories), STORIES_PER_MERGED_SEARCH):
+            if len(queries) >= MAX_MERGED_SEARCHES_PER_SUBREDDIT:
+                break
+            
+            clauses = []
+            for story in stories[start:start + STORIES_PER_MERGED_SEARCH]:
+                terms = self.corrector.extract_enhanced_search_terms(story.get('title', ''))
+                terms = terms[:TERMS_PER_STORY_IN_MERGED_SEARCH]
+                if terms:
+                    clauses.append(f"({' '.join(terms)})")
+            
+            if clauses:
+                query = []
+                for clause in dict.fromkeys(clauses):
+                    if query:
+                        query.append('OR')
+                    query.append(clause)
+                queries.append(query)
+        
+        return queries
+    
+    def _check_negative_cache(self, story: Dict) -> Optional[Dict]:
+        """Return a skipped correction result if the story is a known failure."""
+        if self.negative_cache is None:
+            return None
+        
+        cached_failure = self.negative_cache.lookup(self.corrector.get_negative_cache_key(story))
+        if not cached_failure:
+            return None
+        
+        result = self._empty_result(story)
+        result.update({
+            'skipped': True,
+            'failure_category': cached_failure['failure_category'],
+            'failure_reasons': list(cached_failure.get('failure_reasons', [])),
+            'retry_after': cached_failure['retry_after']
+        })
+        return result
+    
+    def _build_result(self, story: Dict, match: Dict[str, Any], pool_result: Dict[str, Any]) -> Dict:
+        """Convert a matcher outcome into an attempt_url_correction-style result."""
+        result = self._empty_result(story)
+        result['methods_attempted'] = ['subreddit_prefetch']
+        result['metadata'] = {
+            'method': 'subreddit_prefetch',
+            'candidates': len(pool_result['posts']),
+            'match_mode': match['mode']
+        }
+        cache_key = self.corrector.get_negative_cache_key(story) if self.negative_cache is not None else None
+        best_match = match['match']
+        
+        if best_match:
+            # Strict matches meet Method #1 criteria, lenient ones Method #2
+            result['success'] = True
+            result['method_used'] = 'reddit_api_search' if match['mode'] == 'strict' else 'content_scraping'
+            result['corrected_url'] = best_match['url']
+            result['match_confidence'] = best_match.get('confidence', 0.0)
+            result['metadata']['matched_post'] = {
+                'title': best_match['title'],
+                'score': best_match['score'],
+                'num_comments': best_match['num_comments']
+            }
+            
+            if self.extract_videos:
+                try:
+                    video_result = self.corrector.video_extractor.extract_from_reddit_url(best_match['url'])
+                    result['video_extraction'] = video_result
+                    if video_result['success'] and video_result['videos']:
+                        result['video_url'] = video_result['videos'][0]['url']
+                except Exception as e:
+                    logger.warning(f"Video extraction failed but URL correction continues: {str(e)}")
+            
+            if cache_key:
+                self.negative_cache.clear(cache_key)
+            return result
+        
+        if not pool_result['posts']:
+            result['failure_reasons'] = pool_result['errors'] or ['No posts found in shared candidate pool']
+        else:
+            result['failure_reasons'] = ['No suitable matches found in shared candidate pool']
+        result['failure_category'] = self.corrector.categorize_failure(result['failure_reasons'])
+        
+        if cache_key:
+            cache_entry = self.negative_cache.record_failure(
+                cache_key, result['failure_category'], result['failure_reasons']
+            )
+            result['retry_after'] = cache_entry['retry_after']
+        return result
+    
+    @staticmethod
+    def _empty_result(story: Dict) -> Dict[str, Any]:
+        """Blank correction result matching attempt_url_correction's shape."""
+        return {
+            'success': False,
+            'story_id': story.get('id', 'unknown'),
+            'original_url': story.get('url', ''),
+            'corrected_url': None,
+            'video_url': None,
+            'video_extraction': None,
+            'method_used': None,
+            'attempt_timestamp': datetime.now().isoformat(),
+            'methods_attempted': [],
+            'failure_reasons': [],
+            'metadata': {}
+        }
+
+# Utility functions for integration
+def batch_correct_urls_grouped(stories: List[Dict], project_name: str = "BatchCorrection",
+                               negative_cache: Optional[CorrectionNegativeCache] = None) -> Dict:
+    """
+    Subreddit-grouped alternative to url_correction.batch_correct_urls.
+    
+    Args:
+        stories (List[Dict]): List of story database entries
+        project_name (str): Project name for logging
+        negative_cache (Optional[CorrectionNegativeCache]): Known-failure cache
+    
+    Returns:
+        Dict: Batch correction statistics
+    """
+    planner = BatchCorrectionPlanner(project_name, negative_cache=negative_cache)
+    return planner.correct(stories)
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Batch Title Matcher
+===================
+
+Vectorized many-to-many matching of story titles against candidate Reddit
+posts for bank-wide URL correction. Produces the same best match per story as
+URLCorrectionSystem.find_best_match, without evaluating every pair in Python.
+
+Approach:
+- Story and candidate titles are tokenized once into sparse binary matrices
+- Jaccard intersections for all pairs come from one sparse matrix product
+- Upvote proximity is computed as a dense (stories x candidates) array
+- The word-order bonus is bounded by WORD_ORDER_BONUS_WEIGHT, so exact scoring
+  only runs on the few candidates whose upper bound can still win
+
+Usage:
+    from batch_matcher import BatchTitleMatcher
+
+    matcher = BatchTitleMatcher()
+    matches = matcher.match(stories, posts)                 # strict thresholds
+    matches = matcher.match(stories, posts, lenient=True)   # Method #2 thresholds
+    results = matcher.match_with_fallback(stories, posts)   # strict, then lenient
+
+Requires numpy and scipy for the vectorized path. Without them the matcher
+falls back to pairwise scoring so results stay identical.
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import re
+import logging
+from typing import Dict, List, Optional, Any
+
+from url_correction import (
+    TITLE_SIMILARITY_THRESHOLD_STRICT, TITLE_SIMILARITY_THRESHOLD_LENIENT,
+    UPVOTE_TOLERANCE_STRICT, UPVOTE_TOLERANCE_LENIENT,
+    TITLE_SIMILARITY_WEIGHT, UPVOTE_SIMILARITY_WEIGHT, WORD_ORDER_BONUS_WEIGHT
+)
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+# Number of story rows scored per dense block (bounds memory at 10k x 100k)
+STORY_CHUNK_SIZE = 64
+
+# Candidates pre-selected per story by confidence upper bound before exact scoring
+CANDIDATE_SHORTLIST_SIZE = 32
+
+# Slack added to upper bounds so float rounding never prunes the exact best pair
+# (confidence never exceeds bound - BOUND_EPSILON)
+BOUND_EPSILON = 1e-9
+
+TOKEN_PATTERN = re.compile(r'\b[A-Za-z]+\b')
+
+class BatchTitleMatcher:
+    """
+    Many-to-many title matcher using sparse token matrices.
+
+    Scores every (story, candidate) pair with the confidence formula used by
+    URLCorrectionSystem.find_best_match:
+        confidence = title_similarity * TITLE_SIMILARITY_WEIGHT
+                   + upvote_similarity * UPVOTE_SIMILARITY_WEIGHT
+    and returns the best eligible candidate per story.
+    """
+
+    def __init__(self, chunk_size: int = STORY_CHUNK_SIZE, shortlist_size: int = CANDIDATE_SHORTLIST_SIZE):
+        """
+        Initialize batch matcher.
+
+        Args:
+            chunk_size (int): Story rows per dense scoring block
+            shortlist_size (int): Candidates per story scored exactly per round
+        """
+        self.chunk_size = chunk_size
+        self.shortlist_size = shortlist_size
+
+        # Import numpy/scipy dynamically to avoid dependency issues
+        try:
+            import numpy as np
+            from scipy import sparse
+            self._np = np
+            self._sparse = sparse
+            self.vectorized = True
+        except ImportError:
+            self._np = None
+            self._sparse = None
+            self.vectorized = False
+            logger.warning("numpy/scipy not installed - batch matching falls back to pairwise scoring. "
+                           "Install with: pip install numpy scipy")
+
+    def match(self, stories: List[Dict], posts: List[Dict], lenient: bool = False) -> List[Optional[Dict]]:
+        """
+        Find the best matching post for every story.
+
+        Args:
+            stories (List[Dict]): Story database entries (title, upvotes)
+            posts (List[Dict]): Candidate posts (title, url, score, num_comments)
+            lenient (bool): Use Method #2 thresholds instead of Method #1
+
+        Returns:
+            List[Optional[Dict]]: Best match per story, in story order, using the
+            same dict shape as URLCorrectionSystem.find_best_match
+        """
+        if not stories:
+            return []
+        if not posts:
+            return [None] * len(stories)
+
+        story_tokens = [self._tokenize(s.get('title', '')) for s in stories]
+        post_tokens = [self._tokenize(p.get('title', '')) for p in posts]
+
+        if self.vectorized:
+            return self._match_vectorized(stories, posts, story_tokens, post_tokens, lenient)
+        return self._match_pairwise(stories, posts, story_tokens, post_tokens, lenient)
+
+    def match_with_fallback(self, stories: List[Dict], posts: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Match stories under strict thresholds, retrying unmatched ones leniently.
+
+        Mirrors the Method #1 → Method #2 threshold progression of
+        URLCorrectionSystem.attempt_url_correction against a shared candidate pool.
+
+        Args:
+            stories (List[Dict]): Story database entries
+            posts (List[Dict]): Candidate posts
+
+        Returns:
+            List[Dict]: Per story {'story_id', 'match', 'mode'} where mode is
+            'strict', 'lenient' or None when no candidate qualified
+        """
+        strict_matches = self.match(stories, posts)
+        pending = [i for i, m in enumerate(strict_matches) if m is None]
+        lenient_matches = self.match([stories[i] for i in pending], posts, lenient=True) if pending else []
+        lenient_by_index = dict(zip(pending, lenient_matches))
+
+        results = []
+        for i, story in enumerate(stories):
+            if strict_matches[i] is not None:
+                match, mode = strict_matches[i], 'strict'
+            elif lenient_by_index.get(i) is not None:
+                match, mode = lenient_by_index[i], 'lenient'
+            else:
+                match, mode = None, None
+            results.append({'story_id': story.get('id'), 'match': match, 'mode': mode})
+
+        return results
+
+    # ==========================================
+    # VECTORIZED PATH
+    # ==========================================
+
+    def _match_vectorized(self, stories: List[Dict], posts: List[Dict], story_tokens: List[List[str]],
+                          post_tokens: List[List[str]], lenient: bool) -> List[Optional[Dict]]:
+        """Score all pairs in chunks with sparse intersections and bounded exact scoring."""
+        np = self._np
+        title_threshold, upvote_tolerance = self._thresholds(lenient)
+
+        vocabulary = self._build_vocabulary(story_tokens + post_tokens)
+        story_matrix = self._token_matrix(story_tokens, vocabulary)
+        post_matrix = self._token_matrix(post_tokens, vocabulary)
+        post_matrix_t = post_matrix.T.tocsc()
+
+        story_sizes = np.asarray(story_matrix.sum(axis=1)).ravel()
+        post_sizes = np.asarray(post_matrix.sum(axis=1)).ravel()
+        post_scores = np.array([p.get('score', 0) or 0 for p in posts], dtype=np.float64)
+        expected = np.array([self._expected_upvotes(s) for s in stories], dtype=np.float64)
+
+        post_index = [self._first_positions(tokens) for tokens in post_tokens]
+        results: List[Optional[Dict]] = [None] * len(stories)
+
+        for start in range(0, len(stories), self.chunk_size):
+            stop = min(start + self.chunk_size, len(stories))
+
+            # Jaccard: |A ∩ B| / (|A| + |B| - |A ∩ B|)
+            intersection = (story_matrix[start:stop] @ post_matrix_t).toarray().astype(np.float64)
+            union = story_sizes[start:stop, None] + post_sizes[None, :] - intersection
+            jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+            jaccard[story_sizes[start:stop] == 0, :] = 0.0
+
+            # Upvote proximity and eligibility
+            chunk_expected = expected[start:stop, None]
+            upvote_diff = np.abs(post_scores[None, :] - chunk_expected)
+            has_expected = chunk_expected > 0
+            upvote_similarity = np.where(
+                has_expected,
+                np.maximum(0.0, 1.0 - upvote_diff / np.maximum(chunk_expected, upvote_tolerance)),
+                0.5
+            )
+            upvote_match = np.where(has_expected, upvote_diff <= upvote_tolerance, True)
+
+            # Order bonus is zero without shared words and never exceeds its weight
+            title_upper = np.minimum(1.0, jaccard + np.where(intersection > 0, WORD_ORDER_BONUS_WEIGHT, 0.0))
+            confidence_upper = title_upper * TITLE_SIMILARITY_WEIGHT + upvote_similarity * UPVOTE_SIMILARITY_WEIGHT
+            confidence_upper += BOUND_EPSILON
+
+            # Pairs that can never qualify are excluded from the search
+            possible = upvote_match | (title_upper + BOUND_EPSILON >= title_threshold)
+            confidence_upper = np.where(possible, confidence_upper, -1.0)
+
+            for row in range(stop - start):
+                story_i = start + row
+                results[story_i] = self._best_in_row(
+                    confidence_upper[row], upvote_similarity[row], upvote_match[row],
+                    story_tokens[story_i], post_tokens, post_index, posts, title_threshold
+                )
+
+        return results
+
+    def _best_in_row(self, upper_row, upvote_row, upvote_match_row, target_tokens: List[str],
+                     post_tokens: List[List[str]], post_index: List[Dict[str, int]], posts: List[Dict],
+                     title_threshold: float) -> Optional[Dict]:
+        """Branch-and-bound over one story's candidates ordered by confidence upper bound."""
+        np = self._np
+        total = len(upper_row)
+        shortlist = min(self.shortlist_size, total)
+
+        # Shortlist the highest bounds first (whole tie groups, so every later candidate has a
+        # strictly lower bound); ties keep the earliest post, as the pairwise loop does
+        if shortlist < total:
+            cutoff = np.partition(upper_row, total - shortlist)[total - shortlist]
+            candidates = np.flatnonzero(upper_row >= cutoff)
+        else:
+            candidates = np.arange(total)
+        candidates = candidates[np.lexsort((candidates, -upper_row[candidates]))]
+
+        best_match = None
+        best_score = 0.0
+        best_index = total
+        visited = np.zeros(total, dtype=bool)
+
+        while True:
+            for j in candidates:
+                bound = upper_row[j]
+                # Candidates come in (bound desc, index asc) order, so once one cannot beat
+                # the best (or only tie it from a later index) no later one can either
+                if bound <= 0.0 or bound - BOUND_EPSILON < best_score or \
+                        (bound - BOUND_EPSILON <= best_score and j > best_index):
+                    return best_match
+                visited[j] = True
+
+                title_similarity = self._title_similarity(post_tokens[j], post_index[j], target_tokens)
+                if not (title_similarity >= title_threshold or upvote_match_row[j]):
+                    continue
+
+                confidence = (title_similarity * TITLE_SIMILARITY_WEIGHT) + (upvote_row[j] * UPVOTE_SIMILARITY_WEIGHT)
+                if confidence > best_score or (confidence == best_score and best_match is not None and j < best_index):
+                    best_score = confidence
+                    best_index = int(j)
+                    best_match = self._build_match(posts[j], confidence, title_similarity, float(upvote_row[j]))
+
+            if visited.all():
+                return best_match
+
+            # Shortlist exhausted without a decisive bound - continue over the remaining candidates
+            remaining = np.flatnonzero(~visited)
+            candidates = remaining[np.lexsort((remaining, -upper_row[remaining]))]
+
+    def _build_vocabulary(self, token_lists: List[List[str]]) -> Dict[str, int]:
+        """Assign a column index to every distinct token."""
+        vocabulary: Dict[str, int] = {}
+        for tokens in token_lists:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        return vocabulary
+
+    def _token_matrix(self, token_lists: List[List[str]], vocabulary: Dict[str, int]):
+        """Build a binary CSR matrix (rows x vocabulary) of unique title tokens."""
+        np = self._np
+        indptr = [0]
+        indices: List[int] = []
+        for tokens in token_lists:
+            indices.extend(vocabulary[token] for token in set(tokens))
+            indptr.append(len(indices))
+        return self._sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(token_lists), max(len(vocabulary), 1))
+        )
+
+    # ==========================================
+    # PAIRWISE FALLBACK
+    # ==========================================
+
+    def _match_pairwise(self, stories: List[Dict], posts: List[Dict], story_tokens: List[List[str]],
+                        post_tokens: List[List[str]], lenient: bool) -> List[Optional[Dict]]:
+        """Pure-Python scoring with pre-tokenized titles (no numpy/scipy)."""
+        title_threshold, upvote_tolerance = self._thresholds(lenient)
+        post_index = [self._first_positions(tokens) for tokens in post_tokens]
+        results = []
+
+        for story, target_tokens in zip(stories, story_tokens):
+            expected_upvotes = self._expected_upvotes(story)
+            best_match = None
+            best_score = 0.0
+
+            for j, post in enumerate(posts):
+                title_similarity = self._title_similarity(post_tokens[j], post_index[j], target_tokens)
+
+                if expected_upvotes > 0:
+                    upvote_diff = abs(post['score'] - expected_upvotes)
+                    upvote_similarity = max(0, 1 - (upvote_diff / max(expected_upvotes, upvote_tolerance)))
+                    upvote_match = upvote_diff <= upvote_tolerance
+                else:
+                    upvote_similarity = 0.5
+                    upvote_match = True
+
+                confidence = (title_similarity * TITLE_SIMILARITY_WEIGHT) + (upvote_similarity * UPVOTE_SIMILARITY_WEIGHT)
+                title_match = title_similarity >= title_threshold
+
+                if (title_match or upvote_match) and confidence > best_score:
+                    best_score = confidence
+                    best_match = self._build_match(post, confidence, title_similarity, upvote_similarity)
+
+            results.append(best_match)
+
+        return results
+
+    # ==========================================
+    # SHARED HELPERS
+    # ==========================================
+
+    @staticmethod
+    def _tokenize(title: str) -> List[str]:
+        """Lowercase word tokens in title order (same tokenizer as calculate_title_similarity)."""
+        return TOKEN_PATTERN.findall(title.lower()) if title else []
+
+    @staticmethod
+    def _first_positions(tokens: List[str]) -> Dict[str, int]:
+        """Map each token to its first position, replacing repeated list.index() scans."""
+        positions: Dict[str, int] = {}
+        for i, token in enumerate(tokens):
+            positions.setdefault(token, i)
+        return positions
+
+    @staticmethod
+    def _title_similarity(found_tokens: List[str], found_positions: Dict[str, int], target_tokens: List[str]) -> float:
+        """Exact URLCorrectionSystem.calculate_title_similarity on pre-tokenized titles."""
+        if not target_tokens or not found_tokens:
+            return 0.0
+
+        found_words = set(found_positions)
+        target_words = set(target_tokens)
+        union = found_words | target_words
+        jaccard = len(found_words & target_words) / len(union)
+
+        order_bonus = 0.0
+        for i, word in enumerate(target_tokens):
+            found_index = found_positions.get(word)
+            if found_index is not None:
+                order_bonus += 1.0 / (1 + abs(i - found_index))
+        order_bonus = order_bonus / len(target_tokens) * WORD_ORDER_BONUS_WEIGHT
+
+        return min(1.0, jaccard + order_bonus)
+
+    @staticmethod
+    def _expected_upvotes(story: Dict) -> float:
+        """Expected engagement for a story, matching find_best_match."""
+        return story.get('upvotes', 0) or story.get('expected_upvotes', 0) or 0
+
+    @staticmethod
+    def _thresholds(lenient: bool):
+        """Return (title_threshold, upvote_tolerance) for the matching mode."""
+        if lenient:
+            return TITLE_SIMILARITY_THRESHOLD_LENIENT, UPVOTE_TOLERANCE_LENIENT
+        return TITLE_SIMILARITY_THRESHOLD_STRICT, UPVOTE_TOLERANCE_STRICT
+
+    @staticmethod
+    def _build_match(post: Dict, confidence: float, title_similarity: float, upvote_similarity: float) -> Dict:
+        """Build a match dict in the find_best_match format."""
+        return {
+            'url': post['url'],
+            'title': post['title'],
+            'score': post['score'],
+            'num_comments': post['num_comments'],
+            'confidence': float(confidence),
+            'title_similarity': float(title_similarity),
+            'upvote_similarity': float(upvote_similarity)
+        }
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+URL Correction Negative Cache
+=============================
+
+Persisted record of failed URL corrections with an exponential retry schedule
+per failure category. Stories whose correction already failed are skipped
+instantly until their retry time, instead of repeating both Reddit searches.
+
+Entries are keyed by story id plus a signature of the search inputs
+(subreddit, Method #1 terms, Method #2 terms). Editing a story's title or
+source changes the signature, so the story is retried immediately.
+
+Batch worker processes and other products share the cache file: every
+update re-reads it under a file lock, applies the change and writes it back,
+so concurrent failures are merged rather than overwritten.
+
+Usage:
+    from correction_cache import CorrectionNegativeCache
+
+    cache = CorrectionNegativeCache('Crypto_Scripts/url_correction_cache.json')
+    corrector = URLCorrectionSystem("Crypto_Scripts", negative_cache=cache)
+    result = corrector.attempt_url_correction(story_data)   # skipped if known-bad
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import copy
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Any
+
+from file_lock import file_lock, read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+CACHE_FILENAME = 'url_correction_cache.json'
+
+# Retry delay = base_seconds * 2 ** (failures - 1), capped at max_seconds
+RETRY_SCHEDULE = {
+    'network_error': {'base_seconds': 5 * 60, 'max_seconds': 6 * 3600},
+    'parsing_error': {'base_seconds': 30 * 60, 'max_seconds': 24 * 3600},
+    'no_search_results': {'base_seconds': 24 * 3600, 'max_seconds': 14 * 24 * 3600},
+    'upvote_mismatch': {'base_seconds': 2 * 24 * 3600, 'max_seconds': 30 * 24 * 3600},
+    'title_mismatch': {'base_seconds': 3 * 24 * 3600, 'max_seconds': 30 * 24 * 3600},
+    'subreddit_not_found': {'base_seconds': 7 * 24 * 3600, 'max_seconds': 60 * 24 * 3600},
+    'unknown_error': {'base_seconds': 3600, 'max_seconds': 3 * 24 * 3600}
+}
+
+class CorrectionNegativeCache:
+    """
+    JSON-persisted negative cache for failed URL corrections.
+
+    Each entry records the failure category, failure count, last failure
+    reasons and the next time a correction may be retried.
+    """
+
+    def __init__(self, cache_path: str):
+        """
+        Initialize negative cache.
+
+        Args:
+            cache_path (str): Path to the JSON cache file (created on first write)
+        """
+        self.cache_path = cache_path
+        try:
+            self.entries: Dict[str, Dict[str, Any]] = self._read_entries()
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable correction cache {cache_path}, starting empty: {str(e)}")
+            self.entries = {}
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        """Entries currently on disk."""
+        return (read_json(self.cache_path, default={}) or {}).get('entries', {})
+
+    @staticmethod
+    def make_key(story_id: Any, subreddit: Optional[str], search_terms: List[str], enhanced_terms: List[str]) -> str:
+        """
+        Build the cache key for a story and the search inputs used to correct it.
+
+        Args:
+            story_id: Story ID
+            subreddit (Optional[str]): Subreddit searched
+            search_terms (List[str]): Method #1 search terms
+            enhanced_terms (List[str]): Method #2 search terms
+
+        Returns:
+            str: Key of the form "<story_id>:<signature>"
+        """
+        signature_source = '|'.join([
+            (subreddit or '').lower(),
+            ' '.join(search_terms).lower(),
+            ' '.join(enhanced_terms).lower()
+        ])
+        signature = hashlib.sha1(signature_source.encode('utf-8')).hexdigest()[:12]
+        return f"{story_id}:{signature}"
+
+    def lookup(self, key: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached failure if the story should still be skipped.
+
+        Args:
+            key (str): Cache key from make_key()
+            now (Optional[datetime]): Current time (defaults to datetime.now())
+
+        Returns:
+            Optional[Dict]: Cache entry while retry is not yet due, otherwise None
+        """
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+
+        now = now or datetime.now()
+        if now >= datetime.fromisoformat(entry['retry_after']):
+            return None
+        return entry
+
+    def record_failure(self, key: str, failure_category: str, failure_reasons: List[str],
+                       now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Record a failed correction and schedule the next retry.
+
+        Args:
+            key (str): Cache key from make_key()
+            failure_category (str): Category from URLCorrectionSystem.categorize_failure
+            failure_reasons (List[str]): Error messages from the attempt
+            now (Optional[datetime]): Current time (defaults to datetime.now())
+
+        Returns:
+            Dict: Updated cache entry
+        """
+        now = now or datetime.now()
+        with self._locked() as entries:
+            previous = entries.get(key, {})
+            # Backoff restarts when the failure mode changes
+            failures = previous.get('failures', 0) + 1 if previous.get('failure_category') == failure_category else 1
+
+            entry = {
+                'failure_category': failure_category,
+                'failures': failures,
+                'failure_reasons': failure_reasons[-5:],
+                'last_failure': now.isoformat(),
+                'retry_after': (now + self.retry_delay(failure_category, failures)).isoformat()
+            }
+            entries[key] = entry
+
+        logger.info(f"Correction for {key} cached as {failure_category} until {entry['retry_after']}")
+        return entry
+
+    def clear(self, key: str):
+        """Remove a story's entry after a successful correction."""
+        with self._locked() as entries:
+            entries.pop(key, None)
+
+    @staticmethod
+    def retry_delay(failure_category: str, failures: int) -> timedelta:
+        """Exponential retry delay for the given category and failure count."""
+        schedule = RETRY_SCHEDULE.get(failure_category, RETRY_SCHEDULE['unknown_error'])
+        seconds = schedule['base_seconds'] * (2 ** max(failures - 1, 0))
+        return timedelta(seconds=min(seconds, schedule['max_seconds']))
+
+    @contextmanager
+    def _locked(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """
+        Re-read the entries under the file lock, yield them for update and write them back.
+
+        self.entries is refreshed from the merged result, so other processes'
+        failures become visible to lookup() as well. A corrupt cache file is
+        not overwritten: the update then only applies to this process.
+        """
+        with file_lock(self.cache_path):
+            try:
+                entries = self._read_entries()
+            except (OSError, ValueError) as e:
+                logger.error(f"Not saving to unreadable correction cache {self.cache_path}: {str(e)}")
+                yield self.entries
+                return
+            unchanged = copy.deepcopy(entries)
+            yield entries
+            if entries != unchanged:
+                try:
+                    write_json_atomic(self.cache_path, {'updated': datetime.now().isoformat(), 'entries': entries})
+                except OSError as e:
+                    logger.error(f"Failed to save correction cache: {str(e)}")
+            self.entries = entries
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Cross-Product Story Orchestrator
+================================
+
+The Insurance, Crypto and App generators share most of their Reddit posts.
+Run separately, each one fetches and processes the same post on its own.
+This orchestrator loads the three product databases, groups their stories by
+canonical post URL (the Reddit post id, see PostArtifactCache.make_key), and
+runs every product's story for a post inside one shared artifact scope:
+
+- the post JSON is fetched once and reused for validation, scraping and
+  video extraction by all products
+- video discovery runs once; Crypto's clip download is queued as usual
+- each product renders its own brand script and updates its own database
+  (Crypto: story folder + script cache, Insurance/App: output/sample_scripts.md
+  + tracking fields)
+
+Only stories whose URL names a post (reddit:<id>) are grouped; subreddit or
+bare reddit.com URLs would put unrelated stories together. Those stories are
+listed in unindexed and correct_unindexed() runs each product's URL
+correction on them before grouping (run_all does this first).
+
+Usage:
+    from cross_product import CrossProductOrchestrator
+
+    orchestrator = CrossProductOrchestrator()
+    result = orchestrator.run_post('https://www.reddit.com/r/IdiotsInCars/comments/uott7p/...')
+    print(result['fetches'], {p: [s['success'] for s in r] for p, r in result['products'].items()})
+
+Command:
+    python Shared_Resources/cross_product.py https://www.reddit.com/r/.../comments/uott7p/...
+    python Shared_Resources/cross_product.py --all --min-products 3
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import sys
+import logging
+import importlib.util
+from typing import Dict, List, Optional, Any
+
+from workflow_utils import PostArtifactCache, shared_artifact_scope
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Product name -> product directory (each has script_generator.py + story_database.json)
+PRODUCTS = {
+    'insurance': 'Insurance_Scripts',
+    'crypto': 'Crypto_Scripts',
+    'app': 'App_Scripts'
+}
+
+# Products whose generator runs the story-folder pipeline (run_story_pipeline)
+PIPELINE_PRODUCTS = {'crypto'}
+
+# Canonical keys of Reddit post URLs (other URLs normalize to host + path)
+POST_KEY_PREFIX = 'reddit:'
+
+# Legacy generators append their scripts here (relative to the product directory)
+OUTPUT_SCRIPTS_FILE = 'output/sample_scripts.md'
+
+# generate_enhanced_script() reports failures as text starting with this marker
+LEGACY_FAILURE_MARKER = '❌'
+
+def load_product_generator(product_dir: str) -> Any:
+    """
+    Load a product's VideoScriptGenerator from its directory.
+
+    Every product module is named script_generator, so each is imported from
+    its file under a product-specific module name.
+
+    Args:
+        product_dir (str): Product directory (e.g. REPO_ROOT/Crypto_Scripts)
+
+    Returns:
+        VideoScriptGenerator for the product's story_database.json
+    """
+    module_name = f"{os.path.basename(product_dir).lower()}_script_generator"
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(product_dir, 'script_generator.py'))
+    module = importlib.util.module_from_spec(spec)
+
+    # Product modules import their sibling modules (e.g. script_templates)
+    sys.path.insert(0, product_dir)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(product_dir)
+    sys.modules[module_name] = module
+
+    return module.VideoScriptGenerator(os.path.join(product_dir, 'story_database.json'))
+
+class CrossProductOrchestrator:
+    """
+    Runs one Reddit post through every product that has a story for it.
+    """
+
+    def __init__(self, products: Optional[List[str]] = None, repo_root: str = REPO_ROOT):
+        """
+        Load product generators and index their stories by post.
+
+        Args:
+            products (Optional[List[str]]): Product names from PRODUCTS (default: all)
+            repo_root (str): Repository root holding the product directories
+        """
+        self.generators = {
+            product: load_product_generator(os.path.join(repo_root, PRODUCTS[product]))
+            for product in (products or list(PRODUCTS))
+        }
+        self.unindexed: Dict[str, List[int]] = {}
+        self.post_index = self.build_post_index()
+
+    @staticmethod
+    def canonical_key(url: str) -> str:
+        """Canonical post key of a Reddit URL (reddit:<post id> for post URLs)."""
+        return PostArtifactCache.make_key(url)
+
+    def build_post_index(self) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Group every product's stories by canonical post.
+
+        Stories without a post URL are left out of the index and listed in
+        self.unindexed.
+
+        Returns:
+            Dict: post key -> {product: [story ids]}
+        """
+        index: Dict[str, Dict[str, List[int]]] = {}
+        self.unindexed = {}
+        for product, generator in self.generators.items():
+            for story in generator.stories:
+                key = self.canonical_key(story.get('corrected_url') or story.get('url') or '')
+                if not key.startswith(POST_KEY_PREFIX):
+                    self.unindexed.setdefault(product, []).append(story['id'])
+                    continue
+                index.setdefault(key, {}).setdefault(product, []).append(story['id'])
+        return index
+
+    def correct_unindexed(self) -> int:
+        """
+        Run URL correction on stories without a post URL, then rebuild the index.
+
+        Each product's validate_story_url() records the corrected URL (or the
+        failure) in its own database; known failures are skipped by its
+        negative cache.
+
+        Returns:
+            int: Stories that now have a post URL
+        """
+        before = len(self.unindexed_ids())
+        for product, story_ids in self.unindexed.items():
+            for story_id in story_ids:
+                try:
+                    self.generators[product].validate_story_url(story_id)
+                except Exception as e:
+                    logger.error(f"{product} story {story_id} URL correction failed: {str(e)}")
+
+        self.post_index = self.build_post_index()
+        corrected = before - len(self.unindexed_ids())
+        logger.info(f"URL correction indexed {corrected} of {before} stories without a post URL")
+        return corrected
+
+    def unindexed_ids(self) -> List[str]:
+        """'product:story id' of every story left out of the post index."""
+        return [f"{product}:{story_id}" for product, ids in self.unindexed.items() for story_id in ids]
+
+    def shared_posts(self, min_products: int = 2) -> List[str]:
+        """Post keys with stories in at least min_products products."""
+        return [key for key, stories in self.post_index.items() if len(stories) >= min_products]
+
+    def run_post(self, post: str, format_override: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Produce every product's script for one post with a single fetch.
+
+        Args:
+            post (str): Reddit post URL or canonical post key
+            format_override (Optional[str]): Format for every product instead of each story's suggestion
+
+        Returns:
+            Dict: {'post_key', 'products': {product: [{'story_id', 'success', 'script', 'error'}]},
+                   'fetches', 'cache_hits'}
+        """
+        post_key = post if post in self.post_index else self.canonical_key(post)
+        result = {'post_key': post_key, 'products': {}, 'fetches': 0, 'cache_hits': 0}
+        stories = self.post_index.get(post_key, {})
+        if not stories:
+            logger.warning(f"No product story found for post {post_key}")
+            return result
+
+        with shared_artifact_scope([self.generators[product] for product in stories]) as cache:
+            for product, story_ids in stories.items():
+                result['products'][product] = [
+                    self._run_product_story(product, story_id, format_override) for story_id in story_ids
+                ]
+            result['fetches'] = cache.stats['fetches']
+            result['cache_hits'] = cache.stats['hits']
+
+        logger.info(f"Post {post_key}: {sum(len(ids) for ids in stories.values())} stories across "
+                    f"{len(stories)} products, {result['fetches']} fetch(es)")
+        return result
+
+    def run_all(self, min_products: int = 2, format_override: Optional[str] = None,
+                correct_urls: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every post shared by at least min_products products.
+
+        Args:
+            min_products (int): Products a post must appear in
+            format_override (Optional[str]): Format for every product instead of each story's suggestion
+            correct_urls (bool): Correct stories without a post URL before grouping
+
+        Returns:
+            Dict: post key -> run_post() result
+        """
+        if correct_urls and self.unindexed:
+            self.correct_unindexed()
+        return {post_key: self.run_post(post_key, format_override) for post_key in self.shared_posts(min_products)}
+
+    def _run_product_story(self, product: str, story_id: int, format_override: Optional[str]) -> Dict[str, Any]:
+        """Render and record one product's script inside the shared artifact scope."""
+        generator = self.generators[product]
+        outcome = {'story_id': story_id, 'success': False, 'script': None, 'error': None}
+
+        try:
+            if product in PIPELINE_PRODUCTS:
+                pipeline = generator.run_story_pipeline(story_id, format_override)
+                outcome.update({'success': pipeline['success'], 'script': pipeline['script'], 'error': pipeline['error']})
+                return outcome
+
+            # Legacy generators: enhanced workflow, then the same save + tracking as generate_and_save_script
+            script = generator.generate_enhanced_script(story_id, format_override)
+            if script.startswith(LEGACY_FAILURE_MARKER) or generator.get_story_by_id(story_id) is None:
+                outcome['error'] = script.splitlines()[0]
+                return outcome
+
+            if not generator.save_script_to_file(script, os.path.join(generator.base_path, OUTPUT_SCRIPTS_FILE)):
+                outcome['error'] = f"Could not save script to {OUTPUT_SCRIPTS_FILE}"
+                return outcome
+            generator.update_story_tracking(story_id, OUTPUT_SCRIPTS_FILE)
+            outcome.update({'success': True, 'script': script})
+
+        except Exception as e:
+            outcome['error'] = str(e)
+            logger.error(f"{product} story {story_id} failed: {str(e)}")
+
+        return outcome
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate every product's script for shared Reddit posts")
+    parser.add_argument('posts', nargs='*', help="Reddit post URLs (or reddit:<id> keys)")
+    parser.add_argument('--all', action='store_true', help="Run every post shared by --min-products products")
+    parser.add_argument('--min-products', type=int, default=2, help="Products a post must appear in (--all)")
+    parser.add_argument('--products', nargs='+', choices=list(PRODUCTS), help="Products to include")
+    parser.add_argument('--format', dest='format_override', help="Script format for every product")
+    parser.add_argument('--no-correct', action='store_true', help="Skip URL correction of stories without a post URL (--all)")
+    args = parser.parse_args()
+
+    orchestrator = CrossProductOrchestrator(args.products)
+    if args.all and not args.no_correct and orchestrator.unindexed:
+        print(f"🔧 Correcting {len(orchestrator.unindexed_ids())} stories without a post URL...")
+        orchestrator.correct_unindexed()
+    post_keys = orchestrator.shared_posts(args.min_products) if args.all else args.posts
+    if not post_keys:
+        parser.error("give post URLs or --all")
+
+    failed = 0
+    for post in post_keys:
+        result = orchestrator.run_post(post, args.format_override)
+        print(f"📌 {result['post_key']} ({result['fetches']} fetch, {result['cache_hits']} reused)")
+        for product, outcomes in result['products'].items():
+            for outcome in outcomes:
+                failed += not outcome['success']
+                status = "✅" if outcome['success'] else f"❌ {outcome['error']}"
+                print(f"   {product} story {outcome['story_id']}: {status}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Cross-Process File Locks
+========================
+
+Shared JSON state files (negative cache, query planner stats, metadata.json,
+story databases) are updated by the script generator, batch worker
+processes, the acquisition queue worker and the cross-product orchestrator.
+These helpers make their read-modify-write cycles safe:
+
+- file_lock(path) holds <path>.lock, created with O_EXCL, so only one
+  process or thread at a time updates the file. The lock records the
+  holder's pid; it is taken over only once that process has exited (or,
+  when no pid could be read, after STALE_LOCK_SECONDS), so a slow live
+  holder is never broken.
+- write_json_atomic(path, data) writes through a temp file unique to the
+  process and thread, then renames it over the target. Readers never see
+  a partial file and concurrent writers never share a temp file.
+- read_json(path) raises on a corrupt file instead of returning the
+  default, so a locked writer never replaces damaged state with an empty
+  document.
+
+Usage:
+    from file_lock import file_lock, read_json, write_json_atomic
+
+    with file_lock(cache_path):
+        data = read_json(cache_path, default={'entries': {}})
+        data['entries'][key] = entry
+        write_json_atomic(cache_path, data)
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+LOCK_SUFFIX = '.lock'
+LOCK_POLL_SECONDS = 0.05
+# Locks without a readable holder pid (holder died while creating it) older
+# than this are taken over; locks naming a pid wait for that process to exit
+STALE_LOCK_SECONDS = 60
+
+def _read_holder(lock_path: str) -> Optional[int]:
+    """Pid recorded in a lock file, or None when it is empty or unreadable."""
+    try:
+        with open(lock_path, 'r') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def _holder_alive(pid: int) -> bool:
+    """Whether the process holding a lock is still running."""
+    if os.name == 'nt':
+        # Signal 0 is not a probe on Windows: assume alive
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running under another user
+        return True
+    return True
+
+def _lock_abandoned(lock_path: str, holder: Optional[int], stale_seconds: float) -> bool:
+    if holder is not None:
+        return not _holder_alive(holder)
+    return time.time() - os.path.getmtime(lock_path) > stale_seconds
+
+def _break_lock(lock_path: str, holder: Optional[int]):
+    """
+    Remove an abandoned lock, unless another waiter has already replaced it.
+
+    The lock is renamed aside first and its holder re-checked, so a waiter
+    that judged the old lock abandoned cannot delete a new holder's lock.
+    """
+    claim_path = unique_temp_path(lock_path)
+    try:
+        os.rename(lock_path, claim_path)
+    except OSError:
+        return
+    if _read_holder(claim_path) != holder:
+        try:
+            # Put the new holder's lock back (fails only if yet another lock exists)
+            os.link(claim_path, lock_path)
+        except OSError:
+            pass
+    release_lock(claim_path)
+
+def acquire_lock(lock_path: str, stale_seconds: float = STALE_LOCK_SECONDS,
+                 wait_seconds: Optional[float] = None, poll_seconds: float = LOCK_POLL_SECONDS) -> bool:
+    """
+    Create lock_path exclusively, waiting while another holder has it.
+
+    Args:
+        lock_path (str): Lock file
+        stale_seconds (float): Age after which a lock without a readable pid is taken over
+        wait_seconds (Optional[float]): Give up after this long (None waits indefinitely)
+        poll_seconds (float): Interval between attempts
+
+    Returns:
+        bool: True once the lock is held, False if wait_seconds ran out
+    """
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    deadline = time.time() + wait_seconds if wait_seconds is not None else None
+
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            os.close(fd)
+            return True
+        except FileExistsError:
+            holder = _read_holder(lock_path)
+            try:
+                if _lock_abandoned(lock_path, holder, stale_seconds):
+                    logger.warning(f"Taking over abandoned lock {lock_path} (holder {holder or 'unknown'})")
+                    _break_lock(lock_path, holder)
+                    continue
+            except OSError:
+                continue
+
+        if deadline is not None and time.time() >= deadline:
+            return False
+        time.sleep(poll_seconds)
+
+def release_lock(lock_path: str):
+    """Remove a lock created by acquire_lock."""
+    try:
+        os.remove(lock_path)
+    except OSError:
+        pass
+
+@contextmanager
+def file_lock(path: str, stale_seconds: float = STALE_LOCK_SECONDS) -> Iterator[None]:
+    """
+    Hold the lock of a shared file for the duration of the block (not reentrant).
+
+    Args:
+        path (str): File being updated (the lock is path + LOCK_SUFFIX)
+        stale_seconds (float): Age after which a lock without a readable pid is taken over
+    """
+    lock_path = path + LOCK_SUFFIX
+    acquire_lock(lock_path, stale_seconds)
+    try:
+        yield
+    finally:
+        release_lock(lock_path)
+
+def unique_temp_path(path: str) -> str:
+    """Temp file next to path, unique to this process and thread."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def read_json(path: str, default: Any = None) -> Any:
+    """
+    Load a JSON file, or default when it does not exist.
+
+    Raises:
+        ValueError: If the file is not valid JSON. Writers holding file_lock
+            must not save over it, or the damaged state is silently replaced
+        OSError: If the file exists but cannot be read
+    """
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+def write_json_atomic(path: str, data: Any, indent: int = 2):
+    """
+    Write JSON via a unique temp file and rename it over path.
+
+    Raises:
+        OSError: If the file cannot be written (path is left unchanged)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = unique_temp_path(path)
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
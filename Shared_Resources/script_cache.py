@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Script Output Cache
+===================
+
+Per-story record of the inputs each generated script was rendered from,
+stored next to the scripts as stories/<folder>/script_cache.json. Entries
+are keyed by script file (script.md, script_<format>.md).
+
+Each script is keyed by fingerprints of its inputs:
+- story: the story database fields the script is written from
+- scraped_content: the Reddit post snapshot scraped by the workflow
+- format: the script format
+- template: the compiled format template (plus brand messages and CTAs)
+- seed: the render seed (template_engine.render_seed)
+
+A lookup whose fingerprints all match (and whose script file is unchanged)
+is a hit and returns the script without running the workflow. A miss lists
+the inputs that changed, so the caller can redo only what depends on them:
+a template or seed change only needs a re-render from the cached post
+snapshot, a story change needs the full workflow.
+
+Usage:
+    from script_cache import ScriptCache
+
+    cache = ScriptCache(story_folder)
+    inputs = ScriptCache.make_inputs(story, scraped_content, 'comedy', template_version, seed)
+    lookup = cache.lookup(inputs, script_path)
+    if lookup['hit']:
+        return lookup['script']
+    print(f"Regenerating: {ScriptCache.describe_changes(lookup['changed'])}")
+    ...
+    cache.store(inputs, script_path, script_digest(script))
+    cache.save()
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+from file_lock import unique_temp_path
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+CACHE_FILENAME = 'script_cache.json'
+
+# Story database fields a script is written from (status/tracking fields excluded)
+SCRIPT_INPUT_FIELDS = ('id', 'title', 'source', 'url', 'upvotes', 'comments',
+                       'theme', 'narrative', 'key_lesson', 'emotion')
+
+INPUT_NAMES = ('story', 'scraped_content', 'format', 'template', 'seed')
+
+def fingerprint(value: Any) -> str:
+    """SHA-256 of a JSON-serializable value (key order independent)."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def script_digest(script: str) -> str:
+    """SHA-256 of a script's UTF-8 text (what script_writer.stream_script reports)."""
+    return hashlib.sha256(script.encode('utf-8')).hexdigest()
+
+class ScriptCache:
+    """
+    Input-hash keyed cache of one story folder's generated scripts.
+    """
+
+    def __init__(self, story_folder: str):
+        """
+        Initialize cache for a story folder.
+
+        Args:
+            story_folder (str): stories/<folder> path (the file is created on first save)
+        """
+        self.story_folder = story_folder
+        self.cache_path = os.path.join(story_folder, CACHE_FILENAME)
+        self.data: Dict[str, Any] = {'story': None, 'scraped_content': None, 'entries': {}}
+
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self.data.update(json.load(f))
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable script cache {self.cache_path}: {str(e)}")
+
+    @staticmethod
+    def story_fingerprint(story: Dict[str, Any]) -> str:
+        """Fingerprint of the story fields a script is written from."""
+        return fingerprint({field: story.get(field) for field in SCRIPT_INPUT_FIELDS})
+
+    @staticmethod
+    def make_inputs(story: Dict[str, Any], scraped_content: Optional[Dict[str, Any]], format_type: str,
+                    template_version: str, seed: int) -> Dict[str, str]:
+        """
+        Fingerprints of every input of one rendered script.
+
+        Args:
+            story (Dict): Story database entry
+            scraped_content (Optional[Dict]): Scraped Reddit post (None when scraping failed)
+            format_type (str): Script format
+            template_version (str): Version of the compiled format template
+            seed (int): Render seed
+
+        Returns:
+            Dict[str, str]: Input name -> fingerprint
+        """
+        return {
+            'story': ScriptCache.story_fingerprint(story),
+            'scraped_content': fingerprint(scraped_content),
+            'format': format_type,
+            'template': template_version,
+            'seed': str(seed)
+        }
+
+    @property
+    def scraped_content(self) -> Optional[Dict[str, Any]]:
+        """Post snapshot recorded by the last workflow run."""
+        return self.data.get('scraped_content')
+
+    def workflow_current(self, story: Dict[str, Any]) -> bool:
+        """True if the recorded workflow run used the story as it is now."""
+        return self.data.get('story') is not None and self.data['story'] == self.story_fingerprint(story)
+
+    def lookup(self, inputs: Dict[str, str], script_path: str) -> Dict[str, Any]:
+        """
+        Look up a script file by its inputs.
+
+        Args:
+            inputs (Dict[str, str]): Fingerprints from make_inputs()
+            script_path (str): Script file in the story folder
+
+        Returns:
+            Dict: {'hit', 'script', 'changed': [input names, 'uncached' or 'script_file']}
+        """
+        result = {'hit': False, 'script': None, 'changed': []}
+        entry = self.data['entries'].get(os.path.basename(script_path))
+        if not entry:
+            result['changed'] = ['uncached']
+            return result
+
+        result['changed'] = [name for name in INPUT_NAMES if entry['inputs'].get(name) != inputs.get(name)]
+        if result['changed']:
+            return result
+
+        try:
+            with open(script_path, 'r', encoding='utf-8') as f:
+                script = f.read()
+        except OSError:
+            result['changed'] = ['script_file']
+            return result
+        if script_digest(script) != entry['script_sha256']:
+            # Edited or partially written script - regenerate rather than serve it
+            result['changed'] = ['script_file']
+            return result
+
+        result.update({'hit': True, 'script': script})
+        return result
+
+    def record_workflow(self, story: Dict[str, Any], scraped_content: Optional[Dict[str, Any]]):
+        """Record the story and post snapshot of a completed workflow run."""
+        self.data['story'] = self.story_fingerprint(story)
+        self.data['scraped_content'] = scraped_content
+
+    def store(self, inputs: Dict[str, str], script_path: str, script_sha256: str):
+        """
+        Record a freshly written script (persisted by save()).
+
+        Args:
+            inputs (Dict[str, str]): Fingerprints from make_inputs()
+            script_path (str): Script file in the story folder
+            script_sha256 (str): script_digest() of the written script
+        """
+        self.data['entries'][os.path.basename(script_path)] = {
+            'inputs': inputs,
+            'script_sha256': script_sha256,
+            'generated_at': datetime.now().isoformat()
+        }
+
+    def save(self):
+        """Write the cache file atomically."""
+        temp_path = unique_temp_path(self.cache_path)
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save script cache {self.cache_path}: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def describe_changes(changed: List[str]) -> str:
+        """Human readable miss reason."""
+        if changed == ['uncached']:
+            return "no cached script"
+        if changed == ['script_file']:
+            return "script file missing or edited"
+        return f"{', '.join(changed)} changed"
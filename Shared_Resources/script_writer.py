@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Streaming Script Writer
+=======================
+
+Writes a script to disk section by section as a renderer yields it, instead
+of building the whole script (and the whole aggregate file) as one string.
+
+Sections go to the story folder file and the aggregate output file
+(output/sample_scripts.md) in the same pass. The aggregate file is copied
+through line by line, with the script inserted before its
+"## Script Generation Notes" section just as save_script_to_file did. Both
+files are written to temp files and renamed, so readers never see a half
+written script. Memory use does not grow with the script, the aggregate file
+or the number of scripts written.
+
+Usage:
+    from script_writer import stream_script
+
+    sections = template.iter_sections(context)
+    result = stream_script(sections, script_path='stories/story_001_x/script.md',
+                           aggregate_path='output/sample_scripts.md')
+    print(result['sha256'], result['bytes'])
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import shutil
+import hashlib
+import contextlib
+from typing import Dict, Iterable, Optional, TextIO, Tuple, Any
+
+from file_lock import unique_temp_path
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+# Scripts are inserted into the aggregate file before this section
+AGGREGATE_MARKER = "## Script Generation Notes"
+AGGREGATE_SEPARATOR = "\n\n---\n\n"
+
+def _copy_until_marker(source: TextIO, target: TextIO, marker: str) -> Tuple[bool, str]:
+    """
+    Copy source to target up to the first occurrence of marker.
+
+    Returns:
+        Tuple[bool, str]: (marker found, rest of the marker's line starting at the marker)
+    """
+    for line in source:
+        index = line.find(marker)
+        if index != -1:
+            target.write(line[:index])
+            return True, line[index:]
+        target.write(line)
+    return False, ''
+
+def stream_script(sections: Iterable[str], script_path: Optional[str] = None,
+                  aggregate_path: Optional[str] = None, marker: str = AGGREGATE_MARKER) -> Dict[str, Any]:
+    """
+    Stream script sections into a script file and/or an aggregate file.
+
+    Args:
+        sections (Iterable[str]): Script text in order (e.g. a renderer's generator)
+        script_path (Optional[str]): File that receives exactly the script
+        aggregate_path (Optional[str]): Existing aggregate file the script is inserted into
+        marker (str): Aggregate section the script is inserted before (appended if absent)
+
+    Returns:
+        Dict: {'sha256' (of the script), 'bytes', 'sections'}
+
+    Raises:
+        OSError: If a file cannot be read or written (no target is modified)
+    """
+    result = {'sha256': None, 'bytes': 0, 'sections': 0}
+    digest = hashlib.sha256()
+    temp_paths = {}
+
+    try:
+        with contextlib.ExitStack() as stack:
+            targets = []
+            if script_path:
+                temp_paths[script_path] = unique_temp_path(script_path)
+                targets.append(stack.enter_context(open(temp_paths[script_path], 'w', encoding='utf-8')))
+
+            if aggregate_path:
+                source = stack.enter_context(open(aggregate_path, 'r', encoding='utf-8'))
+                temp_paths[aggregate_path] = unique_temp_path(aggregate_path)
+                aggregate = stack.enter_context(open(temp_paths[aggregate_path], 'w', encoding='utf-8'))
+                found, marker_line = _copy_until_marker(source, aggregate, marker)
+                if not found:
+                    aggregate.write("\n\n")
+                targets.append(aggregate)
+
+            for section in sections:
+                for target in targets:
+                    target.write(section)
+                encoded = section.encode('utf-8')
+                digest.update(encoded)
+                result['bytes'] += len(encoded)
+                result['sections'] += 1
+
+            if aggregate_path:
+                if found:
+                    aggregate.write(AGGREGATE_SEPARATOR)
+                    aggregate.write(marker_line)
+                    shutil.copyfileobj(source, aggregate)
+                else:
+                    aggregate.write("\n")
+
+        for path, temp_path in temp_paths.items():
+            os.replace(temp_path, path)
+    finally:
+        for temp_path in temp_paths.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    result['sha256'] = digest.hexdigest()
+    return result
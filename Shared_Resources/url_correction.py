@@ -17,6 +17,9 @@ Features:
 - Method #1: Reddit API search using story title and subreddit
 - Method #2: Content scraping fallback for edge cases  
 - Comprehensive failure tracking and categorization
+- Negative cache with per-category retry schedule for known-bad stories
+- Optional query planner: ranked query variants issued concurrently with early exit
+- Optional request-scoped artifact cache: matched post payload and video list reused by the workflow
 - Database update integration
 - Performance logging and analytics
 
@@ -28,9 +31,12 @@ import json
 import os
 import re
 import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from workflow_utils import ContentScraper, VideoExtractor, URLValidator
+from typing import Dict, List, Optional, Tuple, Any
+from workflow_utils import ContentScraper, VideoExtractor, URLValidator, PostArtifactCache
+from correction_cache import CorrectionNegativeCache
+from file_lock import file_lock, read_json, write_json_atomic
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -72,6 +78,25 @@ PRIORITY_WORD_PATTERNS = [
     r'(?i)\b(dashcam|camera|video|footage|caught|captured)\b'
 ]
 
+# Query planner settings
+QUERY_PLANNER_BUDGET = 4           # Maximum search queries issued per story
+QUERY_PLANNER_WORKERS = 2          # Queries in flight at once
+QUERY_PLANNER_RESULT_LIMIT = 25    # Posts requested per query
+QUERY_STATS_FILENAME = 'query_planner_stats.json'
+QUOTED_PHRASE_WORDS = 3
+MAX_KEY_NOUNS = 3
+UPVOTE_HINT_THRESHOLD = 1000       # Stories at or above this search top-of-all-time
+# Blended title/upvote confidence that stops the planner early (strict title match also required)
+EARLY_EXIT_CONFIDENCE = 0.85
+
+# Default variant order before any hit-rate history exists
+QUERY_VARIANT_ORDER = [
+    'method_1_terms', 'priority_patterns', 'quoted_phrase', 'key_nouns', 'title_upvote_hint'
+]
+
+# Priority patterns describing things rather than actions (used for key-noun queries)
+KEY_NOUN_PATTERNS = [PRIORITY_WORD_PATTERNS[0], PRIORITY_WORD_PATTERNS[2], PRIORITY_WORD_PATTERNS[3]]
+
 # Failure detection patterns
 FAILURE_PATTERNS = {
     'no_search_results': ['no posts found', 'no matching posts', 'empty results'],
@@ -97,16 +122,27 @@ class URLCorrectionSystem:
     - Database integration support
     """
     
-    def __init__(self, project_name: str = "URLCorrection"):
+    def __init__(self, project_name: str = "URLCorrection", negative_cache: Optional[CorrectionNegativeCache] = None,
+                 query_planner: Optional['SearchQueryPlanner'] = None,
+                 artifact_cache: Optional[PostArtifactCache] = None):
         """
         Initialize URL correction system.
         
         Args:
             project_name (str): Project name for logging
+            negative_cache (Optional[CorrectionNegativeCache]): Persisted record of
+                failed corrections; known-bad stories are skipped until their retry time
+            query_planner (Optional[SearchQueryPlanner]): When set, corrections run
+                ranked query variants concurrently instead of Method #1 → Method #2
+            artifact_cache (Optional[PostArtifactCache]): Story-run cache shared with the
+                workflow; corrections and matched posts are fetched once per run
         """
         self.project_name = project_name
-        self.content_scraper = ContentScraper()
-        self.video_extractor = VideoExtractor()
+        self.negative_cache = negative_cache
+        self.query_planner = query_planner
+        self.artifact_cache = artifact_cache
+        self.content_scraper = ContentScraper(artifact_cache=artifact_cache)
+        self.video_extractor = VideoExtractor(artifact_cache=artifact_cache)
         self.url_validator = URLValidator()
         
         # Failure tracking categories
@@ -133,12 +169,19 @@ class URLCorrectionSystem:
         Returns:
             Dict: Correction results with success status and details
         """
+        # Reuse this story run's earlier correction (and its video discovery)
+        if self.artifact_cache is not None:
+            cached_correction = self.artifact_cache.get_correction(self._correction_key(story_data.get('id', 'unknown')))
+            if cached_correction is not None:
+                return cached_correction
+        
         correction_result = {
             'success': False,
             'story_id': story_data.get('id', 'unknown'),
             'original_url': story_data.get('url', ''),
             'corrected_url': None,
             'video_url': None,
+            'video_extraction': None,
             'method_used': None,
             'attempt_timestamp': datetime.now().isoformat(),
             'methods_attempted': [],
@@ -146,8 +189,40 @@ class URLCorrectionSystem:
             'metadata': {}
         }
         
+        # Skip stories whose correction is known to fail until their retry is due
+        cache_key = None
+        if self.negative_cache is not None:
+            cache_key = self.get_negative_cache_key(story_data)
+            cached_failure = self.negative_cache.lookup(cache_key)
+            if cached_failure:
+                logger.info(f"[{self.project_name}] Skipping URL correction for story {story_data.get('id')}: "
+                            f"{cached_failure['failure_category']} cached until {cached_failure['retry_after']}")
+                correction_result['skipped'] = True
+                correction_result['failure_category'] = cached_failure['failure_category']
+                correction_result['failure_reasons'] = list(cached_failure.get('failure_reasons', []))
+                correction_result['retry_after'] = cached_failure['retry_after']
+                return correction_result
+        
         logger.info(f"[{self.project_name}] Starting URL correction for story {story_data.get('id')}")
         
+        # Planned multi-variant search replaces the sequential Method #1 → Method #2 searches
+        if self.query_planner is not None:
+            planned_result = self.try_planned_search(story_data)
+            correction_result['methods_attempted'].append('planned_search')
+            
+            if planned_result['success']:
+                logger.info(f"[{self.project_name}] Planned search succeeded for story {story_data.get('id')} "
+                            f"via {planned_result['metadata']['winning_variant']}")
+                correction_result.update(planned_result)
+                # Strict matches meet Method #1 criteria, lenient ones Method #2
+                correction_result['method_used'] = 'reddit_api_search' if planned_result['match_mode'] == 'strict' else 'content_scraping'
+                return self._finalize_successful_correction(correction_result, cache_key)
+            
+            correction_result['failure_reasons'].extend(planned_result.get('errors', []))
+            correction_result['metadata'] = planned_result['metadata']
+            logger.error(f"[{self.project_name}] Planned search failed for story {story_data.get('id')}")
+            return self._finalize_failed_correction(correction_result, story_data, cache_key)
+        
         # Method #1: Reddit API Search
         method1_result = self.try_method_1_reddit_search(story_data)
         correction_result['methods_attempted'].append('reddit_api_search')
@@ -156,7 +231,7 @@ class URLCorrectionSystem:
             logger.info(f"[{self.project_name}] Method #1 succeeded for story {story_data.get('id')}")
             correction_result.update(method1_result)
             correction_result['method_used'] = 'reddit_api_search'
-            return correction_result
+            return self._finalize_successful_correction(correction_result, cache_key)
         else:
             correction_result['failure_reasons'].extend(method1_result.get('errors', []))
             logger.warning(f"[{self.project_name}] Method #1 failed for story {story_data.get('id')}: {method1_result.get('errors', [])}")
@@ -169,17 +244,50 @@ class URLCorrectionSystem:
             logger.info(f"[{self.project_name}] Method #2 succeeded for story {story_data.get('id')}")
             correction_result.update(method2_result)
             correction_result['method_used'] = 'content_scraping'
-            return correction_result
+            return self._finalize_successful_correction(correction_result, cache_key)
         else:
             correction_result['failure_reasons'].extend(method2_result.get('errors', []))
             logger.error(f"[{self.project_name}] Both methods failed for story {story_data.get('id')}")
         
-        # Both methods failed - categorize failure
+        return self._finalize_failed_correction(correction_result, story_data, cache_key)
+    
+    def _correction_key(self, story_id: Any) -> Tuple[str, Any]:
+        """Artifact cache key for a story's correction (story ids are per product database)."""
+        return (self.project_name, story_id)
+    
+    def _finalize_successful_correction(self, correction_result: Dict, cache_key: Optional[str]) -> Dict:
+        """Clear the story's negative cache entry and share the result with the story run."""
+        if cache_key:
+            self.negative_cache.clear(cache_key)
+        if self.artifact_cache is not None:
+            self.artifact_cache.store_correction(self._correction_key(correction_result['story_id']), correction_result)
+        return correction_result
+    
+    def _finalize_failed_correction(self, correction_result: Dict, story_data: Dict, cache_key: Optional[str]) -> Dict:
+        """Categorize a failed correction and record it in the negative cache."""
         correction_result['failure_category'] = self.categorize_failure(correction_result['failure_reasons'])
         logger.error(f"[{self.project_name}] URL correction failed for story {story_data.get('id')}: {correction_result['failure_category']}")
         
+        if cache_key:
+            cache_entry = self.negative_cache.record_failure(
+                cache_key, correction_result['failure_category'], correction_result['failure_reasons']
+            )
+            correction_result['retry_after'] = cache_entry['retry_after']
+        
+        if self.artifact_cache is not None:
+            self.artifact_cache.store_correction(self._correction_key(correction_result['story_id']), correction_result)
         return correction_result
     
+    def get_negative_cache_key(self, story_data: Dict) -> str:
+        """Negative cache key from story id and the search inputs both methods would use."""
+        title = story_data.get('title', '')
+        return CorrectionNegativeCache.make_key(
+            story_data.get('id', 'unknown'),
+            self.extract_subreddit(story_data.get('source', '')),
+            self.extract_search_terms(title),
+            self.extract_enhanced_search_terms(title)
+        )
+    
     def try_method_1_reddit_search(self, story_data: Dict) -> Dict:
         """
         Method #1: Reddit API Search.
@@ -197,6 +305,7 @@ class URLCorrectionSystem:
             'success': False,
             'corrected_url': None,
             'video_url': None,
+            'video_extraction': None,
             'match_confidence': 0.0,
             'errors': [],
             'metadata': {
@@ -249,6 +358,7 @@ class URLCorrectionSystem:
             video_url = None
             try:
                 video_result = self.video_extractor.extract_from_reddit_url(best_match['url'])
+                result['video_extraction'] = video_result
                 if video_result['success'] and video_result['videos']:
                     video_url = video_result['videos'][0]['url']
             except Exception as e:
@@ -289,6 +399,7 @@ class URLCorrectionSystem:
             'success': False,
             'corrected_url': None,
             'video_url': None,
+            'video_extraction': None,
             'match_confidence': 0.0,
             'errors': [],
             'metadata': {
@@ -340,6 +451,7 @@ class URLCorrectionSystem:
             video_url = None
             try:
                 video_result = self.video_extractor.extract_from_reddit_url(best_match['url'])
+                result['video_extraction'] = video_result
                 if video_result['success'] and video_result['videos']:
                     video_url = video_result['videos'][0]['url']
             except Exception as e:
@@ -362,6 +474,217 @@ class URLCorrectionSystem:
         
         return result
     
+    def try_planned_search(self, story_data: Dict) -> Dict:
+        """
+        Multi-variant search with early exit.
+        
+        Issues the planner's highest-ranked query variants concurrently (up to
+        its budget) and stops as soon as one yields a strict title match whose
+        confidence reaches EARLY_EXIT_CONFIDENCE. Otherwise the best strict, then lenient,
+        match across all pooled results is used.
+        
+        Args:
+            story_data (Dict): Story database entry
+            
+        Returns:
+            Dict: Results in the Method #1 format plus 'match_mode' and the
+            winning variant in metadata
+        """
+        result = {
+            'success': False,
+            'corrected_url': None,
+            'video_url': None,
+            'video_extraction': None,
+            'match_confidence': 0.0,
+            'match_mode': None,
+            'errors': [],
+            'metadata': {
+                'method': 'planned_search',
+                'variants_planned': [],
+                'variants_issued': [],
+                'winning_variant': None,
+                'early_exit': False,
+                'posts_found': 0
+            }
+        }
+        
+        try:
+            subreddit = self.extract_subreddit(story_data.get('source', ''))
+            if not subreddit:
+                result['errors'].append('Cannot extract subreddit from source field')
+                return result
+            
+            upvotes = story_data.get('upvotes', 0) or story_data.get('expected_upvotes', 0)
+            variants = self.query_planner.rank(self.build_query_variants(story_data.get('title', ''), upvotes))
+            result['metadata']['variants_planned'] = [v['name'] for v in variants]
+            
+            if not variants:
+                result['errors'].append('Cannot extract search terms from title')
+                return result
+            
+            pooled_posts: Dict[str, Dict] = {}
+            post_variant: Dict[str, str] = {}
+            early_match = None
+            
+            queue = list(variants)
+            pending = {}
+            executor = ThreadPoolExecutor(max_workers=self.query_planner.max_workers)
+            
+            def submit_next():
+                variant = queue.pop(0)
+                future = executor.submit(
+                    self.content_scraper.search_reddit_topic, subreddit, variant['terms'],
+                    limit=QUERY_PLANNER_RESULT_LIMIT, time_filter=variant.get('time_filter'), sort=variant['sort']
+                )
+                pending[future] = variant
+                # Every submitted query runs immediately (at most max_workers are in flight)
+                result['metadata']['variants_issued'].append(variant['name'])
+            
+            try:
+                while queue and len(pending) < self.query_planner.max_workers:
+                    submit_next()
+                
+                while pending and early_match is None:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        variant = pending.pop(future)
+                        search_result = future.result()
+                        
+                        if not search_result['success']:
+                            result['errors'].extend(search_result.get('errors', [f"Search variant {variant['name']} failed"]))
+                            continue
+                        
+                        for post in search_result['posts']:
+                            if post['url'] not in pooled_posts:
+                                pooled_posts[post['url']] = post
+                                post_variant[post['url']] = variant['name']
+                        
+                        match = self.find_best_match(search_result['posts'], story_data)
+                        if match and match['confidence'] >= EARLY_EXIT_CONFIDENCE \
+                                and match['title_similarity'] >= TITLE_SIMILARITY_THRESHOLD_STRICT:
+                            if early_match is None or match['confidence'] > early_match[1]['confidence']:
+                                early_match = (variant['name'], match)
+                    
+                    while early_match is None and queue and len(pending) < self.query_planner.max_workers:
+                        submit_next()
+            finally:
+                # Queries not yet started are dropped once a winner is known
+                executor.shutdown(wait=False, cancel_futures=True)
+            
+            result['metadata']['posts_found'] = len(pooled_posts)
+            posts = list(pooled_posts.values())
+            
+            if early_match:
+                winning_variant, best_match = early_match
+                result['match_mode'] = 'strict'
+                result['metadata']['early_exit'] = True
+            else:
+                best_match = self.find_best_match(posts, story_data)
+                result['match_mode'] = 'strict'
+                if not best_match:
+                    best_match = self.find_best_match(posts, story_data, lenient=True)
+                    result['match_mode'] = 'lenient'
+                winning_variant = post_variant.get(best_match['url']) if best_match else None
+            
+            self.query_planner.record_outcome(result['metadata']['variants_issued'], winning_variant)
+            
+            if not posts:
+                result['errors'].append('No posts found in Reddit search')
+                result['match_mode'] = None
+                return result
+            
+            if not best_match:
+                result['errors'].append('No suitable matches found in search results')
+                result['match_mode'] = None
+                return result
+            
+            # Extract video if possible
+            video_url = None
+            try:
+                video_result = self.video_extractor.extract_from_reddit_url(best_match['url'])
+                result['video_extraction'] = video_result
+                if video_result['success'] and video_result['videos']:
+                    video_url = video_result['videos'][0]['url']
+            except Exception as e:
+                logger.warning(f"Video extraction failed but URL correction continues: {str(e)}")
+            
+            # Success
+            result['success'] = True
+            result['corrected_url'] = best_match['url']
+            result['video_url'] = video_url
+            result['match_confidence'] = best_match.get('confidence', 0.0)
+            result['metadata']['winning_variant'] = winning_variant
+            result['metadata']['matched_post'] = {
+                'title': best_match['title'],
+                'score': best_match['score'],
+                'num_comments': best_match['num_comments']
+            }
+            
+        except Exception as e:
+            result['errors'].append(f'Planned search exception: {str(e)}')
+            logger.exception(f"Planned search exception for story {story_data.get('id')}")
+        
+        return result
+    
+    def build_query_variants(self, title: str, upvotes: int = 0) -> List[Dict[str, Any]]:
+        """
+        Derive the candidate search queries for a story title.
+        
+        Variants:
+        - method_1_terms: Method #1 significant words
+        - priority_patterns: Method #2 priority-pattern words
+        - quoted_phrase: exact phrase from the start of the title
+        - key_nouns: vehicle, place and brand nouns
+        - title_upvote_hint: significant words, top-of-all-time for popular stories
+        
+        Args:
+            title (str): Story title
+            upvotes (int): Expected upvotes (selects the sort for the hint variant)
+            
+        Returns:
+            List[Dict]: Variants with 'name', 'terms', 'sort' and 'time_filter',
+            in QUERY_VARIANT_ORDER with duplicate queries removed
+        """
+        if not title:
+            return []
+        
+        words = re.findall(r'\b[A-Za-z]+\b', title)
+        significant = [w for w in words if w.lower() not in COMMON_WORDS and len(w) > MIN_WORD_LENGTH]
+        key_nouns = [w for w in significant if self._is_key_noun(w)][:MAX_KEY_NOUNS]
+        
+        candidates = {
+            'method_1_terms': {'terms': self.extract_search_terms(title), 'sort': 'top', 'time_filter': None},
+            'priority_patterns': {'terms': self.extract_enhanced_search_terms(title), 'sort': 'top', 'time_filter': None},
+            'quoted_phrase': {
+                'terms': [f'"{" ".join(words[:QUOTED_PHRASE_WORDS])}"'] if len(words) >= 2 else [],
+                'sort': 'relevance', 'time_filter': 'all'
+            },
+            'key_nouns': {'terms': key_nouns, 'sort': 'relevance', 'time_filter': 'all'},
+            'title_upvote_hint': {
+                'terms': significant,
+                'sort': 'top' if upvotes >= UPVOTE_HINT_THRESHOLD else 'relevance',
+                'time_filter': 'all'
+            }
+        }
+        
+        variants = []
+        seen = set()
+        for name in QUERY_VARIANT_ORDER:
+            variant = candidates[name]
+            signature = (' '.join(variant['terms']).lower(), variant['sort'], variant['time_filter'] or 'all')
+            if not variant['terms'] or signature in seen:
+                continue
+            seen.add(signature)
+            variants.append({'name': name, **variant})
+        
+        return variants
+    
+    def _is_key_noun(self, word: str) -> bool:
+        """Vehicle/place/camera nouns from the priority patterns, or brand-style casing (SpaceX, BMW)."""
+        if any(re.search(pattern, word) for pattern in KEY_NOUN_PATTERNS):
+            return True
+        return len(word) > 1 and (word.isupper() or any(c.isupper() for c in word[1:]))
+    
     def extract_subreddit(self, source: str) -> Optional[str]:
         """Extract subreddit name from source field."""
         if not source:
@@ -472,7 +795,28 @@ class URLCorrectionSystem:
                 }
         
         return best_match
-    
+
+    def find_best_matches(self, posts: List[Dict], stories: List[Dict], lenient: bool = False) -> List[Optional[Dict]]:
+        """
+        Find the best matching post for many stories against a shared candidate pool.
+
+        Vectorized equivalent of calling find_best_match once per story,
+        intended for bank-wide correction (see batch_matcher.BatchTitleMatcher).
+
+        Args:
+            posts (List[Dict]): Candidate posts shared by all stories
+            stories (List[Dict]): Story database entries to match
+            lenient (bool): Use more lenient matching criteria for Method #2
+
+        Returns:
+            List[Optional[Dict]]: Best match per story, in story order
+        """
+        from batch_matcher import BatchTitleMatcher
+
+        if not hasattr(self, '_batch_matcher'):
+            self._batch_matcher = BatchTitleMatcher()
+        return self._batch_matcher.match(stories, posts, lenient=lenient)
+
     def calculate_title_similarity(self, found_title: str, target_title: str) -> float:
         """Calculate similarity between titles using word overlap."""
         if not target_title or not found_title:
@@ -562,33 +906,110 @@ class URLCorrectionSystem:
         
         return update_data
 
+class SearchQueryPlanner:
+    """
+    Ranks search query variants by observed hit rate.
+    
+    Tracks how often each variant was issued and how often it produced the
+    winning match, and orders future queries by a smoothed win rate so the
+    most productive variants run first and the budget is spent on them.
+    
+    Outcomes are merged into the stats file under its lock, so batch worker
+    processes sharing one stats file add to each other's counts instead of
+    overwriting them.
+    """
+    
+    def __init__(self, stats_path: Optional[str] = None, budget: int = QUERY_PLANNER_BUDGET,
+                 max_workers: int = QUERY_PLANNER_WORKERS):
+        """
+        Initialize query planner.
+        
+        Args:
+            stats_path (Optional[str]): JSON file persisting variant statistics
+                (in-memory only when None)
+            budget (int): Maximum queries issued per story
+            max_workers (int): Queries in flight at once
+        """
+        self.stats_path = stats_path
+        self.budget = budget
+        self.max_workers = max_workers
+        self.stats: Dict[str, Dict[str, int]] = {}
+        
+        if stats_path:
+            try:
+                self.stats = (read_json(stats_path, default={}) or {}).get('variants', {})
+            except (OSError, ValueError) as e:
+                logger.error(f"Unreadable query planner stats {stats_path}, using defaults: {str(e)}")
+    
+    def hit_rate(self, variant_name: str) -> float:
+        """Laplace-smoothed share of issued queries that produced the winning match."""
+        variant_stats = self.stats.get(variant_name, {})
+        return (variant_stats.get('wins', 0) + 1) / (variant_stats.get('issued', 0) + 2)
+    
+    def rank(self, variants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order variants by hit rate (default order breaks ties) and apply the budget."""
+        ranked = sorted(enumerate(variants), key=lambda item: (-self.hit_rate(item[1]['name']), item[0]))
+        return [variant for _, variant in ranked][:self.budget]
+    
+    def record_outcome(self, issued: List[str], winning_variant: Optional[str]):
+        """Record which variants were issued and which one won (merged into the stats file)."""
+        if not self.stats_path:
+            self._add_outcome(self.stats, issued, winning_variant)
+            return
+        
+        try:
+            with file_lock(self.stats_path):
+                # Other processes may have recorded outcomes since this copy was loaded
+                stats = (read_json(self.stats_path, default={}) or {}).get('variants', {})
+                self._add_outcome(stats, issued, winning_variant)
+                self.stats = stats
+                write_json_atomic(self.stats_path, {'updated': datetime.now().isoformat(), 'variants': stats})
+        except ValueError as e:
+            # Corrupt stats file: left for inspection rather than overwritten
+            self._add_outcome(self.stats, issued, winning_variant)
+            logger.error(f"Not saving to unreadable query planner stats {self.stats_path}: {str(e)}")
+        except OSError as e:
+            logger.error(f"Failed to save query planner stats: {str(e)}")
+    
+    @staticmethod
+    def _add_outcome(stats: Dict[str, Dict[str, int]], issued: List[str], winning_variant: Optional[str]):
+        for name in issued:
+            variant_stats = stats.setdefault(name, {'issued': 0, 'wins': 0})
+            variant_stats['issued'] += 1
+            if name == winning_variant:
+                variant_stats['wins'] += 1
+
 # Utility functions for integration
-def correct_story_url(story_data: Dict, project_name: str = "URLCorrection") -> Dict:
+def correct_story_url(story_data: Dict, project_name: str = "URLCorrection",
+                      negative_cache: Optional[CorrectionNegativeCache] = None) -> Dict:
     """
     Convenience function for single story URL correction.
     
     Args:
         story_data (Dict): Story database entry
         project_name (str): Project name for logging
+        negative_cache (Optional[CorrectionNegativeCache]): Known-failure cache
         
     Returns:
         Dict: Correction results
     """
-    corrector = URLCorrectionSystem(project_name)
+    corrector = URLCorrectionSystem(project_name, negative_cache=negative_cache)
     return corrector.attempt_url_correction(story_data)
 
-def batch_correct_urls(stories: List[Dict], project_name: str = "URLCorrection") -> Dict:
+def batch_correct_urls(stories: List[Dict], project_name: str = "URLCorrection",
+                       negative_cache: Optional[CorrectionNegativeCache] = None) -> Dict:
     """
     Batch URL correction for multiple stories.
     
     Args:
         stories (List[Dict]): List of story database entries
         project_name (str): Project name for logging
+        negative_cache (Optional[CorrectionNegativeCache]): Known-failure cache
         
     Returns:
         Dict: Batch correction statistics
     """
-    corrector = URLCorrectionSystem(project_name)
+    corrector = URLCorrectionSystem(project_name, negative_cache=negative_cache)
     
     stats = {
         'total_attempted': len(stories),
@@ -596,6 +1017,7 @@ def batch_correct_urls(stories: List[Dict], project_name: str = "URLCorrection")
         'method_1_success': 0,
         'method_2_success': 0,
         'failures': 0,
+        'skipped_known_failures': 0,
         'failure_categories': {},
         'results': []
     }
@@ -610,6 +1032,8 @@ def batch_correct_urls(stories: List[Dict], project_name: str = "URLCorrection")
                 stats['method_1_success'] += 1
             elif result['method_used'] == 'content_scraping':
                 stats['method_2_success'] += 1
+        elif result.get('skipped'):
+            stats['skipped_known_failures'] += 1
         else:
             stats['failures'] += 1
             category = result.get('failure_category', 'unknown_error')
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+A/B Variant Engine
+==================
+
+Enumerates or samples script variants for ad testing without duplicates and
+stores them as one compact, indexed bundle per story.
+
+A variant is one combination of hook × brand message × CTA within a format.
+VariantSpace deduplicates each dimension's values, so every combination
+index is a distinct combination. It maps the combination indexes
+0..size-1 to combinations mixed-radix style, which allows sampling
+without replacement with no lists of combinations built up front.
+
+Bundles are two files in the story folder:
+- variants.md.gz: every variant script, concatenated (zcat-readable)
+- variants.json: index with each variant's combination, offset, length and
+  SHA-256 within the uncompressed stream
+
+Usage:
+    from variant_engine import VariantSpace, write_variant_bundle, read_variant
+
+    space = VariantSpace({'comedy': {'hook': hooks, 'message': messages, 'cta': ctas}})
+    for index in space.sample(1000, rng):
+        format_type, choice = space.combination(index)
+    write_variant_bundle(story_folder, rendered_variants)
+    script = read_variant(story_folder, 'comedy-0042')
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import random
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+
+from file_lock import unique_temp_path
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+BUNDLE_FILENAME = 'variants.md.gz'
+INDEX_FILENAME = 'variants.json'
+
+# Written between variants in the bundle stream (not part of any variant)
+VARIANT_SEPARATOR = "\n\n<!-- variant -->\n\n"
+
+def unique_values(values: Iterable[Any]) -> List[Any]:
+    """Values with duplicates removed, first occurrence order kept."""
+    return list(dict.fromkeys(values))
+
+class VariantSpace:
+    """
+    Mixed-radix index over per-group combinations of deduplicated dimensions.
+    """
+
+    def __init__(self, groups: Dict[str, Dict[str, List[Any]]]):
+        """
+        Build the combination space.
+
+        Args:
+            groups (Dict): Group (format) -> {dimension name: candidate values}.
+                Dimension order is the radix order; duplicate values are dropped.
+        """
+        self.groups: List[Tuple[str, Dict[str, List[Any]]]] = []
+        self._offsets: List[int] = []
+        self.size = 0
+
+        for group, dimensions in groups.items():
+            deduped = {name: unique_values(values) for name, values in dimensions.items()}
+            count = 1
+            for values in deduped.values():
+                count *= len(values)
+            if not count:
+                continue
+            self.groups.append((group, deduped))
+            self._offsets.append(self.size)
+            self.size += count
+
+    def combination(self, index: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        Combination at a flat index.
+
+        Args:
+            index (int): 0 <= index < size
+
+        Returns:
+            Tuple[str, Dict]: (group, {dimension name: value})
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"Variant index {index} outside 0..{self.size - 1}")
+
+        position = len(self._offsets) - 1
+        while self._offsets[position] > index:
+            position -= 1
+        group, dimensions = self.groups[position]
+
+        remainder = index - self._offsets[position]
+        choice = {}
+        for name in reversed(list(dimensions)):
+            remainder, value_index = divmod(remainder, len(dimensions[name]))
+            choice[name] = dimensions[name][value_index]
+        return group, {name: choice[name] for name in dimensions}
+
+    def sample(self, count: int, rng: random.Random) -> List[int]:
+        """
+        Up to count distinct combination indexes, in ascending order.
+
+        Every combination when count >= size; otherwise a sample without
+        replacement drawn from rng (seed it for reproducible bundles).
+        """
+        if count >= self.size:
+            return list(range(self.size))
+        return sorted(rng.sample(range(self.size), count))
+
+def write_variant_bundle(story_folder: str, variants: Iterable[Tuple[Dict[str, Any], str]],
+                         metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Stream rendered variants into the story folder's bundle and write its index.
+
+    Identical scripts (same SHA-256) are stored once.
+
+    Args:
+        story_folder (str): stories/<folder> path
+        variants (Iterable): (variant record with an 'id' key, script) pairs
+        metadata (Optional[Dict]): Extra fields for the index header (story id, seed, ...)
+
+    Returns:
+        Dict: The index ({'generated_at', 'count', 'duplicates_skipped', 'variants': [...], ...})
+    """
+    bundle_path = os.path.join(story_folder, BUNDLE_FILENAME)
+    index_path = os.path.join(story_folder, INDEX_FILENAME)
+    temp_bundle = unique_temp_path(bundle_path)
+    temp_index = unique_temp_path(index_path)
+
+    index = dict(metadata or {}, generated_at=datetime.now().isoformat(), count=0,
+                 duplicates_skipped=0, variants=[])
+    seen = set()
+    offset = 0
+    separator = VARIANT_SEPARATOR.encode('utf-8')
+
+    try:
+        with gzip.open(temp_bundle, 'wb') as bundle:
+            for record, script in variants:
+                encoded = script.encode('utf-8')
+                digest = hashlib.sha256(encoded).hexdigest()
+                if digest in seen:
+                    index['duplicates_skipped'] += 1
+                    continue
+                seen.add(digest)
+
+                if index['variants']:
+                    bundle.write(separator)
+                    offset += len(separator)
+                bundle.write(encoded)
+                index['variants'].append(dict(record, offset=offset, length=len(encoded), sha256=digest))
+                offset += len(encoded)
+
+        index['count'] = len(index['variants'])
+        with open(temp_index, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1, ensure_ascii=False)
+        os.replace(temp_bundle, bundle_path)
+        os.replace(temp_index, index_path)
+    finally:
+        for temp_path in (temp_bundle, temp_index):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    return index
+
+def load_variant_index(story_folder: str) -> Dict[str, Any]:
+    """The story folder's variant bundle index."""
+    with open(os.path.join(story_folder, INDEX_FILENAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def iter_variants(story_folder: str) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """Yield (index record, script) for every variant in the bundle, in order."""
+    index = load_variant_index(story_folder)
+    with gzip.open(os.path.join(story_folder, BUNDLE_FILENAME), 'rb') as bundle:
+        position = 0
+        for record in index['variants']:
+            bundle.read(record['offset'] - position)
+            yield record, bundle.read(record['length']).decode('utf-8')
+            position = record['offset'] + record['length']
+
+def read_variant(story_folder: str, variant_id: str) -> str:
+    """
+    One variant's script from the bundle.
+
+    Args:
+        story_folder (str): stories/<folder> path
+        variant_id (str): Variant id from the index
+
+    Returns:
+        str: Script text
+
+    Raises:
+        KeyError: If the bundle has no such variant
+    """
+    for record in load_variant_index(story_folder)['variants']:
+        if record['id'] == variant_id:
+            with gzip.open(os.path.join(story_folder, BUNDLE_FILENAME), 'rb') as bundle:
+                bundle.seek(record['offset'])
+                return bundle.read(record['length']).decode('utf-8')
+    raise KeyError(f"No variant {variant_id} in {story_folder}")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Video Download Integrity
+========================
+
+Integrity checks for downloaded story videos:
+- file_sha256: SHA-256 of a finished file (shared with the video store).
+  v.redd.it video-only clips are hashed in the download's write loop
+  instead; files written by yt-dlp, its ffmpeg segment downloader or the
+  v.redd.it muxer never pass through our code and are hashed with this
+  one read after check_video_file
+- check_video_file: size and container sanity check run before a download is
+  reported successful. Only hard failures (too small, truncated boxes or
+  Segment, unreadable MP4/Matroska header) make a file invalid; a missing
+  duration or an unrecognized container only leaves it unverified
+- verify_stories: parallel verification of every story video against the
+  digest recorded in metadata.json
+
+Usage:
+    check = check_video_file(output_path)
+    if check['valid']:
+        digest = file_sha256(output_path)
+
+Verify command:
+    python Shared_Resources/video_integrity.py Crypto_Scripts/stories --workers 8
+    python Shared_Resources/video_integrity.py Crypto_Scripts/stories --quick   # size + header only
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import sys
+import json
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+from video_probe import VideoProbe
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+# Anything smaller cannot hold a playable clip
+MIN_VIDEO_BYTES = 16 * 1024
+HASH_CHUNK_BYTES = 1024 * 1024
+VERIFY_WORKERS = 8
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def check_video_file(path: str, expected_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Size and container sanity check for a downloaded video.
+
+    Args:
+        path (str): Video file path
+        expected_size (Optional[int]): Exact size recorded for this file (e.g. in metadata.json)
+
+    Returns:
+        Dict: {'valid', 'verified', 'size', 'container', 'duration', 'errors', 'warnings'};
+        valid is False only for truncated or unreadable files, verified is False when
+        the container could not be checked
+    """
+    result = {'valid': False, 'verified': False, 'size': None, 'container': None, 'duration': None,
+              'errors': [], 'warnings': []}
+
+    try:
+        result['size'] = os.path.getsize(path)
+    except OSError as e:
+        result['errors'].append(f"Video file missing: {str(e)}")
+        return result
+
+    if result['size'] < MIN_VIDEO_BYTES:
+        result['errors'].append(f"Video file too small ({result['size']} bytes)")
+    if expected_size and result['size'] != expected_size:
+        result['errors'].append(f"Video file size {result['size']} does not match expected {expected_size}")
+
+    probe = VideoProbe()
+    info = probe.probe_file(path)
+    result['container'] = info['container']
+    result['duration'] = info['duration']
+
+    if info['container'] is None:
+        # Not MP4 or WebM/Matroska: nothing to check the bytes against
+        result['warnings'].append("Unrecognized container; file not verified")
+    else:
+        truncation = probe.find_truncation(path)
+        if truncation:
+            result['errors'].append(f"Truncated video file: {truncation}")
+        elif not info['success']:
+            result['errors'].extend(info['errors'] or ["Unreadable container header"])
+        elif not info['duration']:
+            # Fragmented MP4 without mehd and live WebM carry no total duration
+            result['warnings'].append("Container header reports no duration")
+        else:
+            result['verified'] = True
+
+    result['valid'] = not result['errors']
+    return result
+
+def verify_story_video(story_folder: str, quick: bool = False) -> Dict[str, Any]:
+    """
+    Verify one story folder's video against its metadata.json record.
+
+    Args:
+        story_folder (str): stories/<folder> path
+        quick (bool): Size and header checks only, no digest
+
+    Returns:
+        Dict: {'story_folder', 'status': ok|corrupt|missing|unrecorded|no_video, 'errors'}
+    """
+    result = {'story_folder': os.path.basename(story_folder), 'status': 'ok', 'errors': []}
+    try:
+        with open(os.path.join(story_folder, 'metadata.json'), 'r') as f:
+            metadata = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        metadata = {}
+
+    video_info = (metadata.get('workflow_execution') or {}).get('video_info') or {}
+    video_path = os.path.join(story_folder, 'video.mp4')
+
+    if not os.path.exists(video_path):
+        result['status'] = 'missing' if video_info.get('downloaded') else 'no_video'
+        if video_info.get('downloaded'):
+            result['errors'].append("metadata.json records a download but video.mp4 is missing")
+        return result
+
+    check = check_video_file(video_path, video_info.get('file_size'))
+    result['errors'].extend(check['errors'])
+
+    expected_digest = video_info.get('sha256')
+    if not expected_digest:
+        result['status'] = 'unrecorded'
+    elif not quick and not check['errors'] and file_sha256(video_path) != expected_digest:
+        result['errors'].append("SHA-256 does not match metadata.json")
+
+    if result['errors']:
+        result['status'] = 'corrupt'
+    return result
+
+def verify_stories(stories_root: str, max_workers: int = VERIFY_WORKERS, quick: bool = False) -> Dict[str, Any]:
+    """
+    Verify every story video under a stories/ tree in parallel.
+
+    Args:
+        stories_root (str): Product stories/ directory
+        max_workers (int): Folders verified at once (hashing releases the GIL)
+        quick (bool): Size and header checks only, no digest
+
+    Returns:
+        Dict: {'checked_at', 'counts': {status: n}, 'results': [...]}
+    """
+    folders = sorted(
+        os.path.join(stories_root, name) for name in os.listdir(stories_root)
+        if os.path.isdir(os.path.join(stories_root, name))
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda folder: verify_story_video(folder, quick), folders))
+
+    counts: Dict[str, int] = {}
+    for item in results:
+        counts[item['status']] = counts.get(item['status'], 0) + 1
+    return {'checked_at': datetime.now().isoformat(), 'counts': counts, 'results': results}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify downloaded story videos against metadata.json")
+    parser.add_argument('stories_root', help="Product stories/ directory (e.g. Crypto_Scripts/stories)")
+    parser.add_argument('--workers', type=int, default=VERIFY_WORKERS, help="Folders verified at once")
+    parser.add_argument('--quick', action='store_true', help="Size and header checks only (no SHA-256)")
+    args = parser.parse_args()
+
+    report = verify_stories(args.stories_root, args.workers, args.quick)
+    for item in report['results']:
+        if item['status'] in ('corrupt', 'missing'):
+            print(f"❌ {item['story_folder']}: {'; '.join(item['errors'])}")
+        elif item['status'] == 'unrecorded':
+            print(f"⚠️ {item['story_folder']}: no digest recorded")
+    print(" | ".join(f"{status}: {count}" for status, count in sorted(report['counts'].items())))
+    sys.exit(1 if report['counts'].get('corrupt') or report['counts'].get('missing') else 0)
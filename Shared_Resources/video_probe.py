@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""
+MP4/WebM Header Probe
+=====================
+
+Pure-Python container header parser for local and remote video metadata.
+Reads only the MP4 'moov' box or the Matroska/WebM EBML header elements,
+never the media data: local files are memory-mapped, remote files are read
+with HTTP Range requests (typically one or two 64 KB reads).
+
+Extracts:
+- Container (mp4 / webm / matroska)
+- Duration (seconds; fragmented MP4 from the mvex/mehd fragment duration)
+- Resolution (width x height of the first video track)
+- Video and audio codecs (sample entry / CodecID)
+- Average bitrate (file size over duration)
+
+No decoding and no ffmpeg, so thousands of clips can be catalogued in seconds.
+
+Usage:
+    from video_probe import VideoProbe
+
+    probe = VideoProbe()
+    info = probe.probe_file('stories/story_015_.../video.mp4')
+    info = probe.probe_url('https://example.com/clip.webm')
+
+Catalog:
+    python Shared_Resources/video_probe.py Crypto_Scripts/stories --catalog Crypto_Scripts/video/catalog.json
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import logging
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+# Minimum bytes fetched per ranged HTTP read
+HTTP_CHUNK_BYTES = 64 * 1024
+# moov boxes larger than this are not worth fetching remotely
+MAX_HEADER_BYTES = 16 * 1024 * 1024
+PROBE_WORKERS = 8
+VIDEO_EXTENSIONS = ('.mp4', '.m4v', '.mov', '.webm', '.mkv')
+
+# MP4 boxes descended into while looking for track metadata
+MP4_CONTAINER_BOXES = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+# Matroska element IDs
+EBML_HEADER = 0x1A45DFA3
+EBML_DOCTYPE = 0x4282
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+MKV_TRACKS = 0x1654AE6B
+MKV_TRACK_ENTRY = 0xAE
+MKV_TRACK_TYPE = 0x83
+MKV_CODEC_ID = 0x86
+MKV_VIDEO = 0xE0
+MKV_PIXEL_WIDTH = 0xB0
+MKV_PIXEL_HEIGHT = 0xBA
+MKV_CLUSTER = 0x1F43B675
+
+class ProbeError(Exception):
+    """Raised when a container header is missing or malformed."""
+
+class _FileSource:
+    """Random access over a memory-mapped local file."""
+
+    def __init__(self, path: str):
+        self.size = os.path.getsize(path)
+        self.bytes_read = 0
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def read(self, offset: int, length: int) -> bytes:
+        if self._map is None or offset >= self.size:
+            return b''
+        data = self._map[offset:offset + length]
+        self.bytes_read += len(data)
+        return data
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+class _HTTPSource:
+    """Random access over a remote file through HTTP Range requests."""
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 10):
+        self.url = url
+        self.headers = dict(headers or {'User-Agent': 'VideoGeneration/1.0'})
+        self.timeout = timeout
+        self.size: Optional[int] = None
+        self.bytes_read = 0
+        self.requests_made = 0
+        self._chunks: List[Tuple[int, bytes]] = []
+
+    def read(self, offset: int, length: int) -> bytes:
+        if self.size is not None and offset >= self.size:
+            return b''
+        for start, data in self._chunks:
+            if start <= offset and offset + length <= start + len(data):
+                return data[offset - start:offset - start + length]
+
+        fetch_length = max(length, HTTP_CHUNK_BYTES)
+        headers = dict(self.headers)
+        headers['Range'] = f"bytes={offset}-{offset + fetch_length - 1}"
+        response = requests.get(self.url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        self.requests_made += 1
+
+        if response.status_code == 206:
+            content_range = response.headers.get('Content-Range', '')
+            if '/' in content_range and not content_range.endswith('*'):
+                self.size = int(content_range.rsplit('/', 1)[1])
+            data = response.content
+        else:
+            # Server ignored the Range header and sent the whole file
+            self.size = len(response.content)
+            data = response.content[offset:offset + fetch_length]
+
+        self.bytes_read += len(data)
+        self._chunks.append((offset, data))
+        return data[:length]
+
+    def close(self):
+        self._chunks = []
+
+class VideoProbe:
+    """
+    Container header parser for MP4 (ISO BMFF) and WebM/Matroska files.
+    """
+
+    def probe_file(self, path: str) -> Dict[str, Any]:
+        """
+        Probe a local video file through a memory map.
+
+        Args:
+            path (str): Video file path
+
+        Returns:
+            Dict containing container, duration, resolution, codecs, bitrate and errors
+        """
+        result = self._empty_result(path)
+        try:
+            source = _FileSource(path)
+        except OSError as e:
+            result['errors'].append(f"Cannot open video file: {str(e)}")
+            return result
+
+        try:
+            return self._probe_source(source, result)
+        finally:
+            source.close()
+
+    def probe_url(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Probe a remote video file with ranged HTTP reads.
+
+        Args:
+            url (str): Direct video URL (.mp4 / .webm)
+            headers (Optional[Dict[str, str]]): Request headers
+
+        Returns:
+            Dict containing container, duration, resolution, codecs, bitrate and errors
+        """
+        result = self._empty_result(url)
+        source = _HTTPSource(url, headers)
+        try:
+            result = self._probe_source(source, result)
+        except requests.RequestException as e:
+            result['success'] = False
+            result['errors'].append(f"Network error reading video header: {str(e)}")
+        finally:
+            source.close()
+        result['http_requests'] = source.requests_made
+        return result
+
+    def find_truncation(self, path: str) -> Optional[str]:
+        """
+        Check that a local file's top-level MP4 boxes or Matroska Segment end within the file.
+
+        Only box and element headers are read, so this is as cheap as a probe.
+
+        Args:
+            path (str): Video file path
+
+        Returns:
+            Optional[str]: Description of the truncation, or None if the file is
+            complete or not an MP4/Matroska file
+        """
+        try:
+            source = _FileSource(path)
+        except OSError as e:
+            return f"Cannot open video file: {str(e)}"
+
+        try:
+            head = source.read(0, 16)
+            if head[:4] == struct.pack('>I', EBML_HEADER):
+                element_id, size, data_offset = self._read_element_header(source, 0)
+                header = self._read_element_header(source, data_offset + size)
+                if header is None:
+                    return "File ends before the Matroska Segment"
+                element_id, segment_size, segment_offset = header
+                if segment_size is not None and segment_offset + segment_size > source.size:
+                    return f"Matroska Segment ends at byte {segment_offset + segment_size} of {source.size}"
+            elif head[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide'):
+                offset = 0
+                while offset < source.size:
+                    header = self._read_box_header(source, offset)
+                    if header is None or not header[2]:
+                        break
+                    box_type, header_size, box_size = header
+                    if offset + box_size > source.size:
+                        return (f"{box_type.decode('ascii', 'replace')} box ends at byte "
+                                f"{offset + box_size} of {source.size}")
+                    offset += box_size
+        except (ProbeError, struct.error, ValueError) as e:
+            return f"Header parsing error: {str(e)}"
+        finally:
+            source.close()
+        return None
+
+    def probe_many(self, paths: List[str], max_workers: int = PROBE_WORKERS) -> List[Dict[str, Any]]:
+        """
+        Probe many local files in parallel (header reads are I/O bound).
+
+        Args:
+            paths (List[str]): Video file paths
+            max_workers (int): Files probed at once
+
+        Returns:
+            List[Dict]: Probe results in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.probe_file, paths))
+
+    def _probe_source(self, source, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Detect the container from the first bytes and run its parser."""
+        try:
+            head = source.read(0, 16)
+            if head[:4] == struct.pack('>I', EBML_HEADER):
+                self._parse_matroska(source, result)
+            elif head[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide'):
+                self._parse_mp4(source, result)
+            else:
+                raise ProbeError("Unrecognized container (expected MP4 or WebM/Matroska)")
+
+            result['file_size'] = source.size
+            if result['duration'] and source.size:
+                result['bitrate'] = int(source.size * 8 / result['duration'])
+            if result['width'] and result['height']:
+                result['resolution'] = f"{result['width']}x{result['height']}"
+            result['success'] = result['duration'] is not None or result['width'] is not None
+            if not result['success']:
+                result['errors'].append("Container header has no duration or video track")
+        except (ProbeError, struct.error, ValueError) as e:
+            result['errors'].append(f"Header parsing error: {str(e)}")
+
+        result['bytes_read'] = source.bytes_read
+        return result
+
+    # ------------------------------------------------------------------
+    # MP4 / ISO BMFF
+    # ------------------------------------------------------------------
+
+    def _parse_mp4(self, source, result: Dict[str, Any]):
+        """Locate the top-level moov box (start or end of file) and parse it."""
+        result['container'] = 'mp4'
+        offset = 0
+
+        while True:
+            header = self._read_box_header(source, offset)
+            if header is None:
+                raise ProbeError("No moov box found")
+            box_type, header_size, box_size = header
+
+            if box_type == b'ftyp':
+                brand = source.read(offset + header_size, 4)
+                if brand[:2] == b'qt':
+                    result['container'] = 'mov'
+            elif box_type == b'moov':
+                if box_size > MAX_HEADER_BYTES:
+                    raise ProbeError(f"moov box too large ({box_size} bytes)")
+                moov = source.read(offset + header_size, box_size - header_size)
+                self._parse_moov(memoryview(moov), result)
+                return
+
+            if box_size == 0:
+                raise ProbeError("No moov box found before end of file")
+            offset += box_size
+
+    @staticmethod
+    def _read_box_header(source, offset: int) -> Optional[Tuple[bytes, int, int]]:
+        """(type, header size, box size) of the box at offset, or None at end of file."""
+        header = source.read(offset, 16)
+        if len(header) < 8:
+            return None
+        size, box_type = struct.unpack('>I4s', header[:8])
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', header[8:16])[0]
+            header_size = 16
+        elif size == 0 and source.size is not None:
+            size = source.size - offset
+        if size and size < header_size:
+            raise ProbeError(f"Invalid {box_type!r} box size {size}")
+        return box_type, header_size, size
+
+    def _iter_boxes(self, data: memoryview):
+        """Yield (type, payload) for each box in a buffer."""
+        offset = 0
+        while offset + 8 <= len(data):
+            size, box_type = struct.unpack('>I4s', data[offset:offset + 8])
+            header_size = 8
+            if size == 1:
+                size = struct.unpack('>Q', data[offset + 8:offset + 16])[0]
+                header_size = 16
+            elif size == 0:
+                size = len(data) - offset
+            if size < header_size:
+                break
+            yield box_type, data[offset + header_size:offset + size]
+            offset += size
+
+    def _parse_moov(self, moov: memoryview, result: Dict[str, Any]):
+        """Read movie duration and per-track resolution/codec from moov."""
+        timescale = fragment_duration = 0
+        for box_type, payload in self._iter_boxes(moov):
+            if box_type == b'mvhd':
+                timescale, duration = self._read_time_fields(payload)
+                if timescale:
+                    result['duration'] = round(duration / timescale, 3)
+            elif box_type == b'mvex':
+                # Fragmented MP4: mvhd/mdhd durations are 0, mehd holds the total (in movie timescale)
+                result['fragmented'] = True
+                for child_type, child in self._iter_boxes(payload):
+                    if child_type == b'mehd':
+                        fragment_duration = struct.unpack('>Q' if child[0] == 1 else '>I',
+                                                          child[4:12] if child[0] == 1 else child[4:8])[0]
+            elif box_type == b'trak':
+                track = {}
+                self._parse_trak(payload, track)
+                handler = track.get('handler')
+                if handler == b'vide' and result['video_codec'] is None:
+                    result['video_codec'] = track.get('codec')
+                    result['width'] = track.get('width') or None
+                    result['height'] = track.get('height') or None
+                elif handler == b'soun' and result['audio_codec'] is None:
+                    result['audio_codec'] = track.get('codec')
+                if not result['duration'] and track.get('duration'):
+                    result['duration'] = track['duration']
+
+        if not result['duration'] and fragment_duration and timescale:
+            result['duration'] = round(fragment_duration / timescale, 3)
+
+    def _parse_trak(self, data: memoryview, track: Dict[str, Any]):
+        """Collect handler, dimensions, duration and codec from a trak subtree."""
+        for box_type, payload in self._iter_boxes(data):
+            if box_type in MP4_CONTAINER_BOXES:
+                self._parse_trak(payload, track)
+            elif box_type == b'tkhd':
+                # Width/height are 16.16 fixed point after the version-dependent time fields
+                dims_offset = 88 if payload[0] == 1 else 76
+                width, height = struct.unpack('>II', payload[dims_offset:dims_offset + 8])
+                track['width'], track['height'] = width >> 16, height >> 16
+            elif box_type == b'hdlr':
+                track['handler'] = bytes(payload[8:12])
+            elif box_type == b'mdhd':
+                timescale, duration = self._read_time_fields(payload)
+                if timescale:
+                    track['duration'] = round(duration / timescale, 3)
+            elif box_type == b'stsd':
+                # First sample entry: size(4) + format(4) after version/flags and entry count
+                track['codec'] = bytes(payload[12:16]).decode('ascii', 'replace').strip()
+
+    @staticmethod
+    def _read_time_fields(payload: memoryview) -> Tuple[int, int]:
+        """(timescale, duration) from an mvhd/mdhd full box."""
+        if payload[0] == 1:
+            return struct.unpack('>IQ', payload[20:32])
+        return struct.unpack('>II', payload[12:20])
+
+    # ------------------------------------------------------------------
+    # WebM / Matroska (EBML)
+    # ------------------------------------------------------------------
+
+    def _parse_matroska(self, source, result: Dict[str, Any]):
+        """Read DocType, segment Info and Tracks; stop at the first Cluster."""
+        element_id, size, data_offset = self._read_element_header(source, 0)
+        header = self._read_children(source, data_offset, size)
+        doc_type = header.get(EBML_DOCTYPE, [b'matroska'])[0]
+        result['container'] = bytes(doc_type).decode('ascii', 'replace').strip('\x00') or 'matroska'
+
+        offset = data_offset + size
+        element_id, segment_size, segment_offset = self._read_element_header(source, offset)
+        if element_id != MKV_SEGMENT:
+            raise ProbeError("No Matroska Segment element")
+
+        segment_end = segment_offset + segment_size if segment_size is not None else source.size
+        offset = segment_offset
+        timecode_scale = 1000000
+        found_info = found_tracks = False
+
+        while (segment_end is None or offset < segment_end) and not (found_info and found_tracks):
+            header = self._read_element_header(source, offset)
+            if header is None:
+                break
+            element_id, size, data_offset = header
+            if element_id == MKV_CLUSTER or size is None:
+                break
+
+            if element_id == MKV_INFO:
+                info = self._read_children(source, data_offset, size)
+                if MKV_TIMECODE_SCALE in info:
+                    timecode_scale = self._read_uint(info[MKV_TIMECODE_SCALE][0])
+                if MKV_DURATION in info:
+                    duration = self._read_float(info[MKV_DURATION][0])
+                    result['duration'] = round(duration * timecode_scale / 1e9, 3)
+                found_info = True
+            elif element_id == MKV_TRACKS:
+                self._parse_matroska_tracks(source, data_offset, size, result)
+                found_tracks = True
+
+            offset = data_offset + size
+
+    def _parse_matroska_tracks(self, source, offset: int, size: int, result: Dict[str, Any]):
+        """First video track's codec and pixel size, first audio track's codec."""
+        for entry in self._read_children(source, offset, size).get(MKV_TRACK_ENTRY, []):
+            fields = self._parse_children(entry)
+            track_type = self._read_uint(fields[MKV_TRACK_TYPE][0]) if MKV_TRACK_TYPE in fields else None
+            codec = bytes(fields[MKV_CODEC_ID][0]).decode('ascii', 'replace').strip('\x00') if MKV_CODEC_ID in fields else None
+
+            if track_type == 1 and result['video_codec'] is None:
+                result['video_codec'] = codec
+                if MKV_VIDEO in fields:
+                    video = self._parse_children(fields[MKV_VIDEO][0])
+                    if MKV_PIXEL_WIDTH in video:
+                        result['width'] = self._read_uint(video[MKV_PIXEL_WIDTH][0])
+                    if MKV_PIXEL_HEIGHT in video:
+                        result['height'] = self._read_uint(video[MKV_PIXEL_HEIGHT][0])
+            elif track_type == 2 and result['audio_codec'] is None:
+                result['audio_codec'] = codec
+
+    def _read_children(self, source, offset: int, size: int) -> Dict[int, List[memoryview]]:
+        """Read a master element's payload and split it into children."""
+        if size > MAX_HEADER_BYTES:
+            raise ProbeError(f"Header element too large ({size} bytes)")
+        return self._parse_children(memoryview(source.read(offset, size)))
+
+    def _parse_children(self, data: memoryview) -> Dict[int, List[memoryview]]:
+        """Children of a master element buffer, grouped by element ID."""
+        children: Dict[int, List[memoryview]] = {}
+        offset = 0
+        while offset < len(data):
+            element_id, id_length = self._read_vint(data, offset, keep_marker=True)
+            size, size_length = self._read_vint(data, offset + id_length)
+            start = offset + id_length + size_length
+            if size is None:
+                break
+            children.setdefault(element_id, []).append(data[start:start + size])
+            offset = start + size
+        return children
+
+    def _read_element_header(self, source, offset: int) -> Optional[Tuple[int, Optional[int], int]]:
+        """(element id, size or None if unknown, data offset) of the element at offset."""
+        head = source.read(offset, 12)
+        if len(head) < 2:
+            return None
+        element_id, id_length = self._read_vint(head, 0, keep_marker=True)
+        size, size_length = self._read_vint(head, id_length)
+        return element_id, size, offset + id_length + size_length
+
+    @staticmethod
+    def _read_vint(data, offset: int, keep_marker: bool = False) -> Tuple[Optional[int], int]:
+        """
+        Decode an EBML variable-length integer.
+
+        Returns:
+            (value, length); value is None for the reserved "unknown size" value
+        """
+        if offset >= len(data):
+            raise ProbeError("Truncated EBML element")
+        first = data[offset]
+        length = 1
+        mask = 0x80
+        while length <= 8 and not first & mask:
+            mask >>= 1
+            length += 1
+        if length > 8 or offset + length > len(data):
+            raise ProbeError("Invalid EBML variable-length integer")
+
+        value = first if keep_marker else first & (mask - 1)
+        for byte in data[offset + 1:offset + length]:
+            value = (value << 8) | byte
+        if not keep_marker and value == (1 << (7 * length)) - 1:
+            return None, length
+        return value, length
+
+    @staticmethod
+    def _read_uint(data: memoryview) -> int:
+        return int.from_bytes(bytes(data), 'big')
+
+    @staticmethod
+    def _read_float(data: memoryview) -> float:
+        if len(data) == 4:
+            return struct.unpack('>f', data)[0]
+        if len(data) == 8:
+            return struct.unpack('>d', data)[0]
+        raise ProbeError(f"Invalid EBML float size {len(data)}")
+
+    @staticmethod
+    def _empty_result(source: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'source': source,
+            'container': None,
+            'duration': None,
+            'width': None,
+            'height': None,
+            'resolution': None,
+            'video_codec': None,
+            'audio_codec': None,
+            'bitrate': None,
+            'file_size': None,
+            'fragmented': False,
+            'bytes_read': 0,
+            'probed_at': datetime.now().isoformat(),
+            'errors': []
+        }
+
+def build_catalog(root: str, catalog_path: Optional[str] = None, max_workers: int = PROBE_WORKERS) -> Dict[str, Any]:
+    """
+    Probe every video under root and optionally write a JSON catalog.
+
+    Args:
+        root (str): Directory to scan (e.g. a product's stories/ folder)
+        catalog_path (Optional[str]): Catalog JSON output path
+        max_workers (int): Files probed at once
+
+    Returns:
+        Dict: {'generated', 'root', 'videos': {relative path: probe result}}
+    """
+    paths = []
+    for directory, _, files in os.walk(root):
+        for name in sorted(files):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                paths.append(os.path.join(directory, name))
+
+    results = VideoProbe().probe_many(paths, max_workers=max_workers)
+    catalog = {
+        'generated': datetime.now().isoformat(),
+        'root': root,
+        'videos': {os.path.relpath(path, root): result for path, result in zip(paths, results)}
+    }
+
+    if catalog_path:
+        with open(catalog_path, 'w') as f:
+            json.dump(catalog, f, indent=2)
+        logger.info(f"Catalogued {len(paths)} videos to {catalog_path}")
+    return catalog
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Probe MP4/WebM headers and build a video catalog")
+    parser.add_argument('root', help="Directory to scan for videos")
+    parser.add_argument('--catalog', help="Write the catalog JSON here")
+    parser.add_argument('--workers', type=int, default=PROBE_WORKERS, help="Files probed at once")
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.root, args.catalog, args.workers)
+    for path, info in catalog['videos'].items():
+        if info['success']:
+            print(f"✅ {path}: {info['container']} {info['resolution'] or '?'} "
+                  f"{info['duration'] or '?'}s {info['video_codec'] or '?'}/{info['audio_codec'] or '-'}")
+        else:
+            print(f"❌ {path}: {'; '.join(info['errors'])}")
+    sys.exit(0)
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Disk-Budgeted Video Storage
+===========================
+
+Keeps story videos across all products (plus the shared video store) within
+a fixed disk budget. Last access is tracked per story video in metadata.json
+(video_info.last_accessed); when usage exceeds the budget, the least recently
+used clips of completed stories are evicted.
+
+Eviction deletes the story's video.mp4 (and the store blob once no story
+links to it) and leaves a stub in metadata.json:
+
+    video_info.status = 'evicted'
+    video_info.evicted = {'evicted_at', 'file_size', 'sha256'}
+
+The url and clip_range already recorded in video_info are enough for
+ensure_video() to re-fetch the clip through VideoExtractor on demand.
+
+Hardlinked copies (story folders linked from the store) share an inode and
+are counted and evicted as one clip.
+
+Store blobs may also be linked from stories this manager does not scan
+(symlinks leave no trace on the blob). Clips with a store blob are therefore
+only evicted when every product's stories/ is scanned and the blob has no
+hardlinks beyond the scanned ones.
+
+Usage:
+    from video_storage import VideoStorageManager
+
+    storage = VideoStorageManager(budget_bytes=20 * 1024**3)
+    storage.enforce_budget()
+    result = storage.ensure_video(story_folder, extractor)   # re-fetches evicted clips
+
+Command:
+    python Shared_Resources/video_storage.py --budget-gb 20
+    python Shared_Resources/video_storage.py --restore Crypto_Scripts/stories/story_015_...
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import sys
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Any
+
+from acquisition_queue import update_video_status, STATUS_DONE
+from video_store import DEFAULT_STORE_DIR
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRODUCT_DIRS = ['Crypto_Scripts', 'Insurance_Scripts', 'App_Scripts']
+DEFAULT_STORIES_ROOTS = [os.path.join(REPO_ROOT, product, 'stories') for product in PRODUCT_DIRS]
+
+DEFAULT_BUDGET_BYTES = 20 * 1024 ** 3
+
+STATUS_EVICTED = 'evicted'
+VIDEO_FILENAME = 'video.mp4'
+SCRIPT_FILENAME = 'script.md'
+METADATA_FILENAME = 'metadata.json'
+
+class VideoStorageManager:
+    """
+    LRU disk budget over story videos and the shared video store.
+    """
+
+    def __init__(self, stories_roots: Optional[List[str]] = None,
+                 budget_bytes: int = DEFAULT_BUDGET_BYTES, store_root: Optional[str] = DEFAULT_STORE_DIR):
+        """
+        Initialize storage manager.
+
+        Args:
+            stories_roots (Optional[List[str]]): stories/ directories to manage
+                (all product folders when None)
+            budget_bytes (int): Disk budget for all managed videos
+            store_root (Optional[str]): Shared video store directory (None to ignore)
+        """
+        self.stories_roots = stories_roots or DEFAULT_STORIES_ROOTS
+        # Blobs may be symlinked from any product: only a full scan sees every user
+        self.scans_all_stories = {os.path.abspath(root) for root in DEFAULT_STORIES_ROOTS} <= \
+            {os.path.abspath(root) for root in self.stories_roots}
+        self.budget_bytes = budget_bytes
+        self.store_root = store_root
+
+    def touch(self, story_folder: str):
+        """Record an access to a story's video (moves it to the back of the eviction order)."""
+        update_video_status(os.path.join(story_folder, METADATA_FILENAME),
+                            {'last_accessed': datetime.now().isoformat()})
+
+    def usage(self) -> Dict[str, Any]:
+        """
+        Current disk use of managed videos.
+
+        Returns:
+            Dict: {'bytes', 'budget_bytes', 'clips', 'evicted'}
+        """
+        clips = self._scan_clips()
+        evicted = sum(1 for folder in self._story_folders()
+                      if self._video_info(folder).get('status') == STATUS_EVICTED)
+        return {
+            'bytes': sum(clip['size'] for clip in clips),
+            'budget_bytes': self.budget_bytes,
+            'clips': len(clips),
+            'evicted': evicted
+        }
+
+    def enforce_budget(self, protect: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Evict least recently used clips until usage fits the budget.
+
+        Only clips whose stories are all completed (script written, download
+        done) are evicted; store blobs no story links to go first. Clips with
+        a store blob that unscanned stories may use are kept (see _blob_deletable).
+
+        Args:
+            protect (Optional[List[str]]): Story folders never evicted in this pass
+
+        Returns:
+            Dict: {'bytes_before', 'bytes_after', 'evicted': [story folders], 'freed_bytes'}
+        """
+        protected = {os.path.abspath(folder) for folder in protect or []}
+        clips = self._scan_clips()
+        used = sum(clip['size'] for clip in clips)
+        report = {'bytes_before': used, 'bytes_after': used, 'evicted': [], 'freed_bytes': 0}
+        if used <= self.budget_bytes:
+            return report
+
+        candidates = [
+            clip for clip in clips
+            if all(self._is_evictable(folder) and folder not in protected for folder in clip['stories'])
+            and self._blob_deletable(clip)
+        ]
+        # Orphaned blobs first, then least recently used
+        candidates.sort(key=lambda clip: (bool(clip['stories']), clip['last_access']))
+
+        for clip in candidates:
+            if used <= self.budget_bytes:
+                break
+            if self._evict_clip(clip):
+                used -= clip['size']
+                report['freed_bytes'] += clip['size']
+                report['evicted'].extend(clip['stories'])
+
+        report['bytes_after'] = used
+        if used > self.budget_bytes:
+            logger.warning(f"Video storage still over budget ({used} > {self.budget_bytes} bytes); "
+                           f"remaining clips belong to stories in progress or to store blobs used elsewhere")
+        return report
+
+    def ensure_video(self, story_folder: str, extractor) -> Dict[str, Any]:
+        """
+        Return a story's video, re-fetching it through the extractor if it was evicted.
+
+        Args:
+            story_folder (str): Story folder path
+            extractor (VideoExtractor): Extractor used for the re-fetch
+
+        Returns:
+            Dict: {'success', 'output_file', 'refetched', 'errors'}
+        """
+        video_path = os.path.join(story_folder, VIDEO_FILENAME)
+        metadata_path = os.path.join(story_folder, METADATA_FILENAME)
+        result = {'success': False, 'output_file': None, 'refetched': False, 'errors': []}
+
+        if os.path.exists(video_path):
+            self.touch(story_folder)
+            result.update({'success': True, 'output_file': video_path})
+            return result
+
+        video_info = self._video_info(story_folder)
+        if video_info.get('status') != STATUS_EVICTED or not video_info.get('url'):
+            result['errors'].append("Story has no downloaded or evicted video")
+            return result
+
+        clip_range = self._clip_range_tuple(video_info.get('clip_range'))
+        download = extractor.download_video(video_info['url'], video_path, clip_range)
+        if not download['success']:
+            result['errors'].extend(download.get('errors', []))
+            return result
+
+        stub = video_info.get('evicted') or {}
+        metadata = download.get('metadata', {})
+        if stub.get('sha256') and metadata.get('sha256') and stub['sha256'] != metadata['sha256']:
+            logger.warning(f"Re-fetched video for {story_folder} differs from the evicted copy")
+
+        now = datetime.now().isoformat()
+        update_video_status(metadata_path, {
+            'status': STATUS_DONE,
+            'downloaded': True,
+            'file_path': download.get('output_file'),
+            'sha256': metadata.get('sha256'),
+            'file_size': metadata.get('file_size'),
+            'evicted': None,
+            'refetched_at': now,
+            'last_accessed': now
+        })
+        logger.info(f"Re-fetched evicted video for {os.path.basename(story_folder)}")
+
+        result.update({'success': True, 'output_file': video_path, 'refetched': True})
+        # Make room for the re-fetched clip without evicting it straight away
+        self.enforce_budget(protect=[story_folder])
+        return result
+
+    def _scan_clips(self) -> List[Dict[str, Any]]:
+        """Group story videos and store blobs by inode: one entry per clip on disk."""
+        clips: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+        def clip_for(path: str) -> Optional[Dict[str, Any]]:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            clip = clips.setdefault((stat.st_dev, stat.st_ino), {
+                'size': stat.st_size, 'stories': [], 'paths': [], 'blobs': [], 'last_access': None,
+                'mtime': stat.st_mtime, 'nlink': stat.st_nlink, 'hardlinks': 0
+            })
+            if not os.path.islink(path):
+                clip['hardlinks'] += 1
+            return clip
+
+        for folder in self._story_folders():
+            video_path = os.path.join(folder, VIDEO_FILENAME)
+            clip = clip_for(video_path)
+            if clip is None:
+                continue
+            clip['stories'].append(folder)
+            clip['paths'].append(video_path)
+            last_access = self._last_access(self._video_info(folder))
+            if last_access is not None:
+                clip['last_access'] = max(clip['last_access'] or 0, last_access)
+
+        blobs_dir = os.path.join(self.store_root, 'blobs') if self.store_root else None
+        if blobs_dir and os.path.isdir(blobs_dir):
+            for directory, _, filenames in os.walk(blobs_dir):
+                for filename in filenames:
+                    if filename.endswith('.mp4'):
+                        blob_path = os.path.join(directory, filename)
+                        clip = clip_for(blob_path)
+                        if clip is not None:
+                            clip['blobs'].append(blob_path)
+
+        for clip in clips.values():
+            # No access recorded in metadata.json: fall back to the download time
+            if clip['last_access'] is None:
+                clip['last_access'] = clip['mtime']
+        return list(clips.values())
+
+    def _blob_deletable(self, clip: Dict[str, Any]) -> bool:
+        """
+        Whether every user of the clip's store blob is known.
+
+        Symlinked stories cannot be counted from the blob, so blobs are only
+        deleted after a scan of all products; hardlinks outside the scan show
+        up as a link count above the links found.
+        """
+        if not clip['blobs']:
+            return True
+        if not self.scans_all_stories:
+            return False
+        return clip['nlink'] <= clip['hardlinks']
+
+    def _evict_clip(self, clip: Dict[str, Any]) -> bool:
+        """Stub every story using the clip, then delete its files."""
+        sha256 = None
+        for folder in clip['stories']:
+            sha256 = sha256 or self._video_info(folder).get('sha256')
+
+        try:
+            for folder in clip['stories']:
+                # Stub first: a crash before the delete leaves a re-fetchable, still-present video
+                update_video_status(os.path.join(folder, METADATA_FILENAME), {
+                    'status': STATUS_EVICTED,
+                    'downloaded': False,
+                    'evicted': {
+                        'evicted_at': datetime.now().isoformat(),
+                        'file_size': clip['size'],
+                        'sha256': sha256
+                    }
+                })
+            for path in clip['paths'] + clip['blobs']:
+                os.remove(path)
+            for blob_path in clip['blobs']:
+                if os.path.exists(blob_path + '.sha256'):
+                    os.remove(blob_path + '.sha256')
+        except OSError as e:
+            logger.error(f"Failed to evict {clip['paths'] or clip['blobs']}: {str(e)}")
+            return False
+
+        logger.info(f"Evicted {clip['size']} bytes: {[os.path.basename(f) for f in clip['stories']] or clip['blobs']}")
+        return True
+
+    def _is_evictable(self, story_folder: str) -> bool:
+        """Completed stories only: script written and video download finished."""
+        return (os.path.exists(os.path.join(story_folder, SCRIPT_FILENAME))
+                and self._video_info(story_folder).get('status') in (STATUS_DONE, None))
+
+    def _story_folders(self) -> List[str]:
+        folders = []
+        for root in self.stories_roots:
+            if os.path.isdir(root):
+                folders.extend(os.path.abspath(os.path.join(root, name)) for name in sorted(os.listdir(root))
+                               if os.path.isdir(os.path.join(root, name)))
+        return folders
+
+    @staticmethod
+    def _video_info(story_folder: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(story_folder, METADATA_FILENAME), 'r') as f:
+                metadata = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return (metadata.get('workflow_execution') or {}).get('video_info') or {}
+
+    @staticmethod
+    def _last_access(video_info: Dict[str, Any]) -> Optional[float]:
+        for field in ('last_accessed', 'refetched_at', 'updated_at'):
+            if video_info.get(field):
+                try:
+                    return datetime.fromisoformat(video_info[field]).timestamp()
+                except ValueError:
+                    continue
+        return None
+
+    @staticmethod
+    def _clip_range_tuple(clip_range: Optional[Dict[str, Any]]) -> Optional[Tuple[float, float]]:
+        """video_info.clip_range ({'mode': 'segment', 'start', 'end'}) back to a download range."""
+        if clip_range and clip_range.get('mode') == 'segment':
+            return (float(clip_range['start']), float(clip_range['end']))
+        return None
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Keep story videos within a disk budget")
+    parser.add_argument('stories_roots', nargs='*', help="stories/ directories (default: all products)")
+    parser.add_argument('--budget-gb', type=float, default=DEFAULT_BUDGET_BYTES / 1024 ** 3, help="Disk budget in GB")
+    parser.add_argument('--restore', metavar='STORY_FOLDER', help="Re-fetch an evicted story video")
+    args = parser.parse_args()
+
+    storage = VideoStorageManager(args.stories_roots or None, int(args.budget_gb * 1024 ** 3))
+    if args.restore:
+        from workflow_utils import VideoExtractor
+        from video_store import VideoStore
+        result = storage.ensure_video(args.restore, VideoExtractor(video_store=VideoStore()))
+        print(f"✅ {result['output_file']}" if result['success'] else f"❌ {'; '.join(result['errors'])}")
+        sys.exit(0 if result['success'] else 1)
+
+    report = storage.enforce_budget()
+    print(f"📦 {report['bytes_before'] / 1024 ** 2:.1f} MB -> {report['bytes_after'] / 1024 ** 2:.1f} MB "
+          f"(budget {args.budget_gb:g} GB) | 🗑️ Evicted: {len(report['evicted'])} stories")
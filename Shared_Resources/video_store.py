@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Video Store
+=============================
+
+Shared store for downloaded source clips across stories and products. Each
+clip is downloaded once into the store and linked into every story folder
+that uses it, so duplicate downloads cost nothing and disk use no longer
+grows with the number of stories or products.
+
+Blobs are addressed by:
+- Platform plus video id when the URL carries one (YouTube, v.redd.it, Streamable)
+- SHA-256 of the file content for direct files (found again through a URL index)
+
+Downloads land in a stable partial/ path first, so an interrupted download
+resumes on the next attempt instead of starting over. A lock file per blob
+keeps concurrent workers (other stories, other products) from downloading
+the same clip twice; it uses the file_lock protocol, so a lock is taken over
+only once the worker holding it has exited.
+
+Layout:
+    video_store/
+        blobs/youtube/<id>.mp4
+        blobs/youtube/<id>.mp4.sha256      (digest recorded at download)
+        blobs/youtube/<id>__0-30s.mp4      (segment downloads)
+        blobs/sha256/<ab>/<digest>.mp4
+        partial/<name>.mp4(.part)
+        index/url_<hash>.json
+
+Usage:
+    from video_store import VideoStore
+
+    store = VideoStore()
+    extractor = VideoExtractor(video_store=store)
+    extractor.download_video(url, story_paths['video'])   # linked from the store
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import logging
+from typing import Callable, Dict, Optional, Any
+
+from file_lock import LOCK_SUFFIX, acquire_lock, release_lock, unique_temp_path
+from video_integrity import file_sha256
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'video_store')
+
+# How long to wait on another worker's download of the same clip
+LOCK_WAIT_SECONDS = 15 * 60
+LOCK_POLL_SECONDS = 2
+
+# (platform, URL pattern capturing the video id)
+PLATFORM_ID_PATTERNS = [
+    ('youtube', r'(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/(?:embed|shorts)/)([A-Za-z0-9_-]{11})'),
+    ('vreddit', r'v\.redd\.it/([A-Za-z0-9]+)'),
+    ('streamable', r'streamable\.com/(?:e/)?([A-Za-z0-9]+)')
+]
+
+class VideoStore:
+    """
+    Content-addressed store of downloaded videos linked into story folders.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        """
+        Initialize video store.
+
+        Args:
+            root (str): Store directory (created on first use)
+        """
+        self.root = root
+
+    @staticmethod
+    def platform_key(video_url: str) -> Optional[str]:
+        """
+        Store key from platform and video id, when the URL carries one.
+
+        Args:
+            video_url (str): Video URL
+
+        Returns:
+            Optional[str]: Key like "youtube/dQw4w9WgXcQ", or None for direct files
+        """
+        for platform, pattern in PLATFORM_ID_PATTERNS:
+            match = re.search(pattern, video_url)
+            if match:
+                return f"{platform}/{match.group(1)}"
+        return None
+
+    def lookup(self, video_url: str, variant: Optional[str] = None) -> Optional[str]:
+        """
+        Return the stored blob for a URL, if it has been downloaded before.
+
+        Args:
+            video_url (str): Video URL
+            variant (Optional[str]): Download variant such as a clip range ("0-30s")
+
+        Returns:
+            Optional[str]: Absolute blob path, or None
+        """
+        key = self.platform_key(video_url)
+        if key:
+            blob_path = self._blob_path(self._variant_key(key, variant))
+            return blob_path if os.path.exists(blob_path) else None
+
+        entry = self._read_index(video_url, variant)
+        if entry:
+            blob_path = os.path.join(self.root, entry['blob'])
+            if os.path.exists(blob_path):
+                return blob_path
+        return None
+
+    def fetch(self, video_url: str, output_path: str,
+              download: Callable[[str, str], Dict[str, Any]], variant: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Materialize a video at output_path, downloading it into the store only once.
+
+        Args:
+            video_url (str): Video URL
+            output_path (str): Story folder destination (linked to the blob)
+            download (Callable): Downloader writing video_url to a path, returning
+                a VideoExtractor.download_video-style result
+            variant (Optional[str]): Download variant such as a clip range ("0-30s");
+                each variant is stored as its own blob
+
+        Returns:
+            Dict: Download result; output_file is output_path, metadata gains
+            'store_blob' and 'store_hit'
+        """
+        blob_path = self.lookup(video_url, variant)
+        result = {'success': False, 'output_file': None, 'metadata': {}, 'errors': []}
+
+        if not blob_path:
+            lock_path = self._partial_path(video_url, variant) + LOCK_SUFFIX
+            # Same lock protocol as the JSON state files: a live downloader is
+            # waited for, one that exited mid-download is taken over
+            if acquire_lock(lock_path, wait_seconds=LOCK_WAIT_SECONDS, poll_seconds=LOCK_POLL_SECONDS):
+                try:
+                    # Another worker may have finished while we waited for the lock
+                    blob_path = self.lookup(video_url, variant)
+                    if not blob_path:
+                        result = self._download_into_store(video_url, download, variant)
+                        blob_path = result.get('output_file')
+                        result['metadata']['store_hit'] = False
+                finally:
+                    release_lock(lock_path)
+            else:
+                blob_path = self.lookup(video_url, variant)
+                if not blob_path:
+                    result['errors'].append("Timed out waiting for another download of this video")
+
+        if not blob_path:
+            return result
+
+        result.setdefault('metadata', {}).setdefault('store_hit', True)
+        if 'sha256' not in result['metadata']:
+            # Store hit: reuse the digest recorded when the blob was downloaded
+            digest = self._read_digest(blob_path)
+            if digest:
+                result['metadata']['sha256'] = digest
+                result['metadata']['file_size'] = os.path.getsize(blob_path)
+        try:
+            self.link_into(blob_path, output_path)
+        except OSError as e:
+            result['success'] = False
+            result['errors'].append(f"Failed to link stored video: {str(e)}")
+            return result
+
+        result['success'] = True
+        result['output_file'] = output_path
+        result['metadata']['store_blob'] = os.path.relpath(blob_path, self.root)
+        return result
+
+    @staticmethod
+    def link_into(blob_path: str, output_path: str):
+        """
+        Place a blob at output_path: hardlink, else symlink, else copy.
+
+        The link is created beside the destination and renamed over it,
+        so an existing story video is replaced atomically.
+        """
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(output_path) and os.path.samefile(blob_path, output_path):
+            return
+
+        temp_path = unique_temp_path(output_path)
+        try:
+            os.link(blob_path, temp_path)
+        except OSError:
+            try:
+                os.symlink(os.path.abspath(blob_path), temp_path)
+            except OSError:
+                shutil.copy2(blob_path, temp_path)
+        os.replace(temp_path, output_path)
+
+    def _download_into_store(self, video_url: str, download: Callable[[str, str], Dict[str, Any]],
+                             variant: Optional[str] = None) -> Dict[str, Any]:
+        """Download to the stable partial path (resumable), then move into blobs/."""
+        partial_path = self._partial_path(video_url, variant)
+        os.makedirs(os.path.dirname(partial_path), exist_ok=True)
+
+        result = download(video_url, partial_path)
+        if not result.get('success') or not os.path.exists(partial_path):
+            result['success'] = False
+            result['output_file'] = None
+            return result
+
+        key = self.platform_key(video_url)
+        if key:
+            blob_path = self._blob_path(self._variant_key(key, variant))
+        else:
+            # Reuse the digest computed while downloading when the downloader recorded one
+            digest = result.get('metadata', {}).get('sha256') or file_sha256(partial_path)
+            blob_path = self._blob_path(f"sha256/{digest[:2]}/{digest}")
+
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.exists(blob_path):
+            # Identical content already stored under another URL
+            os.remove(partial_path)
+        else:
+            os.replace(partial_path, blob_path)
+
+        if not key:
+            self._write_index(video_url, os.path.relpath(blob_path, self.root), variant)
+        if result.get('metadata', {}).get('sha256'):
+            self._write_digest(blob_path, result['metadata']['sha256'])
+
+        logger.info(f"Stored video {video_url} as {os.path.relpath(blob_path, self.root)}")
+        result['output_file'] = blob_path
+        return result
+
+    @staticmethod
+    def _read_digest(blob_path: str) -> Optional[str]:
+        try:
+            with open(blob_path + '.sha256', 'r') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write_digest(blob_path: str, digest: str):
+        temp_path = unique_temp_path(f"{blob_path}.sha256")
+        with open(temp_path, 'w') as f:
+            f.write(digest)
+        os.replace(temp_path, blob_path + '.sha256')
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.root, 'blobs', *key.split('/')) + '.mp4'
+
+    @staticmethod
+    def _variant_key(key: str, variant: Optional[str]) -> str:
+        return f"{key}__{variant}" if variant else key
+
+    def _partial_path(self, video_url: str, variant: Optional[str] = None) -> str:
+        key = self.platform_key(video_url)
+        name = key.replace('/', '_') if key else f"url_{self._url_digest(video_url, variant)}"
+        return os.path.join(self.root, 'partial', f"{self._variant_key(name, variant) if key else name}.mp4")
+
+    def _index_path(self, video_url: str, variant: Optional[str] = None) -> str:
+        return os.path.join(self.root, 'index', f"url_{self._url_digest(video_url, variant)}.json")
+
+    @staticmethod
+    def _url_digest(video_url: str, variant: Optional[str] = None) -> str:
+        source = video_url.strip() + (f"#{variant}" if variant else '')
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+    def _read_index(self, video_url: str, variant: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._index_path(video_url, variant), 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_index(self, video_url: str, blob: str, variant: Optional[str] = None):
+        index_path = self._index_path(video_url, variant)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        temp_path = unique_temp_path(index_path)
+        with open(temp_path, 'w') as f:
+            json.dump({'url': video_url, 'variant': variant, 'blob': blob, 'stored_at': time.time()}, f)
+        os.replace(temp_path, index_path)
+
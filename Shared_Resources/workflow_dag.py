@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Workflow Stage DAG
+==================
+
+Runs a story workflow as a small graph of stages instead of a fixed sequence.
+Each stage declares the values it needs (inputs) and the values it produces
+(outputs); a stage starts on a thread pool as soon as every input is available,
+so independent branches (e.g. content scraping and video discovery after URL
+validation) overlap and the wall time approaches the longest branch rather
+than the sum of all stages.
+
+Each stage has a timeout. A stage that raises or times out fails the run:
+stages not yet started are skipped, and the results of stages still running
+are discarded (Python threads cannot be killed, so they finish in the
+background). Optional stages (optional=True) degrade instead: their failure
+or timeout is reported, their outputs are set to None and the run continues.
+Every stage's status and timing is reported.
+
+An abandoned stage keeps running, so stages call raise_if_cancelled() before
+any side effect (database or file writes); it raises StageCancelled once the
+stage has timed out or the run has failed.
+
+Usage:
+    from workflow_dag import WorkflowStage, WorkflowDAG, StageFailed, raise_if_cancelled
+
+    def validate(inputs):
+        if not inputs['url']:
+            raise StageFailed("No URL")
+        return {'post_url': inputs['url']}
+
+    def scrape(inputs):
+        content = fetch(inputs['post_url'])
+        raise_if_cancelled()            # no writes after a timeout
+        save(content)
+        return {'content': content}
+
+    dag = WorkflowDAG([
+        WorkflowStage('validate', validate, inputs=['url'], outputs=['post_url']),
+        WorkflowStage('scrape', scrape, inputs=['post_url'], outputs=['content'], timeout=30, optional=True),
+        WorkflowStage('video', extract, inputs=['post_url'], outputs=['videos'], timeout=60, optional=True),
+    ])
+    run = dag.run({'url': story['url']})
+    print(run['success'], run['wall_seconds'], run['stages']['scrape'])
+
+Author: Claude Code
+Project: Multi-Product Video Generation System
+"""
+
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Sequence, Any
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION CONSTANTS
+# =============================================================================
+
+# Seconds a stage may run before the workflow gives up on it
+DEFAULT_STAGE_TIMEOUT = 60.0
+DAG_WORKERS = 4
+# Wake-up interval while a submitted stage has not started yet (its deadline is unknown)
+START_POLL_SECONDS = 0.05
+
+# Stage statuses in run reports
+STAGE_DONE = 'done'
+STAGE_FAILED = 'failed'
+STAGE_TIMEOUT = 'timeout'
+STAGE_CANCELLED = 'cancelled'  # still running when another stage failed
+STAGE_SKIPPED = 'skipped'
+
+class StageFailed(Exception):
+    """Raised by a stage function to fail the workflow with a readable reason."""
+
+class StageCancelled(Exception):
+    """Raised by raise_if_cancelled() in a stage whose results are no longer wanted."""
+
+# Cancel event of the stage running on the current thread
+_stage_context = threading.local()
+
+def stage_cancelled() -> bool:
+    """Whether the stage running on this thread timed out or its run failed (False outside stages)."""
+    event = getattr(_stage_context, 'cancel_event', None)
+    return event is not None and event.is_set()
+
+def raise_if_cancelled():
+    """
+    Stop an abandoned stage before its next side effect.
+
+    Raises:
+        StageCancelled: If the stage running on this thread was cancelled
+    """
+    if stage_cancelled():
+        raise StageCancelled("Stage cancelled")
+
+class WorkflowStage:
+    """
+    One workflow step with declared inputs and outputs.
+    """
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+                 inputs: Sequence[str] = (), outputs: Sequence[str] = (),
+                 timeout: Optional[float] = DEFAULT_STAGE_TIMEOUT, optional: bool = False):
+        """
+        Declare a stage.
+
+        Args:
+            name (str): Stage name (unique within the DAG)
+            func (Callable): Called with {input name: value}; returns {output name: value}
+                (missing outputs are set to None)
+            inputs (Sequence[str]): Values the stage needs (run inputs or other stages' outputs)
+            outputs (Sequence[str]): Values the stage produces
+            timeout (Optional[float]): Seconds before the stage is abandoned (None: no limit)
+            optional (bool): On failure or timeout, set the outputs to None and continue the run
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.timeout = timeout
+        self.optional = optional
+
+class WorkflowDAG:
+    """
+    Dependency-ordered executor for WorkflowStage graphs.
+    """
+
+    def __init__(self, stages: List[WorkflowStage], max_workers: int = DAG_WORKERS):
+        """
+        Build the graph from the stages' declared outputs.
+
+        Args:
+            stages (List[WorkflowStage]): Stages (any order)
+            max_workers (int): Threads running stages concurrently
+
+        Raises:
+            ValueError: On duplicate stage names or outputs, or a dependency cycle
+        """
+        self.stages = {}
+        self.producers: Dict[str, str] = {}
+        self.max_workers = max_workers
+
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"Output '{output}' produced by both {self.producers[output]} and {stage.name}")
+                self.producers[output] = stage.name
+
+        # Stage -> stages whose outputs it consumes (other inputs must be supplied to run())
+        self.dependencies = {
+            name: {self.producers[value] for value in stage.inputs if value in self.producers}
+            for name, stage in self.stages.items()
+        }
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Stage names with every stage after its dependencies (declaration order kept otherwise)."""
+        order, placed = [], set()
+        while len(order) < len(self.stages):
+            ready = [name for name in self.stages
+                     if name not in placed and self.dependencies[name] <= placed]
+            if not ready:
+                cycle = sorted(set(self.stages) - placed)
+                raise ValueError(f"Dependency cycle between stages: {', '.join(cycle)}")
+            order.extend(ready)
+            placed.update(ready)
+        return order
+
+    def run(self, initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute the stages, each as soon as its inputs are available.
+
+        Args:
+            initial (Optional[Dict]): Values not produced by any stage (e.g. the story)
+
+        Returns:
+            Dict: {'success', 'error', 'values': {name: value}, 'wall_seconds', 'stage_seconds',
+                   'stages': {name: {'status', 'seconds', 'error'}}}
+        """
+        values = dict(initial or {})
+        report = {name: {'status': None, 'seconds': 0.0, 'error': None} for name in self.order}
+        run = {'success': False, 'error': None, 'values': values, 'wall_seconds': 0.0,
+               'stage_seconds': 0.0, 'stages': report}
+
+        missing = sorted({value for stage in self.stages.values() for value in stage.inputs
+                          if value not in self.producers and value not in values})
+        if missing:
+            raise ValueError(f"Workflow inputs not supplied: {', '.join(missing)}")
+
+        started_run = time.perf_counter()
+        started: Dict[str, float] = {}
+        pending = {}
+        finished = set()
+        cancel_events: Dict[str, threading.Event] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def execute(stage: WorkflowStage, stage_inputs: Dict[str, Any]) -> Dict[str, Any]:
+            started[stage.name] = time.perf_counter()
+            _stage_context.cancel_event = cancel_events[stage.name]
+            try:
+                return stage.func(stage_inputs) or {}
+            finally:
+                _stage_context.cancel_event = None
+
+        def submit_ready():
+            for name in self.order:
+                if report[name]['status'] is None and name not in pending.values() \
+                        and self.dependencies[name] <= finished:
+                    stage = self.stages[name]
+                    cancel_events[name] = threading.Event()
+                    future = executor.submit(execute, stage, {value: values[value] for value in stage.inputs})
+                    pending[future] = name
+
+        def fail(name: str, status: str, error: str):
+            report[name].update({'status': status, 'error': error})
+            logger.warning(f"Workflow stage {name} {status}: {error}")
+            if self.stages[name].optional:
+                # Dependents run without this stage's results
+                for output in self.stages[name].outputs:
+                    values[output] = None
+                finished.add(name)
+            elif run['error'] is None:
+                run['error'] = error
+
+        try:
+            submit_ready()
+            while pending and run['error'] is None:
+                # Wake up for the first completion or the nearest stage deadline
+                now = time.perf_counter()
+                deadlines = [started[name] + self.stages[name].timeout for name in pending.values()
+                             if name in started and self.stages[name].timeout is not None]
+                if any(name not in started and self.stages[name].timeout is not None for name in pending.values()):
+                    deadlines.append(now + START_POLL_SECONDS)
+                done, _ = wait(pending, timeout=max(0.0, min(deadlines) - now) if deadlines else None,
+                               return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = pending.pop(future)
+                    report[name]['seconds'] = round(time.perf_counter() - started.get(name, now), 3)
+                    try:
+                        outputs = future.result()
+                    except StageFailed as e:
+                        fail(name, STAGE_FAILED, str(e))
+                        continue
+                    except Exception as e:
+                        fail(name, STAGE_FAILED, f"{type(e).__name__}: {str(e)}")
+                        continue
+                    for output in self.stages[name].outputs:
+                        values[output] = outputs.get(output)
+                    report[name]['status'] = STAGE_DONE
+                    finished.add(name)
+
+                now = time.perf_counter()
+                for future, name in list(pending.items()):
+                    timeout = self.stages[name].timeout
+                    if name in started and timeout is not None and now - started[name] >= timeout and not future.done():
+                        pending.pop(future)
+                        cancel_events[name].set()
+                        report[name]['seconds'] = round(now - started[name], 3)
+                        fail(name, STAGE_TIMEOUT, f"Stage {name} timed out after {timeout}s")
+
+                if run['error'] is None:
+                    submit_ready()
+        finally:
+            # Stages not yet started are dropped once the run has failed
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        now = time.perf_counter()
+        for name in pending.values():
+            # Stages still running must not write anything once the run has failed
+            cancel_events[name].set()
+            if name in started:
+                report[name].update({'status': STAGE_CANCELLED, 'seconds': round(now - started[name], 3)})
+        for name in self.order:
+            if report[name]['status'] is None:
+                report[name]['status'] = STAGE_SKIPPED
+
+        run['success'] = run['error'] is None
+        run['wall_seconds'] = round(time.perf_counter() - started_run, 3)
+        run['stage_seconds'] = round(sum(stage['seconds'] for stage in report.values()), 3)
+        return run
@@ -9,6 +9,12 @@ across all video generation projects (Insurance_Scripts, Crypto_Scripts, App_Scr
 Features:
 - YouTube and video link extraction from Reddit posts
 - Original Reddit post content scraping  
+- Request-scoped post artifact cache (each post fetched once per story run)
+- Parallel video download pool with per-host concurrency limits
+- yt-dlp info dict cache keyed by video id (one resolution per video)
+- Segment-only downloads sized to the 30-second script window
+- Native v.redd.it DASH downloads (video + audio fetched concurrently, muxed locally)
+- Download integrity: size/truncation check before success, then a post-download SHA-256
 - Scene timing validation and optimization
 - Folder structure management
 - Error handling and logging
@@ -34,11 +40,20 @@ import re
 import json
 import requests
 import time
+import copy
+import hashlib
+import functools
+import threading
+import contextlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, quote_plus
 import logging
 
+from file_lock import unique_temp_path
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -82,6 +97,27 @@ class WorkflowFolders:
         Returns:
             str: Path to created story folder
         """
+        story_path = WorkflowFolders.story_folder_path(base_path, story_id, story_title)
+        
+        # Create directory structure
+        os.makedirs(story_path, exist_ok=True)
+        
+        logger.info(f"Created story folder: {story_path}")
+        return story_path
+    
+    @staticmethod
+    def story_folder_path(base_path: str, story_id: int, story_title: str) -> str:
+        """
+        Path of a story's folder (not created).
+        
+        Args:
+            base_path (str): Base project directory path
+            story_id (int): Story ID number
+            story_title (str): Story title for folder naming
+            
+        Returns:
+            str: stories/story_###_title path
+        """
         # Clean story title for folder name
         clean_title = re.sub(r'[^\w\s-]', '', story_title)
         clean_title = re.sub(r'[-\s]+', '_', clean_title).strip('_').lower()
@@ -92,13 +128,7 @@ class WorkflowFolders:
         
         # Create folder name
         folder_name = f"story_{story_id:03d}_{clean_title}"
-        story_path = os.path.join(base_path, 'stories', folder_name)
-        
-        # Create directory structure
-        os.makedirs(story_path, exist_ok=True)
-        
-        logger.info(f"Created story folder: {story_path}")
-        return story_path
+        return os.path.join(base_path, 'stories', folder_name)
     
     @staticmethod
     def get_story_paths(story_folder: str) -> Dict[str, str]:
@@ -118,6 +148,296 @@ class WorkflowFolders:
             'metadata': os.path.join(story_folder, 'metadata.json'),
             'log': os.path.join(story_folder, 'generation_log.txt')
         }
+    
+    @staticmethod
+    def format_script_path(story_folder: str, format_type: str) -> str:
+        """Path of a story's script in one specific format (multi-format fan-out)."""
+        return os.path.join(story_folder, f"script_{format_type}.md")
+
+def _request_post_json(reddit_url: str, headers: Dict[str, str]) -> Any:
+    """Fetch the JSON API payload for a Reddit post URL (raises on HTTP errors)."""
+    # Add .json to Reddit URL for API access
+    if 'reddit.com' in reddit_url and not reddit_url.endswith('.json'):
+        api_url = reddit_url.rstrip('/') + '.json'
+    else:
+        api_url = reddit_url
+    
+    response = requests.get(api_url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+class PostArtifactCache:
+    """
+    Request-scoped cache of Reddit post artifacts.
+    
+    Holds the raw post JSON payload and the video extraction result per post,
+    plus URL correction results per story, so URL correction, content scraping
+    and video extraction share one fetch of each post during a story run.
+    Create one per run; nothing is persisted.
+    """
+    
+    def __init__(self):
+        self.post_payloads: Dict[str, Any] = {}
+        self.video_results: Dict[str, Dict[str, Any]] = {}
+        self.corrections: Dict[Any, Dict[str, Any]] = {}
+        self.stats = {'fetches': 0, 'hits': 0}
+        self._lock = threading.Lock()
+        # Posts being fetched right now: concurrent workflow stages wait for that fetch
+        self._inflight: Dict[str, threading.Event] = {}
+    
+    @staticmethod
+    def make_key(reddit_url: str) -> str:
+        """Cache key for a post URL: the Reddit post id when present, else the normalized URL."""
+        match = re.search(r'/comments/([a-z0-9]+)', reddit_url, re.IGNORECASE)
+        if match:
+            return f"reddit:{match.group(1).lower()}"
+        
+        parsed = urlparse(reddit_url)
+        path = parsed.path.rstrip('/')
+        if path.endswith('.json'):
+            path = path[:-len('.json')]
+        return f"{parsed.netloc.lower()}{path}"
+    
+    def fetch_post_json(self, reddit_url: str, headers: Dict[str, str]) -> Any:
+        """
+        Return the post JSON payload, fetching it only on first use.
+        
+        Args:
+            reddit_url (str): Reddit post URL
+            headers (Dict[str, str]): Request headers for the first fetch
+            
+        Returns:
+            Any: Reddit JSON API payload (shared - do not mutate)
+        """
+        key = self.make_key(reddit_url)
+        while True:
+            with self._lock:
+                if key in self.post_payloads:
+                    self.stats['hits'] += 1
+                    return self.post_payloads[key]
+                fetching = self._inflight.get(key)
+                if fetching is None:
+                    fetching = self._inflight[key] = threading.Event()
+                    break
+            fetching.wait()
+        
+        # Failed fetches raise and are not cached, so later steps (or waiters) may retry
+        try:
+            payload = _request_post_json(reddit_url, headers)
+            with self._lock:
+                self.stats['fetches'] += 1
+                return self.post_payloads.setdefault(key, payload)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fetching.set()
+    
+    def get_video_result(self, reddit_url: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached video extraction result for a post, if any."""
+        with self._lock:
+            cached = self.video_results.get(self.make_key(reddit_url))
+            if cached is not None:
+                self.stats['hits'] += 1
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    def store_video_result(self, reddit_url: str, result: Dict[str, Any]):
+        """Cache a video extraction result for a post."""
+        with self._lock:
+            self.video_results[self.make_key(reddit_url)] = copy.deepcopy(result)
+    
+    def get_correction(self, story_id: Any) -> Optional[Dict[str, Any]]:
+        """Return a copy of this run's URL correction result for a story, if any."""
+        with self._lock:
+            cached = self.corrections.get(story_id)
+            if cached is not None:
+                self.stats['hits'] += 1
+        return copy.deepcopy(cached) if cached is not None else None
+    
+    def store_correction(self, story_id: Any, result: Dict[str, Any]):
+        """Cache a URL correction result (with its matched post and video list) for a story."""
+        with self._lock:
+            self.corrections[story_id] = copy.deepcopy(result)
+
+# Guards attaching and detaching artifact caches on script generators
+_ARTIFACT_SCOPE_LOCK = threading.Lock()
+
+def _enter_artifact_scope(generator: Any, cache: Optional[PostArtifactCache] = None) -> PostArtifactCache:
+    """
+    Attach an artifact cache to a generator and its helpers, or join the one attached.
+    
+    Scopes on one generator may overlap (nested decorated calls, generate_batch
+    threads, workflow DAG stage threads, a shared_artifact_scope around them):
+    every overlapping scope uses the cache attached by the first, and it is
+    detached only when the last one exits, so no scope removes or replaces a
+    cache another is still using. PostArtifactCache is thread-safe and keyed by
+    post URL and story id, so sharing it between overlapping stories is safe.
+    """
+    with _ARTIFACT_SCOPE_LOCK:
+        depth = getattr(generator, '_artifact_scope_depth', 0)
+        if depth == 0:
+            cache = cache or PostArtifactCache()
+            generator.artifact_cache = cache
+            generator.video_extractor.artifact_cache = cache
+            generator.content_scraper.artifact_cache = cache
+        generator._artifact_scope_depth = depth + 1
+        return generator.artifact_cache
+
+def _exit_artifact_scope(generator: Any):
+    """Leave a scope entered with _enter_artifact_scope (the last one detaches the cache)."""
+    with _ARTIFACT_SCOPE_LOCK:
+        generator._artifact_scope_depth -= 1
+        if generator._artifact_scope_depth == 0:
+            generator.artifact_cache = None
+            generator.video_extractor.artifact_cache = None
+            generator.content_scraper.artifact_cache = None
+
+def story_artifact_scope(method):
+    """
+    Run a script generator method inside a request-scoped PostArtifactCache.
+    
+    The cache is attached to the generator's video_extractor and content_scraper
+    while any decorated call is running; nested or concurrent decorated calls
+    (e.g. generate_enhanced_script -> prepare_story_for_production, or
+    generate_batch threads) share it (see _enter_artifact_scope).
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        _enter_artifact_scope(self)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _exit_artifact_scope(self)
+    
+    return wrapper
+
+@contextlib.contextmanager
+def shared_artifact_scope(generators: List[Any], cache: Optional[PostArtifactCache] = None):
+    """
+    Share one PostArtifactCache across several script generators.
+    
+    Used when the same Reddit post is processed for more than one product:
+    decorated generator methods called inside the block reuse the shared cache
+    (see story_artifact_scope), so the post is fetched and its videos are
+    extracted once for all of them. A generator already inside another scope
+    keeps that scope's cache.
+    
+    Args:
+        generators (List): Script generators (one per product)
+        cache (Optional[PostArtifactCache]): Cache to share (default: a new one)
+        
+    Yields:
+        PostArtifactCache: The shared cache (stats show fetches vs. hits)
+    """
+    cache = cache or PostArtifactCache()
+    entered = []
+    try:
+        for generator in generators:
+            _enter_artifact_scope(generator, cache)
+            entered.append(generator)
+        yield cache
+    finally:
+        for generator in entered:
+            _exit_artifact_scope(generator)
+
+# yt-dlp format URLs expire (YouTube after ~6 hours), so cached info dicts do too
+INFO_CACHE_DIRNAME = 'info_cache'
+INFO_CACHE_TTL_SECONDS = 4 * 3600
+
+# Default clip window: scripts run 30 seconds (SceneOptimizer.total_duration)
+CLIP_WINDOW_SECONDS = 30
+
+class VideoInfoCache:
+    """
+    On-disk cache of yt-dlp info dicts keyed by extractor and video id.
+    
+    One JSON file per video plus one small alias file per source URL, written
+    atomically, so download pool worker processes can share the cache.
+    Entries older than the TTL are ignored because their format URLs expire.
+    """
+    
+    def __init__(self, cache_dir: str, ttl_seconds: int = INFO_CACHE_TTL_SECONDS):
+        """
+        Initialize info cache.
+        
+        Args:
+            cache_dir (str): Directory holding cached info dicts (created on first write)
+            ttl_seconds (int): Maximum age of a usable entry
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def video_key(extractor_key: str, video_id: str) -> str:
+        """Filesystem-safe cache key for an extractor's video id."""
+        return re.sub(r'[^A-Za-z0-9_-]', '_', f"{extractor_key}_{video_id}".lower())
+    
+    def get(self, video_url: str, key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached info dict for a video URL while it is fresh.
+        
+        Args:
+            video_url (str): Source URL (resolved through its alias file)
+            key (Optional[str]): Known video key, skipping the alias lookup
+            
+        Returns:
+            Optional[Dict]: yt-dlp info dict, or None when missing or expired
+        """
+        key = key or (self._read_json(self._alias_path(video_url)) or {}).get('key')
+        if not key:
+            return None
+        
+        entry = self._read_json(self._entry_path(key))
+        if not entry or time.time() - entry.get('cached_at', 0) > self.ttl_seconds:
+            return None
+        return entry.get('info')
+    
+    def put(self, video_url: str, info: Dict[str, Any]) -> str:
+        """
+        Cache a sanitized info dict under its video id and alias the source URL to it.
+        
+        Returns:
+            str: Video key the info dict was stored under
+        """
+        key = self.video_key(info.get('extractor_key') or 'generic', str(info.get('id') or video_url))
+        self._write_json(self._entry_path(key), {'cached_at': time.time(), 'source_url': video_url, 'info': info})
+        self._write_json(self._alias_path(video_url), {'key': key})
+        return key
+    
+    def invalidate(self, video_url: str, key: Optional[str] = None):
+        """Drop a video's cached info dict (e.g. after its format URLs stopped working)."""
+        key = key or (self._read_json(self._alias_path(video_url)) or {}).get('key')
+        if key:
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _alias_path(self, video_url: str) -> str:
+        digest = hashlib.sha1(video_url.strip().encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"url_{digest}.json")
+    
+    @staticmethod
+    def _read_json(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+    
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Download pool threads may write the same entry at once
+            temp_path = unique_temp_path(path)
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write video info cache entry {path}: {str(e)}")
 
 class VideoExtractor:
     """
@@ -125,23 +445,94 @@ class VideoExtractor:
     Enhanced with yt-dlp support for actual video downloading.
     """
     
-    def __init__(self):
+    def __init__(self, artifact_cache: Optional[PostArtifactCache] = None,
+                 info_cache: Optional[VideoInfoCache] = None, video_store=None):
         self.supported_platforms = [
             'youtube.com', 'youtu.be', 'v.redd.it', 'streamable.com', 
             'gfycat.com', 'imgur.com'
         ]
+        self.artifact_cache = artifact_cache
+        self.info_cache = info_cache
+        # Optional video_store.VideoStore: downloads are shared across stories and products
+        self.video_store = video_store
+        self.download_manager: Optional['VideoDownloadManager'] = None
         
-    def download_video(self, video_url: str, output_path: str) -> Dict[str, Any]:
+    def submit_download(self, video_url: str, output_path: str,
+                        clip_range: Optional[Tuple[float, float]] = None) -> Future:
+        """
+        Queue a video download on the shared download pool.
+        
+        Args:
+            video_url (str): URL of video to download
+            output_path (str): Full path where video should be saved
+            clip_range (Optional[Tuple[float, float]]): (start, end) seconds to fetch; full video when None
+            
+        Returns:
+            Future: Resolves to the download_video result dictionary
+        """
+        if self.download_manager is None:
+            self.download_manager = VideoDownloadManager(
+                info_cache_dir=self.info_cache.cache_dir if self.info_cache else None,
+                video_store_dir=self.video_store.root if self.video_store else None
+            )
+        return self.download_manager.submit(video_url, output_path, clip_range)
+        
+    def download_video(self, video_url: str, output_path: str,
+                       clip_range: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
         """
         Download video from URL to specified path using yt-dlp.
+        With a video store attached, the clip is downloaded into the store once
+        and linked to output_path.
         
         Args:
             video_url (str): URL of video to download
             output_path (str): Full path where video should be saved
+            clip_range (Optional[Tuple[float, float]]): (start, end) seconds to fetch
+                through yt-dlp's download ranges; full video when None
             
         Returns:
             Dict containing download results and metadata
         """
+        if self.video_store is not None:
+            variant = f"{clip_range[0]:g}-{clip_range[1]:g}s" if clip_range else None
+            download = functools.partial(self._download_file, clip_range=clip_range)
+            result = self.video_store.fetch(video_url, output_path, download, variant=variant)
+            if result['success'] and 'clip_range' not in result['metadata']:
+                # Store hit: nothing was downloaded, describe the stored window
+                info = self.info_cache.get(video_url, self._info_cache_key(video_url)) if self.info_cache else None
+                result['metadata']['clip_range'] = self._describe_clip_range(clip_range, info or {})
+            return result
+        return self._download_file(video_url, output_path, clip_range)
+    
+    @staticmethod
+    def resolve_clip_range(story: Dict[str, Any], window_seconds: int = CLIP_WINDOW_SECONDS) -> Optional[Tuple[float, float]]:
+        """
+        Clip window to download for a story.
+        
+        Uses story['clip_window'] ({'start': s, 'end': e} in seconds, or 'full'
+        for the whole source), then story['clip_start'] plus the window length,
+        and otherwise the first window_seconds of the source.
+        
+        Args:
+            story (Dict): Story database entry
+            window_seconds (int): Window length when the story gives no end
+            
+        Returns:
+            Optional[Tuple[float, float]]: (start, end) seconds, or None for the full video
+        """
+        clip_window = story.get('clip_window')
+        if clip_window == 'full':
+            return None
+        if isinstance(clip_window, dict) and clip_window.get('end') is not None:
+            start = float(clip_window.get('start', 0))
+            return (start, max(float(clip_window['end']), start + 1))
+        
+        start = float(story.get('clip_start', 0) or 0)
+        return (start, start + window_seconds)
+    
+    def _download_file(self, video_url: str, output_path: str,
+                       clip_range: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """Run the yt-dlp download of video_url (optionally only clip_range) to output_path."""
         result = {
             'success': False,
             'output_file': None,
@@ -149,6 +540,10 @@ class VideoExtractor:
             'errors': []
         }
         
+        # Reddit-hosted clips: native DASH download with audio instead of the silent fallback_url
+        if 'v.redd.it' in urlparse(video_url).netloc:
+            return self._download_reddit_video(video_url, output_path, clip_range)
+        
         try:
             # Import yt-dlp dynamically to avoid dependency issues
             try:
@@ -156,65 +551,204 @@ class VideoExtractor:
             except ImportError:
                 result['errors'].append("yt-dlp not installed. Install with: pip install yt-dlp")
                 return result
+            # yt-dlp writes to a temp name owned by this output path (stable, so .part
+            # files still resume) and reports the final file through its hooks
+            temp_template = self._download_temp_template(output_path)
+            final_files = []
+            
+            def record_final_file(status: Dict[str, Any]):
+                if status.get('status') == 'finished' and (status.get('info_dict') or {}).get('filepath'):
+                    final_files.append(status['info_dict']['filepath'])
             
             # Configure yt-dlp options
             ydl_opts = {
-                'outtmpl': output_path,
+                'outtmpl': temp_template,
                 'format': 'best[height<=720]/best',  # Prefer 720p or lower
                 'writeinfojson': False,  # Don't create info JSON files
                 'writedescription': False,
                 'writesubtitles': False,
                 'writeautomaticsub': False,
+                'continuedl': True,  # Resume .part files left by interrupted downloads
                 'ignoreerrors': True,
                 'no_warnings': True,
-                'quiet': True
+                'quiet': True,
+                'postprocessor_hooks': [record_final_file]
             }
             
-            # Download video
+            if clip_range:
+                # Fetch only the script window instead of the full source
+                from yt_dlp.utils import download_range_func
+                ydl_opts['download_ranges'] = download_range_func(None, [clip_range])
+            
+            # Resolve once: the info dict (cached by video id) drives the download itself
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info first
-                info = ydl.extract_info(video_url, download=False)
+                cache_key = self._info_cache_key(video_url)
+                info = self.info_cache.get(video_url, cache_key) if self.info_cache else None
+                from_cache = info is not None
                 
-                if info:
-                    result['metadata'] = {
-                        'title': info.get('title', 'Unknown'),
-                        'duration': info.get('duration', 0),
-                        'uploader': info.get('uploader', 'Unknown'),
-                        'view_count': info.get('view_count', 0),
-                        'upload_date': info.get('upload_date', ''),
-                        'resolution': f"{info.get('width', 0)}x{info.get('height', 0)}"
-                    }
+                if not from_cache:
+                    info = self._resolve_video_info(ydl, video_url)
                 
-                # Download the video
-                ydl.download([video_url])
+                final_file = None
+                if info:
+                    result['metadata'] = self._summarize_video_info(info)
+                    result['metadata']['info_cached'] = from_cache
+                    final_file = self._run_download(ydl, info, final_files)
+                    result['metadata']['clip_range'] = self._describe_clip_range(clip_range, info)
+                    
+                    # Cached format URLs may have expired - resolve fresh once and retry
+                    if from_cache and not final_file:
+                        self.info_cache.invalidate(video_url, cache_key)
+                        info = self._resolve_video_info(ydl, video_url)
+                        if info:
+                            result['metadata'] = self._summarize_video_info(info)
+                            result['metadata']['info_cached'] = False
+                            final_file = self._run_download(ydl, info, final_files)
+                            result['metadata']['clip_range'] = self._describe_clip_range(clip_range, info)
                 
-                # Check if file was created
-                if os.path.exists(output_path):
+                # Move the reported file into place (whatever extension yt-dlp chose)
+                if final_file:
+                    os.replace(final_file, output_path)
                     result['success'] = True
                     result['output_file'] = output_path
                     logger.info(f"Video downloaded successfully: {output_path}")
                 else:
-                    # yt-dlp might have changed the filename, try to find it
-                    base_path = os.path.dirname(output_path)
-                    if os.path.exists(base_path):
-                        files = [f for f in os.listdir(base_path) if f.startswith('video')]
-                        if files:
-                            actual_file = os.path.join(base_path, files[0])
-                            # Rename to expected name
-                            os.rename(actual_file, output_path)
-                            result['success'] = True
-                            result['output_file'] = output_path
-                        else:
-                            result['errors'].append("Video file not found after download")
-                    else:
-                        result['errors'].append("Output directory not found")
+                    result['errors'].append("Video file not found after download")
+            
+            if result['success']:
+                self._verify_download(result, output_path,
+                                      (info.get('filesize') or info.get('filesize_approx')) if info and not clip_range else None)
                         
         except Exception as e:
             result['errors'].append(f"Download error: {str(e)}")
             logger.error(f"Video download failed: {str(e)}")
             
         return result
+    
+    def _download_reddit_video(self, video_url: str, output_path: str,
+                               clip_range: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """Download a v.redd.it clip from its DASH manifest (video + audio muxed locally)."""
+        from reddit_video import RedditVideoDownloader
+        result = RedditVideoDownloader().download(video_url, output_path, clip_range)
+        if result['success']:
+            result['metadata']['clip_range'] = self._describe_clip_range(clip_range, result['metadata'])
+            try:
+                self._verify_download(result, output_path)
+            except OSError as e:
+                result['success'] = False
+                result['output_file'] = None
+                result['errors'].append(f"Download error: {str(e)}")
+        return result
+    
+    @staticmethod
+    def _verify_download(result: Dict[str, Any], output_path: str, reported_size: Optional[int] = None):
+        """
+        A file on disk is not enough: truncated downloads fail here.
+        
+        Only hard truncation discards the file. A size differing from the one the
+        source reported (yt-dlp fixups and remuxes change it), a missing duration
+        or an unrecognized container are recorded as warnings.
+
+        Downloads that computed their digest while writing (v.redd.it video-only
+        clips) keep it. yt-dlp, its ffmpeg segment downloader and muxed v.redd.it
+        clips write the file outside our code, so those are hashed here with one
+        read of the finished file.
+        """
+        from video_integrity import check_video_file, file_sha256
+        
+        check = check_video_file(output_path)
+        if check['valid']:
+            warnings = list(check['warnings'])
+            if reported_size and check['size'] != reported_size:
+                warnings.append(f"Video file size {check['size']} differs from reported {reported_size}")
+            if warnings:
+                logger.info(f"Download {output_path} kept unverified: {'; '.join(warnings)}")
+            
+            streamed_digest = result['metadata'].get('sha256')
+            result['metadata']['sha256'] = streamed_digest or file_sha256(output_path)
+            result['metadata']['file_size'] = check['size']
+            result['metadata']['integrity'] = {
+                'container': check['container'],
+                'duration': check['duration'],
+                'verified': check['verified'],
+                'warnings': warnings,
+                'hashed': 'while_downloading' if streamed_digest else 'after_download',
+                'checked_at': datetime.now().isoformat()
+            }
+        else:
+            result['success'] = False
+            result['output_file'] = None
+            result['errors'].extend(check['errors'])
+            logger.warning(f"Discarding truncated download {output_path}: {'; '.join(check['errors'])}")
+            os.remove(output_path)
+        
+    @staticmethod
+    def _download_temp_template(output_path: str) -> str:
+        """yt-dlp output template unique to output_path, in the same directory (atomic rename)."""
+        directory, filename = os.path.split(output_path)
+        return os.path.join(directory, f".{os.path.splitext(filename)[0]}.download.%(ext)s")
+    
+    @staticmethod
+    def _run_download(ydl, info: Dict[str, Any], final_files: List[str]) -> Optional[str]:
+        """Download from a resolved info dict; return the final file path yt-dlp reports."""
+        del final_files[:]
+        processed = ydl.process_ie_result(copy.deepcopy(info), download=True) or {}
+        
+        # Post-processor hooks report the file after merging/remuxing; fall back to the
+        # download record yt-dlp returns when no post-processor ran
+        candidates = list(reversed(final_files))
+        candidates += [entry.get('filepath') for entry in reversed(processed.get('requested_downloads') or [])]
+        for path in candidates:
+            if path and os.path.exists(path):
+                return path
+        return None
+    
+    def _resolve_video_info(self, ydl, video_url: str) -> Optional[Dict[str, Any]]:
+        """Run yt-dlp extraction once and cache the sanitized info dict by video id."""
+        info = ydl.extract_info(video_url, download=False)
+        if not info:
+            return None
         
+        info = ydl.sanitize_info(info)
+        if self.info_cache:
+            self.info_cache.put(video_url, info)
+        return info
+    
+    def _info_cache_key(self, video_url: str) -> Optional[str]:
+        """Video key derivable from the URL alone (YouTube), so URL variants share an entry."""
+        youtube_id = self._extract_youtube_id(video_url)
+        return VideoInfoCache.video_key('youtube', youtube_id) if youtube_id else None
+    
+    @staticmethod
+    def _summarize_video_info(info: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata fields recorded for a downloaded video."""
+        return {
+            'title': info.get('title', 'Unknown'),
+            'duration': info.get('duration', 0),
+            'uploader': info.get('uploader', 'Unknown'),
+            'view_count': info.get('view_count', 0),
+            'upload_date': info.get('upload_date', ''),
+            'resolution': f"{info.get('width', 0)}x{info.get('height', 0)}"
+        }
+    
+    @staticmethod
+    def _describe_clip_range(clip_range: Optional[Tuple[float, float]], info: Dict[str, Any]) -> Dict[str, Any]:
+        """Clip window recorded in metadata: requested range, source and clip durations."""
+        source_duration = info.get('duration') or 0
+        if not clip_range:
+            return {'mode': 'full', 'source_duration': source_duration, 'clip_duration': source_duration}
+        
+        start, end = clip_range
+        if source_duration:
+            end = min(end, source_duration)
+        return {
+            'mode': 'segment',
+            'start': start,
+            'end': end,
+            'source_duration': source_duration,
+            'clip_duration': max(end - start, 0)
+        }
+    
     def extract_from_reddit_url(self, reddit_url: str) -> Dict[str, Any]:
         """
         Extract video links from a Reddit post URL.
@@ -225,6 +759,11 @@ class VideoExtractor:
         Returns:
             Dict containing video information and status
         """
+        if self.artifact_cache is not None:
+            cached = self.artifact_cache.get_video_result(reddit_url)
+            if cached is not None:
+                return cached
+        
         result = {
             'success': False,
             'videos': [],
@@ -236,18 +775,12 @@ class VideoExtractor:
         }
         
         try:
-            # Add .json to Reddit URL for API access
-            if 'reddit.com' in reddit_url and not reddit_url.endswith('.json'):
-                api_url = reddit_url.rstrip('/') + '.json'
-            else:
-                api_url = reddit_url
-                
             # Request Reddit post data
             headers = {'User-Agent': 'VideoGeneration/1.0'}
-            response = requests.get(api_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            if self.artifact_cache is not None:
+                data = self.artifact_cache.fetch_post_json(reddit_url, headers)
+            else:
+                data = _request_post_json(reddit_url, headers)
             
             # Extract post data
             if isinstance(data, list) and len(data) > 0:
@@ -279,6 +812,9 @@ class VideoExtractor:
             
             if not result['success']:
                 result['errors'].append("No extractable videos found in Reddit post")
+            
+            if self.artifact_cache is not None:
+                self.artifact_cache.store_video_result(reddit_url, result)
                 
         except requests.RequestException as e:
             result['errors'].append(f"Network error accessing Reddit: {str(e)}")
@@ -370,23 +906,213 @@ class VideoExtractor:
         
         # Handle different media types
         if 'reddit_video' in media:
+            # fallback_url is the silent video track; downloads use dash_url for sound
             videos.append({
                 'url': media['reddit_video']['fallback_url'],
                 'platform': 'v.redd.it',
                 'type': 'reddit_video',
-                'duration': media['reddit_video'].get('duration')
+                'duration': media['reddit_video'].get('duration'),
+                'dash_url': media['reddit_video'].get('dash_url'),
+                'has_audio': media['reddit_video'].get('has_audio')
             })
             
         return videos
 
+# Download pool sizing: yt-dlp is CPU- and GIL-heavy, so workers are processes
+DOWNLOAD_WORKERS = 4
+PER_HOST_DOWNLOAD_LIMIT = 2
+HOST_DOWNLOAD_LIMITS = {
+    'v.redd.it': 3,
+    'youtube.com': 2
+}
+HOST_ALIASES = {
+    'youtu.be': 'youtube.com',
+    'm.youtube.com': 'youtube.com',
+    'old.reddit.com': 'reddit.com'
+}
+
+def _download_video_job(video_url: str, output_path: str, clip_range: Optional[Tuple[float, float]] = None,
+                        info_cache_dir: Optional[str] = None, video_store_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Pool worker entry point (module-level so it pickles into worker processes)."""
+    info_cache = VideoInfoCache(info_cache_dir) if info_cache_dir else None
+    video_store = None
+    if video_store_dir:
+        from video_store import VideoStore
+        video_store = VideoStore(video_store_dir)
+    extractor = VideoExtractor(info_cache=info_cache, video_store=video_store)
+    return extractor.download_video(video_url, output_path, clip_range)
+
+class VideoDownloadManager:
+    """
+    Bounded parallel video downloader with per-host concurrency limits.
+    
+    Downloads run in a process pool; jobs for a host that is already at its
+    limit wait in a per-host queue and are dispatched as earlier downloads for
+    that host finish. submit() returns a Future immediately, so callers can keep
+    generating scripts while clips download.
+    
+    Usage:
+        with VideoDownloadManager(max_workers=8) as manager:
+            futures = [manager.submit(url, path) for url, path in jobs]
+            results = [f.result() for f in futures]
+    """
+    
+    def __init__(self, max_workers: int = DOWNLOAD_WORKERS, per_host_limit: int = PER_HOST_DOWNLOAD_LIMIT,
+                 host_limits: Optional[Dict[str, int]] = None, use_processes: bool = True,
+                 info_cache_dir: Optional[str] = None, video_store_dir: Optional[str] = None):
+        """
+        Initialize download manager.
+        
+        Args:
+            max_workers (int): Downloads running at once across all hosts
+            per_host_limit (int): Default downloads running at once per host
+            host_limits (Optional[Dict[str, int]]): Per-host overrides (defaults to HOST_DOWNLOAD_LIMITS)
+            use_processes (bool): Use worker processes; threads when False
+            info_cache_dir (Optional[str]): VideoInfoCache directory shared by the workers
+            video_store_dir (Optional[str]): VideoStore root shared by the workers
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.host_limits = dict(HOST_DOWNLOAD_LIMITS if host_limits is None else host_limits)
+        self.use_processes = use_processes
+        self.info_cache_dir = info_cache_dir
+        self.video_store_dir = video_store_dir
+        self._executor = None
+        # Re-entrant: a job that finishes instantly runs its callback inside _dispatch_locked
+        self._lock = threading.RLock()
+        self._active: Dict[str, int] = {}
+        self._waiting: Dict[str, deque] = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True)
+    
+    @staticmethod
+    def host_key(video_url: str) -> str:
+        """Host used for concurrency limits (www. stripped, aliases folded)."""
+        host = urlparse(video_url).netloc.lower().split(':')[0]
+        if host.startswith('www.'):
+            host = host[len('www.'):]
+        return HOST_ALIASES.get(host, host)
+    
+    def submit(self, video_url: str, output_path: str,
+               clip_range: Optional[Tuple[float, float]] = None) -> Future:
+        """
+        Queue a download.
+        
+        Args:
+            video_url (str): URL of video to download
+            output_path (str): Full path where video should be saved
+            clip_range (Optional[Tuple[float, float]]): (start, end) seconds to fetch; full video when None
+            
+        Returns:
+            Future: Resolves to the VideoExtractor.download_video result dictionary
+        """
+        future = Future()
+        host = self.host_key(video_url)
+        
+        with self._lock:
+            self._waiting.setdefault(host, deque()).append((video_url, output_path, clip_range, future))
+            self._dispatch_locked(host)
+        
+        return future
+    
+    def download_all(self, jobs: List[Tuple]) -> List[Dict[str, Any]]:
+        """
+        Download many videos and wait for all of them.
+        
+        Args:
+            jobs (List[Tuple]): (video_url, output_path) or (video_url, output_path, clip_range) tuples
+            
+        Returns:
+            List[Dict]: download_video results in job order
+        """
+        futures = [self.submit(*job) for job in jobs]
+        return [future.result() for future in futures]
+    
+    def pending_count(self) -> int:
+        """Downloads queued or running."""
+        with self._lock:
+            return sum(self._active.values()) + sum(len(queue) for queue in self._waiting.values())
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool; queued downloads that never started are cancelled."""
+        with self._lock:
+            for queue in self._waiting.values():
+                while queue:
+                    queue.popleft()[-1].cancel()
+            executor, self._executor = self._executor, None
+        
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    
+    def _get_executor(self):
+        """Create the worker pool on first use (threads if processes are unavailable)."""
+        if self._executor is None:
+            if self.use_processes:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Process pool unavailable, downloading in threads: {str(e)}")
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def _dispatch_locked(self, host: str):
+        """Start queued downloads for a host up to its limit (caller holds the lock)."""
+        limit = self.host_limits.get(host, self.per_host_limit)
+        queue = self._waiting.get(host)
+        
+        while queue and self._active.get(host, 0) < limit:
+            video_url, output_path, clip_range, future = queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            
+            self._active[host] = self._active.get(host, 0) + 1
+            try:
+                job = self._get_executor().submit(_download_video_job, video_url, output_path, clip_range,
+                                                   self.info_cache_dir, self.video_store_dir)
+            except Exception as e:
+                self._active[host] -= 1
+                future.set_result({
+                    'success': False,
+                    'output_file': None,
+                    'metadata': {},
+                    'errors': [f"Download error: {str(e)}"]
+                })
+                continue
+            job.add_done_callback(functools.partial(self._on_job_done, host, future))
+    
+    def _on_job_done(self, host: str, future: Future, job: Future):
+        """Forward a finished job to the caller's future and start the next one for the host."""
+        with self._lock:
+            self._active[host] -= 1
+            self._dispatch_locked(host)
+        
+        try:
+            future.set_result(job.result())
+        except Exception as e:
+            # Worker crashes surface as failed downloads, like download_video errors
+            logger.error(f"Video download worker failed: {str(e)}")
+            future.set_result({
+                'success': False,
+                'output_file': None,
+                'metadata': {},
+                'errors': [f"Download error: {str(e)}"]
+            })
+
 class ContentScraper:
     """
     Scrape original Reddit post content for authentic script foundations.
     Enhanced with markdown file generation for organized storage.
     """
     
-    def __init__(self):
+    def __init__(self, artifact_cache: Optional[PostArtifactCache] = None):
         self.headers = {'User-Agent': 'VideoGeneration/1.0'}
+        self.artifact_cache = artifact_cache
     
     def save_content_to_file(self, content: Dict[str, Any], output_path: str) -> bool:
         """
@@ -480,17 +1206,11 @@ class ContentScraper:
         }
         
         try:
-            # Convert to JSON API URL
-            if 'reddit.com' in reddit_url and not reddit_url.endswith('.json'):
-                api_url = reddit_url.rstrip('/') + '.json'
+            # Request post data (shared with video extraction when a run cache is attached)
+            if self.artifact_cache is not None:
+                data = self.artifact_cache.fetch_post_json(reddit_url, self.headers)
             else:
-                api_url = reddit_url
-                
-            # Request post data
-            response = requests.get(api_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+                data = _request_post_json(reddit_url, self.headers)
             
             # Extract post data
             if isinstance(data, list) and len(data) > 0:
@@ -537,13 +1257,17 @@ class ContentScraper:
             
         return result
     
-    def search_reddit_topic(self, subreddit: str, search_terms: List[str]) -> Dict[str, Any]:
+    def search_reddit_topic(self, subreddit: str, search_terms: List[str], limit: int = 10,
+                            time_filter: Optional[str] = None, sort: str = 'top') -> Dict[str, Any]:
         """
         Search Reddit subreddit for posts matching terms.
         
         Args:
             subreddit (str): Subreddit name (without r/)
             search_terms (List[str]): Terms to search for
+            limit (int): Maximum posts to return (Reddit caps at 100)
+            time_filter (Optional[str]): Reddit time window (hour/day/week/month/year/all)
+            sort (str): Result ordering (top, relevance, new, comments)
             
         Returns:
             Dict containing search results
@@ -562,23 +1286,14 @@ class ContentScraper:
         try:
             # Build search query
             query = ' '.join(search_terms)
-            search_url = f"https://www.reddit.com/r/{subreddit}/search.json?q={query}&restrict_sr=1&sort=top&limit=10"
+            search_url = f"https://www.reddit.com/r/{subreddit}/search.json?q={quote_plus(query)}&restrict_sr=1&sort={sort}&limit={limit}"
+            if time_filter:
+                search_url += f"&t={time_filter}"
             
             response = requests.get(search_url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            posts = []
-            
-            for child in data['data']['children']:
-                post_data = child['data']
-                posts.append({
-                    'title': post_data.get('title', ''),
-                    'url': f"https://reddit.com{post_data.get('permalink', '')}",
-                    'score': post_data.get('score', 0),
-                    'num_comments': post_data.get('num_comments', 0),
-                    'created_utc': post_data.get('created_utc', 0)
-                })
+            posts = self._parse_listing_posts(response.json())
                 
             result['posts'] = posts
             result['success'] = len(posts) > 0
@@ -592,6 +1307,67 @@ class ContentScraper:
             result['errors'].append(f"Search error: {str(e)}")
             
         return result
+    
+    def fetch_subreddit_listing(self, subreddit: str, sort: str = 'top', time_filter: str = 'all',
+                                limit: int = 100) -> Dict[str, Any]:
+        """
+        Fetch a subreddit listing (e.g. top posts of all time) in one request.
+        
+        Args:
+            subreddit (str): Subreddit name (without r/)
+            sort (str): Listing sort (top, hot, new, controversial)
+            time_filter (str): Reddit time window for top/controversial listings
+            limit (int): Maximum posts to return (Reddit caps at 100)
+            
+        Returns:
+            Dict containing listing posts in the search_reddit_topic format
+        """
+        result = {
+            'success': False,
+            'posts': [],
+            'errors': [],
+            'metadata': {
+                'fetched_at': datetime.now().isoformat(),
+                'subreddit': subreddit,
+                'sort': sort,
+                'time_filter': time_filter
+            }
+        }
+        
+        try:
+            listing_url = f"https://www.reddit.com/r/{subreddit}/{sort}.json?t={time_filter}&limit={limit}"
+            
+            response = requests.get(listing_url, headers=self.headers, timeout=10)
+            response.raise_for_status()
+            
+            result['posts'] = self._parse_listing_posts(response.json())
+            result['success'] = len(result['posts']) > 0
+            
+            if not result['success']:
+                result['errors'].append("No posts found in subreddit listing")
+                
+        except requests.RequestException as e:
+            result['errors'].append(f"Network error: {str(e)}")
+        except Exception as e:
+            result['errors'].append(f"Listing error: {str(e)}")
+            
+        return result
+    
+    def _parse_listing_posts(self, data: Dict) -> List[Dict[str, Any]]:
+        """Convert a Reddit listing JSON payload into post summaries."""
+        posts = []
+        
+        for child in data['data']['children']:
+            post_data = child['data']
+            posts.append({
+                'title': post_data.get('title', ''),
+                'url': f"https://reddit.com{post_data.get('permalink', '')}",
+                'score': post_data.get('score', 0),
+                'num_comments': post_data.get('num_comments', 0),
+                'created_utc': post_data.get('created_utc', 0)
+            })
+            
+        return posts
 
 class SceneOptimizer:
     """
@@ -629,16 +1405,18 @@ class SceneOptimizer:
             'transformation': [
                 {'name': 'HOOK', 'duration': 3},
                 {'name': 'PROBLEM', 'duration': 5},
-                {'name': 'LESSON_PART_1', 'duration': 7},
-                {'name': 'LESSON_PART_2', 'duration': 7},
-                {'name': 'CTA_SPT', 'duration': 8}
+                {'name': 'LESSON_PART_1', 'duration': 6},
+                {'name': 'LESSON_PART_2', 'duration': 6},
+                {'name': 'TIP', 'duration': 4},
+                {'name': 'CTA_SPT', 'duration': 6}
             ],
             'storytelling': [
                 {'name': 'HOOK', 'duration': 3},
-                {'name': 'SETUP', 'duration': 7},
+                {'name': 'SETUP', 'duration': 6},
                 {'name': 'STORY_PART_1', 'duration': 6},
-                {'name': 'STORY_PART_2', 'duration': 6},
-                {'name': 'CTA_SPT', 'duration': 8}
+                {'name': 'STORY_PART_2', 'duration': 5},
+                {'name': 'LESSON', 'duration': 4},
+                {'name': 'CTA_SPT', 'duration': 6}
             ],
             'pov_story': [
                 {'name': 'HOOK', 'duration': 3},
@@ -649,10 +1427,11 @@ class SceneOptimizer:
             ],
             'challenge': [
                 {'name': 'HOOK', 'duration': 3},
-                {'name': 'CHALLENGE_SETUP', 'duration': 9},
+                {'name': 'CHALLENGE_SETUP', 'duration': 6},
                 {'name': 'BENEFITS_PART_1', 'duration': 5},
                 {'name': 'BENEFITS_PART_2', 'duration': 5},
-                {'name': 'CTA_SPT', 'duration': 8}
+                {'name': 'TRIAL', 'duration': 5},
+                {'name': 'CTA_SPT', 'duration': 6}
             ]
         }
     